@@ -1,22 +1,34 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import time
 import random
-import requests
-import threading
-import websocket
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import os
 import sys
 from colorama import Fore, Back, Style, init
 
+from blaze_realtime import ReplicationClient, get_engine
+from blaze_http import HedgedFetcher, payload_valido, fetch_history_range, backoff_jitter
+from round_history import RoundHistory, parse_epoch_ms
+from round_sequencer import RoundSequencer
+from event_bus import EventBus
+
 # Inicializa o colorama
 init(autoreset=True)
 
+# Etapas do pipeline de eventos: (política de overflow, capacidade da fila)
+PIPELINE_PADRAO = {
+    # Publicada pelos handlers do socket, no loop compartilhado: nunca bloqueia (descartes aparecem nas estatísticas)
+    "analysis": ("drop-oldest", 1000),
+    # Publicada pela thread da análise (fora do loop): contrapressão em vez de perder rounds
+    "ledger": ("block", 1000),
+    "display": ("coalesce", 16)    # Exibição só precisa do estado mais recente
+}
+
 class BlazeAPI:
-    def __init__(self):
+    def __init__(self, history_capacity=10000, retention_hours=24, pipeline=None):
         self.base_url = "https://blaze.com/api"
         self.double_ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
         self.mines_ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
@@ -25,10 +37,14 @@ class BlazeAPI:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
-        self.double_ws = None
-        self.mines_ws = None
-        self.double_data = []
-        self.mines_data = []
+        self.realtime_clients = {}  # Uma conexão de replicação por servidor, compartilhada pelos jogos
+        # Buffers circulares de capacidade fixa (mais recente primeiro) com janela de retenção
+        self.retention_hours = retention_hours
+        self.double_data = RoundHistory(history_capacity, retencao_s=retention_hours * 3600)
+        self.mines_data = RoundHistory(history_capacity, retencao_s=retention_hours * 3600)
+        # Sequenciadores: cada round entra uma única vez, em ordem de horário do servidor
+        self.double_sequencer = RoundSequencer(self.double_data, backfill=self._backfill_double, lacuna_ms=60 * 1000, nome="double")
+        self.mines_sequencer = RoundSequencer(self.mines_data, nome="mines")
         self.double_last_update = None
         self.mines_last_update = None
         self.double_backtest_results = {"wins": 0, "losses": 0, "last_result": None}
@@ -38,14 +54,20 @@ class BlazeAPI:
         self.mines_prediction = None
         self.double_confidence = 0
         self.mines_confidence = 0
-        self.double_realtime_thread = None
-        self.mines_realtime_thread = None
+        self.double_subscribed = False
+        self.mines_subscribed = False
         self.running = True
         self.last_double_result = None
         self.last_mines_result = None
         self.double_history = []  # Histórico de previsões e resultados reais
         self.mines_history = []   # Histórico de previsões e resultados reais
         self.max_retries = 5      # Número máximo de tentativas para obter dados da API
+        # Busca escalonada entre as URLs espelho, com circuito por URL (backoff com jitter entre tentativas)
+        self.fetcher = HedgedFetcher(self.headers)
+        # Pipeline de eventos: o socket só publica; análise, estatísticas e exibição rodam em threads próprias
+        self.bus = EventBus()
+        self.pipeline = dict(PIPELINE_PADRAO, **(pipeline or {}))
+        self._setup_pipeline()
 
     def get_double_history(self):
         """Obtém o histórico de resultados do Double das últimas 24 horas"""
@@ -55,46 +77,42 @@ class BlazeAPI:
             # URLs alternativas para obter dados do Double
             urls = [
                 f"{self.base_url}/roulette_games/recent",
-                f"{self.base_url}/crash_games/recent",  # Tenta outra API que pode estar funcionando
                 "https://blaze.com/api/roulette_games/recent",
                 "https://api-v2.blaze.com/roulette_games/recent"
             ]
             
             data = None
             for retry in range(self.max_retries):
-                for url in urls:
-                    try:
-                        response = requests.get(url, headers=self.headers, timeout=10)
-                        if response.status_code == 200:
-                            data = response.json()
-                            break
-                    except Exception as e:
-                        print(f"{Fore.RED}Erro ao acessar {url}: {str(e)}")
-                
+                # Dispara as URLs de forma escalonada e usa a primeira resposta válida
+                url, data = self.fetcher.fetch(urls, validar=lambda d: payload_valido(d, ("created_at", "color")))
                 if data:
                     break
                 
-                print(f"{Fore.YELLOW}Tentativa {retry+1}/{self.max_retries} falhou. Tentando novamente em 3 segundos...")
-                time.sleep(3)
+                atraso = backoff_jitter(retry)
+                print(f"{Fore.YELLOW}Tentativa {retry+1}/{self.max_retries} falhou. Tentando novamente em {atraso:.1f} segundos...")
+                time.sleep(atraso)
             
             if not data:
                 print(f"{Fore.RED}Não foi possível obter dados do Double após {self.max_retries} tentativas.")
                 print(f"{Fore.RED}Por favor, verifique sua conexão com a internet e tente novamente mais tarde.")
                 return []
             
-            # Filtra apenas os resultados das últimas 24 horas
-            cutoff_time = datetime.now() - timedelta(days=1)
+            # Filtra apenas os resultados dentro da janela de retenção (24 horas por padrão)
+            cutoff_ms = int(time.time() * 1000) - self.retention_hours * 3600 * 1000
             filtered_data = []
             for item in data:
                 try:
-                    created_at = datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ")
-                    if created_at >= cutoff_time:
-                        filtered_data.append(item)
+                    created_at = parse_epoch_ms(item['created_at'])
+                    if created_at is not None and created_at >= cutoff_ms:
+                        filtered_data.append((created_at, item))
                 except Exception as e:
                     print(f"{Fore.RED}Erro ao processar item: {str(e)}")
             
             if filtered_data:
-                self.double_data = filtered_data
+                self.double_sequencer.clear()
+                for created_at, item in reversed(filtered_data):
+                    self.double_sequencer.offer(item, item.get('id'), created_at)
+                filtered_data = [item for _, item in filtered_data]
                 self.double_last_update = datetime.now()
                 print(f"{Fore.GREEN}Dados reais do Double obtidos com sucesso: {len(filtered_data)} resultados")
                 return filtered_data
@@ -120,39 +138,36 @@ class BlazeAPI:
             
             data = None
             for retry in range(self.max_retries):
-                for url in urls:
-                    try:
-                        response = requests.get(url, headers=self.headers, timeout=10)
-                        if response.status_code == 200:
-                            data = response.json()
-                            break
-                    except Exception as e:
-                        print(f"{Fore.RED}Erro ao acessar {url}: {str(e)}")
-                
+                # Dispara as URLs de forma escalonada e usa a primeira resposta válida
+                url, data = self.fetcher.fetch(urls, validar=lambda d: payload_valido(d, ("created_at",)))
                 if data:
                     break
                 
-                print(f"{Fore.YELLOW}Tentativa {retry+1}/{self.max_retries} falhou. Tentando novamente em 3 segundos...")
-                time.sleep(3)
+                atraso = backoff_jitter(retry)
+                print(f"{Fore.YELLOW}Tentativa {retry+1}/{self.max_retries} falhou. Tentando novamente em {atraso:.1f} segundos...")
+                time.sleep(atraso)
             
             if not data:
                 print(f"{Fore.RED}Não foi possível obter dados do Mines após {self.max_retries} tentativas.")
                 print(f"{Fore.RED}Por favor, verifique sua conexão com a internet e tente novamente mais tarde.")
                 return []
             
-            # Filtra apenas os resultados das últimas 24 horas
-            cutoff_time = datetime.now() - timedelta(days=1)
+            # Filtra apenas os resultados dentro da janela de retenção (24 horas por padrão)
+            cutoff_ms = int(time.time() * 1000) - self.retention_hours * 3600 * 1000
             filtered_data = []
             for item in data:
                 try:
-                    created_at = datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ")
-                    if created_at >= cutoff_time:
-                        filtered_data.append(item)
+                    created_at = parse_epoch_ms(item['created_at'])
+                    if created_at is not None and created_at >= cutoff_ms:
+                        filtered_data.append((created_at, item))
                 except Exception as e:
                     print(f"{Fore.RED}Erro ao processar item: {str(e)}")
             
             if filtered_data:
-                self.mines_data = filtered_data
+                self.mines_sequencer.clear()
+                for created_at, item in reversed(filtered_data):
+                    self.mines_sequencer.offer(item, item.get('id'), created_at)
+                filtered_data = [item for _, item in filtered_data]
                 self.mines_last_update = datetime.now()
                 print(f"{Fore.GREEN}Dados reais do Mines obtidos com sucesso: {len(filtered_data)} resultados")
                 return filtered_data
@@ -164,182 +179,186 @@ class BlazeAPI:
             print(f"{Fore.RED}Erro ao obter dados do Mines: {str(e)}")
             return []
 
-    def start_double_realtime(self):
-        """Inicia a conexão websocket para receber atualizações em tempo real do Double"""
-        if self.double_realtime_thread is None or not self.double_realtime_thread.is_alive():
-            self.double_realtime_thread = threading.Thread(target=self._double_realtime_worker)
-            self.double_realtime_thread.daemon = True
-            self.double_realtime_thread.start()
+    def _setup_pipeline(self):
+        """Registra as etapas que consomem os eventos publicados pelo socket"""
+        etapas = [
+            ("double.tick", self._analyze_double_tick, "double-analysis", "analysis"),
+            ("double.round", self._record_double_round, "double-ledger", "ledger"),
+            ("double.round", self._display_double_round, "double-display", "display"),
+            ("mines.update", self._analyze_mines_update, "mines-analysis", "analysis"),
+            ("mines.round", self._record_mines_round, "mines-ledger", "ledger"),
+            ("mines.round", self._display_mines_round, "mines-display", "display")
+        ]
+        for topico, handler, nome, etapa in etapas:
+            politica, capacidade = self.pipeline[etapa]
+            self.bus.subscribe(topico, handler, nome=nome, capacidade=capacidade, politica=politica)
 
-    def _double_realtime_worker(self):
-        """Worker thread para manter a conexão websocket do Double"""
-        def on_message(ws, message):
-            try:
-                # Mensagens do websocket geralmente começam com um número e dois pontos
-                if message.startswith("42"):
-                    # Remove o prefixo e analisa o JSON
-                    data = json.loads(message[2:])
-                    if len(data) > 1 and data[0] == "double.tick":
-                        # Atualiza os dados do Double com o novo resultado
-                        new_data = data[1]
-                        if new_data.get("status") == "complete":
-                            # Adiciona o novo resultado ao histórico
-                            self.double_data.insert(0, new_data)
-                            # Mantém apenas os dados das últimas 24 horas
-                            cutoff_time = datetime.now() - timedelta(days=1)
-                            self.double_data = [item for item in self.double_data if 
-                                               datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ") >= cutoff_time]
-                            
-                            # Verifica se a previsão anterior estava correta
-                            if self.double_prediction is not None and self.last_double_result is not None:
-                                actual_color = new_data.get('color')
-                                if self.double_prediction == actual_color:
-                                    self.double_backtest_results["wins"] += 1
-                                    self.double_backtest_results["last_result"] = "Vitoria"
-                                    self.double_history.append({"prediction": self.double_prediction, "actual": actual_color, "result": "Vitoria"})
-                                    print(f"{Fore.GREEN}Previsão do Double CORRETA! Previsto: {self.double_colors.get(self.double_prediction)}, Atual: {self.double_colors.get(actual_color)}")
-                                else:
-                                    self.double_backtest_results["losses"] += 1
-                                    self.double_backtest_results["last_result"] = "Derrota"
-                                    self.double_history.append({"prediction": self.double_prediction, "actual": actual_color, "result": "Derrota"})
-                                    print(f"{Fore.RED}Previsão do Double INCORRETA! Previsto: {self.double_colors.get(self.double_prediction)}, Atual: {self.double_colors.get(actual_color)}")
-                            
-                            # Salva o resultado atual para verificação futura
-                            self.last_double_result = new_data
-                            
-                            # Atualiza a previsão com base nos novos dados
-                            self._update_double_prediction()
-                            
-                            print(f"{Fore.CYAN}Novo resultado do Double recebido: {self.double_colors.get(new_data.get('color', -1), 'DESCONHECIDO')}")
-                            print(f"{Fore.CYAN}Próxima previsão: {self.double_colors.get(self.double_prediction, 'DESCONHECIDO')} com {self.double_confidence:.2f}% de confiança")
-            except Exception as e:
-                print(f"{Fore.RED}Erro ao processar mensagem do Double: {str(e)}")
+    def _backfill_double(self, desde_ms, ate_ms):
+        """Busca pelo histórico paginado os rounds do Double perdidos durante uma desconexão"""
+        registros = fetch_history_range(f"{self.base_url}/roulette_games/history", desde_ms, ate_ms,
+                                        headers=self.headers, pool=self.fetcher.pool)
+        print(f"{Fore.YELLOW}Recuperados {len(registros)} resultados do Double perdidos durante a desconexão")
+        return [(item, item.get('id'), parse_epoch_ms(item.get('created_at'))) for item in registros]
+
+    def _realtime_client(self, url):
+        """Retorna a conexão de replicação compartilhada para a URL (uma por servidor)"""
+        if url not in self.realtime_clients:
+            self.realtime_clients[url] = ReplicationClient(url)
+        return self.realtime_clients[url]
+
+    def start_double_realtime(self):
+        """Inscreve o Double na conexão websocket compartilhada para receber atualizações em tempo real"""
+        if self.double_subscribed:
+            return
 
-        def on_error(ws, error):
-            print(f"{Fore.RED}Erro na conexão websocket do Double: {str(error)}")
+        client = self._realtime_client(self.double_ws_url)
+        client.subscribe("double.tick", self._on_double_tick,
+                         mensagem="42[\"join-room\",\"double\"]",
+                         on_subscribe=self._on_double_subscribe)
+        self.double_subscribed = True
+        client.start()
 
-        def on_close(ws, close_status_code, close_msg):
-            print(f"{Fore.YELLOW}Conexão websocket do Double fechada")
-            # Tenta reconectar após 5 segundos se o programa ainda estiver rodando
-            if self.running:
-                time.sleep(5)
-                self._double_realtime_worker()
+    def _on_double_subscribe(self):
+        """Chamado a cada (re)inscrição do Double: o próximo round é verificado quanto a lacunas"""
+        self.double_sequencer.marcar_reconexao()
+        print(f"{Fore.GREEN}Conexão websocket do Double estabelecida")
 
-        def on_open(ws):
-            print(f"{Fore.GREEN}Conexão websocket do Double estabelecida")
-            # Envia mensagem de inicialização para o websocket
-            ws.send("40")
-            time.sleep(1)
-            ws.send("42[\"join-room\",\"double\"]")
+    def _on_double_tick(self, new_data):
+        """Recebe um evento double.tick na thread do socket: apenas enfileira para as etapas"""
+        self.bus.publish("double.tick", new_data)
 
-        # Configura e inicia o websocket
-        websocket.enableTrace(False)
+    def _analyze_double_tick(self, new_data):
+        """Etapa de análise: grava o round e atualiza a previsão"""
         try:
-            self.double_ws = websocket.WebSocketApp(self.double_ws_url,
-                                             on_message=on_message,
-                                             on_error=on_error,
-                                             on_close=on_close,
-                                             on_open=on_open)
-            self.double_ws.run_forever()
+            if new_data.get("status") != "complete":
+                return
+            # Adiciona o novo resultado ao histórico (ticks repetidos do mesmo round são ignorados)
+            if not self.double_sequencer.offer(new_data, new_data.get('id'), parse_epoch_ms(new_data.get('created_at'))):
+                return
+            # Mantém apenas a janela de retenção (descarta pela ponta mais antiga)
+            self.double_data.expire()
+            
+            # Previsão vigente para este round (só é avaliada se já havia um resultado anterior)
+            previsao = self.double_prediction if self.last_double_result is not None else None
+            self.last_double_result = new_data
+            
+            # Atualiza a previsão com base nos novos dados
+            self._update_double_prediction()
+            
+            self.bus.publish("double.round", {
+                "round": new_data,
+                "prediction": previsao,
+                "next_prediction": self.double_prediction,
+                "confidence": self.double_confidence
+            })
         except Exception as e:
-            print(f"{Fore.RED}Erro ao iniciar websocket do Double: {str(e)}")
-            # Tenta reconectar após 5 segundos
-            if self.running:
-                time.sleep(5)
-                self._double_realtime_worker()
+            print(f"{Fore.RED}Erro ao processar mensagem do Double: {str(e)}")
 
-    def start_mines_realtime(self):
-        """Inicia a conexão websocket para receber atualizações em tempo real do Mines"""
-        if self.mines_realtime_thread is None or not self.mines_realtime_thread.is_alive():
-            self.mines_realtime_thread = threading.Thread(target=self._mines_realtime_worker)
-            self.mines_realtime_thread.daemon = True
-            self.mines_realtime_thread.start()
+    def _record_double_round(self, evento):
+        """Etapa de estatísticas: confere a previsão com o resultado real"""
+        previsao = evento["prediction"]
+        if previsao is None:
+            return
+        actual_color = evento["round"].get('color')
+        resultado = "Vitoria" if previsao == actual_color else "Derrota"
+        self.double_backtest_results["wins" if resultado == "Vitoria" else "losses"] += 1
+        self.double_backtest_results["last_result"] = resultado
+        self.double_history.append({"prediction": previsao, "actual": actual_color, "result": resultado})
+
+    def _display_double_round(self, evento):
+        """Etapa de exibição: mostra o resultado e a próxima previsão"""
+        previsao = evento["prediction"]
+        actual_color = evento["round"].get('color')
+        if previsao is not None:
+            if previsao == actual_color:
+                print(f"{Fore.GREEN}Previsão do Double CORRETA! Previsto: {self.double_colors.get(previsao)}, Atual: {self.double_colors.get(actual_color)}")
+            else:
+                print(f"{Fore.RED}Previsão do Double INCORRETA! Previsto: {self.double_colors.get(previsao)}, Atual: {self.double_colors.get(actual_color)}")
+        
+        print(f"{Fore.CYAN}Novo resultado do Double recebido: {self.double_colors.get(actual_color if actual_color is not None else -1, 'DESCONHECIDO')}")
+        print(f"{Fore.CYAN}Próxima previsão: {self.double_colors.get(evento['next_prediction'], 'DESCONHECIDO')} com {evento['confidence']:.2f}% de confiança")
 
-    def _mines_realtime_worker(self):
-        """Worker thread para manter a conexão websocket do Mines"""
-        def on_message(ws, message):
-            try:
-                # Mensagens do websocket geralmente começam com um número e dois pontos
-                if message.startswith("42"):
-                    # Remove o prefixo e analisa o JSON
-                    data = json.loads(message[2:])
-                    if len(data) > 1 and data[0] == "mines.update":
-                        # Atualiza os dados do Mines com o novo resultado
-                        new_data = data[1]
-                        self.mines_data.insert(0, new_data)
-                        # Mantém apenas os dados das últimas 24 horas
-                        cutoff_time = datetime.now() - timedelta(days=1)
-                        self.mines_data = [item for item in self.mines_data if 
-                                          datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ") >= cutoff_time]
-                        
-                        # Verifica se a previsão anterior estava correta
-                        if self.mines_prediction is not None and self.last_mines_result is not None:
-                            # Em uma implementação real, você verificaria se as posições seguras previstas
-                            # realmente não continham minas
-                            # Aqui vamos verificar com base nos dados recebidos
-                            grid = new_data.get('grid', [])
-                            if grid:
-                                correct = True
-                                for i in range(len(grid)):
-                                    if i < len(self.mines_prediction) and self.mines_prediction[i] == 1 and grid[i] == 1:
-                                        # Marcou como seguro, mas era uma mina
-                                        correct = False
-                                        break
-                                
-                                if correct:
-                                    self.mines_backtest_results["wins"] += 1
-                                    self.mines_backtest_results["last_result"] = "Vitoria"
-                                    self.mines_history.append({"result": "Vitoria"})
-                                    print(f"{Fore.GREEN}Previsão do Mines CORRETA!")
-                                else:
-                                    self.mines_backtest_results["losses"] += 1
-                                    self.mines_backtest_results["last_result"] = "Derrota"
-                                    self.mines_history.append({"result": "Derrota"})
-                                    print(f"{Fore.RED}Previsão do Mines INCORRETA!")
-                        
-                        # Salva o resultado atual para verificação futura
-                        self.last_mines_result = new_data
-                        
-                        # Atualiza a previsão com base nos novos dados
-                        self._update_mines_prediction()
-                        
-                        print(f"{Fore.CYAN}Novo resultado do Mines recebido")
-                        print(f"{Fore.CYAN}Nova previsão gerada com {self.mines_confidence:.2f}% de confiança")
-            except Exception as e:
-                print(f"{Fore.RED}Erro ao processar mensagem do Mines: {str(e)}")
+    def start_mines_realtime(self):
+        """Inscreve o Mines na conexão websocket compartilhada para receber atualizações em tempo real"""
+        if self.mines_subscribed:
+            return
 
-        def on_error(ws, error):
-            print(f"{Fore.RED}Erro na conexão websocket do Mines: {str(error)}")
+        client = self._realtime_client(self.mines_ws_url)
+        client.subscribe("mines.update", self._on_mines_update,
+                         mensagem="42[\"join-room\",\"mines\"]",
+                         on_subscribe=self._on_mines_subscribe)
+        self.mines_subscribed = True
+        client.start()
 
-        def on_close(ws, close_status_code, close_msg):
-            print(f"{Fore.YELLOW}Conexão websocket do Mines fechada")
-            # Tenta reconectar após 5 segundos se o programa ainda estiver rodando
-            if self.running:
-                time.sleep(5)
-                self._mines_realtime_worker()
+    def _on_mines_subscribe(self):
+        """Chamado a cada (re)inscrição do Mines"""
+        self.mines_sequencer.marcar_reconexao()
+        print(f"{Fore.GREEN}Conexão websocket do Mines estabelecida")
 
-        def on_open(ws):
-            print(f"{Fore.GREEN}Conexão websocket do Mines estabelecida")
-            # Envia mensagem de inicialização para o websocket
-            ws.send("40")
-            time.sleep(1)
-            ws.send("42[\"join-room\",\"mines\"]")
+    def _on_mines_update(self, new_data):
+        """Recebe um evento mines.update na thread do socket: apenas enfileira para as etapas"""
+        self.bus.publish("mines.update", new_data)
 
-        # Configura e inicia o websocket
-        websocket.enableTrace(False)
+    def _analyze_mines_update(self, new_data):
+        """Etapa de análise: grava o round e atualiza a previsão"""
         try:
-            self.mines_ws = websocket.WebSocketApp(self.mines_ws_url,
-                                             on_message=on_message,
-                                             on_error=on_error,
-                                             on_close=on_close,
-                                             on_open=on_open)
-            self.mines_ws.run_forever()
+            # Atualiza os dados do Mines com o novo resultado
+            if not self.mines_sequencer.offer(new_data, new_data.get('id'), parse_epoch_ms(new_data.get('created_at'))):
+                return
+            # Mantém apenas a janela de retenção (descarta pela ponta mais antiga)
+            self.mines_data.expire()
+            
+            # Previsão vigente para este round (só é avaliada se já havia um resultado anterior)
+            previsao = self.mines_prediction if self.last_mines_result is not None else None
+            self.last_mines_result = new_data
+            
+            # Atualiza a previsão com base nos novos dados
+            self._update_mines_prediction()
+            
+            self.bus.publish("mines.round", {
+                "round": new_data,
+                "prediction": previsao,
+                "confidence": self.mines_confidence
+            })
         except Exception as e:
-            print(f"{Fore.RED}Erro ao iniciar websocket do Mines: {str(e)}")
-            # Tenta reconectar após 5 segundos
-            if self.running:
-                time.sleep(5)
-                self._mines_realtime_worker()
+            print(f"{Fore.RED}Erro ao processar mensagem do Mines: {str(e)}")
+
+    @staticmethod
+    def _mines_prediction_correct(previsao, grid):
+        """
+        Verifica se as posições marcadas como seguras realmente não continham minas
+
+        Returns:
+            bool: Resultado da verificação, ou None se não houver previsão ou grid
+        """
+        if previsao is None or not grid:
+            return None
+        for i in range(len(grid)):
+            if i < len(previsao) and previsao[i] == 1 and grid[i] == 1:
+                # Marcou como seguro, mas era uma mina
+                return False
+        return True
+
+    def _record_mines_round(self, evento):
+        """Etapa de estatísticas: confere a previsão com o grid real"""
+        correct = self._mines_prediction_correct(evento["prediction"], evento["round"].get('grid', []))
+        if correct is None:
+            return
+        resultado = "Vitoria" if correct else "Derrota"
+        self.mines_backtest_results["wins" if correct else "losses"] += 1
+        self.mines_backtest_results["last_result"] = resultado
+        self.mines_history.append({"result": resultado})
+
+    def _display_mines_round(self, evento):
+        """Etapa de exibição: mostra a conferência e a nova previsão"""
+        correct = self._mines_prediction_correct(evento["prediction"], evento["round"].get('grid', []))
+        if correct is True:
+            print(f"{Fore.GREEN}Previsão do Mines CORRETA!")
+        elif correct is False:
+            print(f"{Fore.RED}Previsão do Mines INCORRETA!")
+        
+        print(f"{Fore.CYAN}Novo resultado do Mines recebido")
+        print(f"{Fore.CYAN}Nova previsão gerada com {evento['confidence']:.2f}% de confiança")
 
     def _update_double_prediction(self):
         """Atualiza a previsão do Double com base nos dados históricos"""
@@ -910,14 +929,16 @@ class BlazeAPI:
 
     def get_statistics(self):
         """Retorna estatísticas dos backtests"""
+        # Snapshot O(1) e consistente do histórico (a ingestão continua gravando em paralelo)
+        double_rounds = self.double_data.latest()
         double_stats = {
             "win_rate": round(self.double_backtest_results.get("win_rate", 0), 2),
             "total": self.double_backtest_results.get("total", 0),
             "wins": self.double_backtest_results.get("wins", 0),
             "losses": self.double_backtest_results.get("losses", 0),
-            "red_count": sum(1 for item in self.double_data if item['color'] == 1),
-            "black_count": sum(1 for item in self.double_data if item['color'] == 2),
-            "white_count": sum(1 for item in self.double_data if item['color'] == 0)
+            "red_count": sum(1 for item in double_rounds if item['color'] == 1),
+            "black_count": sum(1 for item in double_rounds if item['color'] == 2),
+            "white_count": sum(1 for item in double_rounds if item['color'] == 0)
         }
         
         mines_stats = {
@@ -927,27 +948,40 @@ class BlazeAPI:
             "losses": self.mines_backtest_results.get("losses", 0)
         }
         
+        # Reconexões e tempo fora do ar de cada feed em tempo real
+        feeds = {}
+        for client in self.realtime_clients.values():
+            feeds.update(client.estatisticas())
+        
         return {
             "double": double_stats,
-            "mines": mines_stats
+            "mines": mines_stats,
+            "feeds": feeds,
+            "sequencers": {
+                "double": self.double_sequencer.estatisticas(),
+                "mines": self.mines_sequencer.estatisticas()
+            },
+            "http": self.fetcher.pool.estatisticas(),
+            "pipeline": self.bus.estatisticas()
         }
 
     def initialize(self):
         """Inicializa o sistema, carregando dados e executando backtests"""
         print(f"{Fore.CYAN}Inicializando sistema...")
         
-        # Carrega os dados históricos
-        print(f"{Fore.CYAN}Carregando dados históricos do Double...")
-        double_data = self.get_double_history()
+        # Carrega os dados históricos do Double e do Mines em paralelo
+        print(f"{Fore.CYAN}Carregando dados históricos do Double e do Mines...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuro_double = executor.submit(self.get_double_history)
+            futuro_mines = executor.submit(self.get_mines_history)
+            double_data = futuro_double.result()
+            mines_data = futuro_mines.result()
         
         if not double_data:
             print(f"{Fore.RED}Erro: Não foi possível obter dados do Double.")
             print(f"{Fore.RED}O sistema não pode continuar sem dados reais.")
             return False
         
-        print(f"{Fore.CYAN}Carregando dados históricos do Mines...")
-        mines_data = self.get_mines_history()
-        
         if not mines_data:
             print(f"{Fore.RED}Erro: Não foi possível obter dados do Mines.")
             print(f"{Fore.RED}O sistema não pode continuar sem dados reais.")
@@ -985,11 +1019,12 @@ class BlazeAPI:
         print(f"{Fore.CYAN}Encerrando sistema...")
         
         # Fecha as conexões websocket
-        if self.double_ws:
-            self.double_ws.close()
-        
-        if self.mines_ws:
-            self.mines_ws.close()
+        for client in self.realtime_clients.values():
+            client.close()
+        get_engine().stop()
+        self.fetcher.close()
+        self.fetcher.pool.close()
+        self.bus.close()
         
         print(f"{Fore.GREEN}Sistema encerrado com sucesso!")
 
@@ -1073,6 +1108,23 @@ def display_statistics(api):
     print(f"{Fore.WHITE}Vitórias: {stats['mines']['wins']}")
     print(f"{Fore.WHITE}Derrotas: {stats['mines']['losses']}")
     print(f"{Fore.YELLOW}{'-' * 30}")
+    
+    print(f"{Fore.YELLOW}{'-' * 10} Feeds {'-' * 10}")
+    for feed, metricas in stats['feeds'].items():
+        status = "conectado" if metricas['conectado'] else "desconectado"
+        print(f"{Fore.WHITE}{feed}: {status}, {metricas['reconexoes']} reconexões, {metricas['tempo_fora']}s fora do ar")
+        print(f"{Fore.WHITE}    {metricas['frames']} eventos, parse médio de {metricas['custo_parse_us']}µs por frame")
+    for jogo, seq in stats['sequencers'].items():
+        print(f"{Fore.WHITE}{jogo}: {seq['aceitos']} rounds, {seq['duplicados']} duplicados ignorados, "
+              f"{seq['lacunas']} lacunas, {seq['recuperados']} recuperados")
+    http = stats['http']
+    print(f"{Fore.WHITE}HTTP ({http['backend']}{', HTTP/2' if http['http2'] else ''}): {http['requisicoes']} requisições, "
+          f"{http['conexoes']} conexões, {http['reuso'] * 100:.1f}% de reuso")
+    for etapa, m in stats['pipeline'].items():
+        print(f"{Fore.WHITE}{etapa} ({m['politica']}): fila {m['profundidade']}/{m['capacidade']}, "
+              f"{m['processados']} processados, {m['descartados']} descartados, {m['coalescidos']} agrupados, "
+              f"atraso médio {m['lag_medio_ms']}ms")
+    print(f"{Fore.YELLOW}{'-' * 30}")
     print(f"{Fore.CYAN}{'#' * 40}")
     
     input(f"\n{Fore.GREEN}Pressione Enter para voltar ao menu...")
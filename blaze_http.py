@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Blaze HTTP
+Busca do histórico REST com requisições "hedged" entre os espelhos da API.
+
+Em vez de tentar cada URL em sequência (esperando o timeout de cada uma), a primeira URL
+é disparada imediatamente e, se não responder dentro de um pequeno atraso, a próxima é
+disparada em paralelo, e assim por diante. A primeira resposta válida vence. URLs que falham
+repetidamente ficam com o circuito aberto por um tempo crescente e deixam de ser tentadas
+até o fim da pausa, então um espelho fora do ar não atrasa as próximas buscas.
+
+Todo acesso HTTP do processo passa por um único HttpPool (get_http_pool): conexões
+keep-alive reaproveitadas entre requisições, retentativas que respeitam Retry-After e,
+quando o httpx com suporte a HTTP/2 está instalado, multiplexação sobre uma conexão por host.
+"""
+
+import time
+import random
+import importlib.util
+import logging
+import threading
+import requests
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import httpx
+    # h2 é necessário para HTTP/2 no httpx (só a presença é verificada)
+    if importlib.util.find_spec("h2") is None:
+        raise ImportError("h2 is not installed")
+except ImportError:  # httpx/h2 são opcionais; sem eles usa requests (HTTP/1.1 keep-alive)
+    httpx = None
+
+logger = logging.getLogger("BlazeHTTP")
+
+# Respostas que valem uma nova tentativa (respeitando Retry-After quando presente)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def backoff_jitter(tentativa, base=0.5, maximo=3.0):
+    """
+    Atraso antes de repetir uma busca HTTP: backoff exponencial com "full jitter", sem estado
+
+    Args:
+        tentativa: Número de falhas consecutivas (0 na primeira repetição)
+        base: Atraso inicial em segundos
+        maximo: Teto do atraso em segundos
+
+    Returns:
+        float: Atraso em segundos
+    """
+    return random.uniform(0, min(maximo, base * (2 ** tentativa)))
+
+
+class _RetryLimitado(Retry):
+    """Retry do urllib3 com teto para o Retry-After (o servidor pode pedir horas de espera)"""
+
+    teto_retry_after = 30.0
+
+    def new(self, **kw):
+        novo = super().new(**kw)
+        novo.teto_retry_after = self.teto_retry_after
+        return novo
+
+    def get_retry_after(self, response):
+        espera = super().get_retry_after(response)
+        return None if espera is None else max(0.0, min(self.teto_retry_after, espera))
+
+
+class HttpPool:
+    """Pool de conexões HTTP compartilhado, com keep-alive, retentativas e HTTP/2 opcional"""
+
+    def __init__(self, pool_size=10, retries=3, backoff=0.5, retry_after_max=30.0, http2=True, headers=None):
+        """
+        Args:
+            pool_size: Conexões mantidas abertas por host
+            retries: Retentativas para erros de conexão e respostas RETRY_STATUS
+            backoff: Fator do backoff exponencial entre retentativas (segundos)
+            retry_after_max: Teto (segundos) para o Retry-After enviado pelo servidor
+            http2: Usa HTTP/2 quando httpx e h2 estão instalados
+            headers: Cabeçalhos padrão de todas as requisições
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_after_max = retry_after_max
+        self.http2 = bool(http2 and httpx is not None)
+        self._lock = threading.Lock()
+        self._requisicoes = 0
+        self._conexoes = 0
+
+        if self.http2:
+            self.backend = "httpx"
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=retries,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            )
+            self._client = httpx.Client(transport=transport, headers=headers or {})
+        else:
+            self.backend = "requests"
+            retry = _RetryLimitado(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUS,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+            retry.teto_retry_after = retry_after_max
+            self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            self._client = requests.Session()
+            self._client.mount("https://", self._adapter)
+            self._client.mount("http://", self._adapter)
+            if headers:
+                self._client.headers.update(headers)
+
+    def _retry_after(self, response, tentativa):
+        """Calcula a espera antes da próxima tentativa (Retry-After ou backoff exponencial)"""
+        valor = response.headers.get("Retry-After")
+        if valor:
+            try:
+                espera = float(valor)
+            except ValueError:
+                try:
+                    espera = parsedate_to_datetime(valor).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    espera = None
+            if espera is not None:
+                return max(0.0, min(self.retry_after_max, espera))
+        return self.backoff * (2 ** tentativa)
+
+    def _trace(self, evento, info):
+        """Conta conexões novas abertas pelo httpx (extensão "trace" do httpcore)"""
+        if evento == "connection.connect_tcp.complete":
+            with self._lock:
+                self._conexoes += 1
+
+    def get(self, url, headers=None, timeout=10):
+        """
+        Executa um GET reaproveitando as conexões do pool
+
+        Args:
+            url: URL da requisição
+            headers: Cabeçalhos adicionais desta requisição
+            timeout: Timeout em segundos
+
+        Returns:
+            Response: Resposta (requests.Response ou httpx.Response)
+        """
+        with self._lock:
+            self._requisicoes += 1
+
+        if self.backend == "requests":
+            return self._client.get(url, headers=headers, timeout=timeout)
+
+        # O transporte do httpx só repete erros de conexão; respostas RETRY_STATUS são tratadas aqui
+        for tentativa in range(self.retries + 1):
+            response = self._client.get(url, headers=headers, timeout=timeout, extensions={"trace": self._trace})
+            if response.status_code not in RETRY_STATUS or tentativa == self.retries:
+                return response
+            time.sleep(self._retry_after(response, tentativa))
+        return response
+
+    def estatisticas(self):
+        """
+        Retorna o uso do pool
+
+        Returns:
+            dict: backend, http2, requisições, conexões abertas e taxa de reuso
+        """
+        if self.backend == "requests":
+            # Contadores mantidos pelo urllib3 em cada pool de host
+            hosts = self._adapter.poolmanager.pools
+            pools = [hosts[chave] for chave in hosts.keys()]
+            conexoes = sum(pool.num_connections for pool in pools)
+            requisicoes = sum(pool.num_requests for pool in pools)
+        else:
+            with self._lock:
+                conexoes = self._conexoes
+                requisicoes = self._requisicoes
+
+        return {
+            "backend": self.backend,
+            "http2": self.http2,
+            "requisicoes": requisicoes,
+            "conexoes": conexoes,
+            "reuso": (1 - conexoes / requisicoes) if requisicoes else 0.0
+        }
+
+    def close(self):
+        """Fecha todas as conexões do pool"""
+        self._client.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool(**opcoes):
+    """
+    Retorna o HttpPool compartilhado do processo
+
+    Args:
+        **opcoes: Parâmetros do HttpPool, usados apenas na primeira chamada
+
+    Returns:
+        HttpPool: Pool compartilhado
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpPool(**opcoes)
+        return _pool
+
+
+class CircuitBreaker:
+    """Circuito por URL: abre após falhas consecutivas, com pausa exponencial"""
+
+    def __init__(self, limite_falhas=3, pausa=15.0, pausa_maxima=300.0):
+        """
+        Args:
+            limite_falhas: Falhas consecutivas que abrem o circuito
+            pausa: Tempo inicial (segundos) com o circuito aberto
+            pausa_maxima: Teto da pausa exponencial em segundos
+        """
+        self.limite_falhas = limite_falhas
+        self.pausa = pausa
+        self.pausa_maxima = pausa_maxima
+        self._estado = {}  # url -> {"falhas": int, "aberturas": int, "aberto_ate": float}
+        self._lock = threading.Lock()
+
+    def _obter(self, url):
+        return self._estado.setdefault(url, {"falhas": 0, "aberturas": 0, "aberto_ate": 0.0})
+
+    def disponivel(self, url, agora=None):
+        """Indica se a URL pode ser tentada (circuito fechado ou pausa encerrada)"""
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            return self._obter(url)["aberto_ate"] <= agora
+
+    def sucesso(self, url):
+        """Registra uma resposta válida e fecha o circuito"""
+        with self._lock:
+            estado = self._obter(url)
+            estado["falhas"] = 0
+            estado["aberturas"] = 0
+            estado["aberto_ate"] = 0.0
+
+    def falha(self, url, agora=None):
+        """Registra uma falha; abre o circuito ao atingir o limite"""
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            estado = self._obter(url)
+            estado["falhas"] += 1
+            if estado["falhas"] >= self.limite_falhas:
+                pausa = min(self.pausa_maxima, self.pausa * (2 ** estado["aberturas"]))
+                estado["aberturas"] += 1
+                estado["falhas"] = 0
+                estado["aberto_ate"] = agora + pausa
+                logger.warning(f"Circuit open for {url} ({pausa:.0f}s)")
+
+    def estatisticas(self):
+        """Retorna o estado do circuito de cada URL"""
+        agora = time.monotonic()
+        with self._lock:
+            return {
+                url: {
+                    "aberto": estado["aberto_ate"] > agora,
+                    "falhas": estado["falhas"],
+                    "reabre_em": max(0.0, estado["aberto_ate"] - agora)
+                }
+                for url, estado in self._estado.items()
+            }
+
+
+class ConditionalPoller:
+    """Polling HTTP com requisições condicionais (ETag / If-Modified-Since) e cache com TTL"""
+
+    def __init__(self, pool=None, ttl=2.0):
+        """
+        Args:
+            pool: HttpPool usado nas requisições (padrão: o pool compartilhado)
+            ttl: Tempo (segundos) em que a última resposta é reutilizada sem ir à rede
+        """
+        self.pool = pool or get_http_pool()
+        self.ttl = ttl
+        self._cache = {}  # url -> {"data", "etag", "last_modified", "obtido_em"}
+        self._lock = threading.Lock()
+        self.requisicoes = 0
+        self.nao_modificados = 0
+        self.cache_hits = 0
+
+    def poll(self, url, headers=None, timeout=10):
+        """
+        Consulta um endpoint, reaproveitando a resposta anterior quando nada mudou
+
+        Args:
+            url: URL do endpoint
+            headers: Cabeçalhos adicionais da requisição
+            timeout: Timeout em segundos
+
+        Returns:
+            tuple: (dados, mudou) - dados é None se a requisição falhou sem cache;
+                   mudou é False quando a resposta veio do cache ou foi 304
+        """
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._cache.get(url)
+            if entrada and agora - entrada["obtido_em"] < self.ttl:
+                self.cache_hits += 1
+                return entrada["data"], False
+
+        cabecalhos = dict(headers or {})
+        if entrada:
+            if entrada["etag"]:
+                cabecalhos["If-None-Match"] = entrada["etag"]
+            if entrada["last_modified"]:
+                cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+
+        response = self.pool.get(url, headers=cabecalhos, timeout=timeout)
+        with self._lock:
+            self.requisicoes += 1
+            if response.status_code == 304 and entrada:
+                self.nao_modificados += 1
+                entrada["obtido_em"] = agora
+                return entrada["data"], False
+            if response.status_code != 200:
+                return None, False
+
+            etag = response.headers.get("ETag")
+            # Mesmo ETag sem suporte a 304: o corpo não mudou, evita o parse do JSON
+            if entrada and etag and etag == entrada["etag"]:
+                self.nao_modificados += 1
+                entrada["obtido_em"] = agora
+                return entrada["data"], False
+
+        data = response.json()
+        with self._lock:
+            self._cache[url] = {
+                "data": data,
+                "etag": etag,
+                "last_modified": response.headers.get("Last-Modified"),
+                "obtido_em": agora
+            }
+        return data, True
+
+    def estatisticas(self):
+        """Retorna requisições feitas, respostas não modificadas e acertos do cache"""
+        with self._lock:
+            return {
+                "requisicoes": self.requisicoes,
+                "nao_modificados": self.nao_modificados,
+                "cache_hits": self.cache_hits
+            }
+
+
+class HistoryRequestError(Exception):
+    """Busca de histórico incompleta: resposta HTTP de erro depois das retentativas do pool"""
+
+
+class TooManyPages(HistoryRequestError):
+    """O intervalo pedido tem mais páginas que max_paginas (divida o intervalo)"""
+
+
+def fetch_history_range(url, desde_ms, ate_ms, headers=None, pool=None, max_paginas=10, timeout=10):
+    """
+    Busca no endpoint de histórico paginado os rounds de um intervalo de tempo
+
+    Args:
+        url: Endpoint de histórico (ex: https://blaze.com/api/roulette_games/history)
+        desde_ms: Início do intervalo em epoch (ms)
+        ate_ms: Fim do intervalo em epoch (ms)
+        headers: Cabeçalhos adicionais das requisições
+        pool: HttpPool usado (padrão: o pool compartilhado)
+        max_paginas: Limite de páginas consultadas
+        timeout: Timeout de cada requisição em segundos
+
+    Returns:
+        list: Rounds do intervalo, como retornados pela API
+
+    Raises:
+        HistoryRequestError: Resposta diferente de 200 (o intervalo não foi buscado por inteiro)
+        TooManyPages: O intervalo tem mais de max_paginas páginas
+    """
+    pool = pool or get_http_pool()
+    formato = "%Y-%m-%dT%H:%M:%S.%fZ"
+    parametros = {
+        "startDate": datetime.fromtimestamp(desde_ms / 1000, timezone.utc).strftime(formato),
+        "endDate": datetime.fromtimestamp(ate_ms / 1000, timezone.utc).strftime(formato)
+    }
+
+    rodadas = []
+    pagina = 1
+    while pagina <= max_paginas:
+        response = pool.get(f"{url}?{urlencode(dict(parametros, page=pagina))}", headers=headers, timeout=timeout)
+        if response.status_code != 200:
+            # O pool já esgotou as retentativas: um resultado parcial seria gravado como completo
+            raise HistoryRequestError(f"History request failed for {url} (page {pagina}): HTTP {response.status_code}")
+        data = response.json()
+        registros = data.get("records", []) if isinstance(data, dict) else data
+        total_paginas = data.get("total_pages", 1) if isinstance(data, dict) else 1
+        if total_paginas > max_paginas:
+            raise TooManyPages(f"History range for {url} has {total_paginas} pages (max_paginas={max_paginas})")
+        rodadas.extend(registros)
+        if not registros or pagina >= total_paginas:
+            break
+        pagina += 1
+    return rodadas
+
+
+def payload_valido(data, campos=("created_at",)):
+    """
+    Verifica se a resposta é uma lista de rounds com os campos esperados
+
+    Args:
+        data: JSON retornado pela API
+        campos: Campos obrigatórios em cada round
+
+    Returns:
+        bool: True se houver ao menos um round e todos tiverem os campos
+    """
+    if not isinstance(data, list) or not data:
+        return False
+    return all(isinstance(item, dict) and all(campo in item for campo in campos) for item in data)
+
+
+class HedgedFetcher:
+    """Busca JSON na primeira URL que responder com dados válidos"""
+
+    def __init__(self, headers=None, timeout=10.0, atraso_hedge=0.3, breaker=None, max_workers=8, pool=None):
+        """
+        Args:
+            headers: Cabeçalhos HTTP enviados em todas as requisições
+            timeout: Tempo máximo (segundos) de uma busca completa
+            atraso_hedge: Espera (segundos) antes de disparar a próxima URL em paralelo
+            breaker: CircuitBreaker compartilhado (padrão: um novo por fetcher)
+            max_workers: Requisições simultâneas no pool de threads
+            pool: HttpPool usado nas requisições (padrão: o pool compartilhado)
+        """
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.atraso_hedge = atraso_hedge
+        self.breaker = breaker or CircuitBreaker()
+        self.pool = pool or get_http_pool()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blaze-http")
+
+    def _requisitar(self, url, validar):
+        """Executa uma requisição e devolve os dados ou lança exceção"""
+        try:
+            response = self.pool.get(url, headers=self.headers, timeout=self.timeout)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            data = response.json()
+            if validar is not None and not validar(data):
+                raise ValueError("invalid payload")
+        except Exception:
+            self.breaker.falha(url)
+            raise
+        self.breaker.sucesso(url)
+        return data
+
+    def fetch(self, urls, validar=None):
+        """
+        Busca as URLs de forma escalonada e retorna a primeira resposta válida
+
+        Args:
+            urls: URLs espelho, em ordem de preferência
+            validar: Função que recebe o JSON e retorna True se for utilizável
+
+        Returns:
+            tuple: (url, dados) da primeira resposta válida, ou (None, None)
+        """
+        # URLs com circuito aberto ficam de fora; se todas estiverem, tenta todas
+        candidatas = [url for url in urls if self.breaker.disponivel(url)] or list(urls)
+        limite = time.monotonic() + self.timeout
+        pendentes = {}
+        proxima = 0
+
+        while proxima < len(candidatas) or pendentes:
+            # Dispara a próxima URL a cada volta: a primeira, e depois cada vez que o atraso de
+            # hedge passa sem resposta ou uma requisição falha (um sucesso retorna abaixo)
+            if proxima < len(candidatas):
+                url = candidatas[proxima]
+                pendentes[self._executor.submit(self._requisitar, url, validar)] = url
+                proxima += 1
+
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+
+            espera = min(self.atraso_hedge, restante) if proxima < len(candidatas) else restante
+            concluidas, _ = wait(list(pendentes), timeout=espera, return_when=FIRST_COMPLETED)
+
+            for futuro in concluidas:
+                url = pendentes.pop(futuro)
+                try:
+                    return url, futuro.result()
+                except Exception as e:
+                    logger.warning(f"Fetch failed for {url}: {str(e)}")
+
+        # As requisições ainda pendentes terminam em segundo plano (limitadas pelo timeout)
+        return None, None
+
+    def close(self):
+        """Libera o pool de threads"""
+        self._executor.shutdown(wait=False)
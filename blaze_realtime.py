@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Blaze Realtime
+Conexão única com o servidor de replicação (Socket.IO) compartilhada por todos os jogos.
+
+Cada jogo registra uma inscrição (evento + mensagem de entrada na sala) em vez de abrir
+o seu próprio WebSocket. Os eventos recebidos são roteados pelo nome para o handler do jogo,
+então adicionar um jogo adiciona uma inscrição, não uma conexão.
+
+Todas as conexões rodam em um único event loop asyncio (CollectorEngine), executado em uma
+thread de fundo: não há uma thread por socket nem espera ativa pelo handshake. O código
+síncrono (menus, CasinoPredictor, BlazeAPI) usa as fachadas connect/subscribe/close, e o
+código assíncrono pode aguardar connect_async/subscribe_async diretamente.
+
+Um socket meio aberto não dispara erro nem fechamento: o FeedWatchdog aprende o intervalo
+normal entre rounds de cada jogo e, quando um feed passa de um múltiplo desse intervalo sem
+rounds, reenvia a inscrição e, se continuar parado, força a reconexão.
+"""
+
+import json
+import ssl
+import time
+import random
+import asyncio
+import logging
+import threading
+import websockets
+from collections import deque
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usa o json da biblioteca padrão
+    orjson = None
+
+logger = logging.getLogger("BlazeRealtime")
+
+# Endpoint de replicação usado por Double, Crash, Mines, etc.
+BLAZE_REPLICATION_URL = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
+
+
+class CollectorEngine:
+    """Event loop asyncio compartilhado por todos os feeds do processo"""
+
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Inicia o event loop em uma thread de fundo (idempotente)"""
+        with self._lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+
+            self.loop = asyncio.new_event_loop()
+            pronto = threading.Event()
+
+            def executar():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(pronto.set)
+                self.loop.run_forever()
+
+            self.thread = threading.Thread(target=executar, name="collector-engine")
+            self.thread.daemon = True
+            self.thread.start()
+            pronto.wait()
+
+    def in_loop(self):
+        """Indica se o chamador está rodando dentro do event loop"""
+        return self.thread is threading.current_thread()
+
+    def submit(self, coro):
+        """
+        Agenda uma corrotina no event loop
+
+        Returns:
+            concurrent.futures.Future: Resultado da corrotina
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro, timeout=None):
+        """Executa uma corrotina no event loop e aguarda o resultado (bloqueante)"""
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        """Para o event loop, cancelando antes as corrotinas pendentes (ex: conexões em andamento)"""
+        if self.loop is not None and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._parar(), self.loop)
+
+    async def _parar(self, timeout=1.0):
+        atual = asyncio.current_task()
+        pendentes = [tarefa for tarefa in asyncio.all_tasks() if tarefa is not atual]
+        for tarefa in pendentes:
+            tarefa.cancel()
+        if pendentes:
+            await asyncio.wait(pendentes, timeout=timeout)
+        self.loop.stop()
+
+
+class FrameDecoder:
+    """
+    Decodificador de pacotes Engine.IO/Socket.IO para o caminho quente
+
+    Lê o tipo do pacote e o nome do evento direto da string, sem parse completo, e descarta
+    eventos sem inscrição antes de qualquer trabalho de JSON. Só os eventos inscritos são
+    decodificados, com orjson quando disponível.
+    """
+
+    def __init__(self):
+        self.loads = orjson.loads if orjson is not None else json.loads
+        self.backend = "orjson" if orjson is not None else "json"
+        self.frames = 0
+        self.descartados = 0
+        self.erros = 0
+        self.tempo_ns = 0
+        self.tempo_max_ns = 0
+        # Evento -> [frames decodificados, tempo total em ns]
+        self.por_evento = {}
+
+    def decode(self, frame, eventos):
+        """
+        Decodifica um pacote de evento Socket.IO (42...)
+
+        Args:
+            frame: Frame de texto recebido do WebSocket
+            eventos: Coleção com os nomes de eventos de interesse
+
+        Returns:
+            tuple: (evento, payload) ou None se o frame não for um evento inscrito
+        """
+        inicio = time.perf_counter_ns()
+        self.frames += 1
+        try:
+            resultado = self._decode(frame, eventos)
+        except ValueError:
+            self.erros += 1
+            resultado = None
+
+        custo = time.perf_counter_ns() - inicio
+        self.tempo_ns += custo
+        if custo > self.tempo_max_ns:
+            self.tempo_max_ns = custo
+        if resultado is not None:
+            metricas = self.por_evento.setdefault(resultado[0], [0, 0])
+            metricas[0] += 1
+            metricas[1] += custo
+        return resultado
+
+    def _decode(self, frame, eventos):
+        # Engine.IO "4" (message) + Socket.IO "2" (event)
+        if not frame.startswith("42"):
+            self.descartados += 1
+            return None
+
+        # Namespace opcional ("/nsp,") e id de ack opcional antes do array
+        pos = 2
+        if frame.startswith("/", pos):
+            pos = frame.index(",", pos) + 1
+        inicio_array = frame.index("[", pos)
+
+        # Nome do evento: primeira string do array, lida sem decodificar o resto
+        if frame[inicio_array + 1] != '"':
+            raise ValueError("event name is not a string")
+        fim_nome = frame.index('"', inicio_array + 2)
+        evento = frame[inicio_array + 2:fim_nome]
+        if "\\" in evento:
+            evento = self.loads(frame[inicio_array:])[0]
+
+        if evento not in eventos:
+            self.descartados += 1
+            return None
+
+        data = self.loads(frame[inicio_array:])
+        return evento, (data[1] if len(data) > 1 else None)
+
+    def estatisticas(self):
+        """
+        Retorna o custo de parse por frame
+
+        Returns:
+            dict: Totais do decodificador e custo médio por evento (microssegundos)
+        """
+        return {
+            "backend": self.backend,
+            "frames": self.frames,
+            "descartados": self.descartados,
+            "erros": self.erros,
+            "custo_medio_us": round(self.tempo_ns / self.frames / 1000, 2) if self.frames else 0,
+            "custo_max_us": round(self.tempo_max_ns / 1000, 2),
+            "eventos": {
+                evento: {
+                    "frames": frames,
+                    "custo_medio_us": round(tempo / frames / 1000, 2)
+                }
+                for evento, (frames, tempo) in self.por_evento.items()
+            }
+        }
+
+
+class ReconnectPolicy:
+    """Backoff exponencial com jitter e limite de reconexões por janela de tempo"""
+
+    def __init__(self, base=1.0, maximo=60.0, max_reconexoes=10, janela=300.0):
+        """
+        Args:
+            base: Atraso inicial em segundos
+            maximo: Teto do atraso exponencial em segundos
+            max_reconexoes: Número máximo de reconexões permitidas dentro da janela
+            janela: Tamanho da janela em segundos
+        """
+        self.base = base
+        self.maximo = maximo
+        self.max_reconexoes = max_reconexoes
+        self.janela = janela
+        self._tentativas = deque()
+
+    def atraso(self, tentativa, agora=None):
+        """
+        Calcula quanto esperar antes da próxima tentativa e a registra na janela
+
+        Args:
+            tentativa: Número de falhas consecutivas (0 na primeira reconexão)
+            agora: Instante atual (time.monotonic), para testes
+
+        Returns:
+            float: Atraso em segundos
+        """
+        agora = time.monotonic() if agora is None else agora
+
+        # "Full jitter": espalha as reconexões de vários clientes no tempo
+        atraso = random.uniform(0, min(self.maximo, self.base * (2 ** tentativa)))
+
+        # Descarta tentativas fora da janela e respeita o limite
+        while self._tentativas and agora - self._tentativas[0] >= self.janela:
+            self._tentativas.popleft()
+        if len(self._tentativas) >= self.max_reconexoes:
+            atraso = max(atraso, self._tentativas[0] + self.janela - agora)
+
+        self._tentativas.append(agora + atraso)
+        return atraso
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Retorna o CollectorEngine compartilhado do processo"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = CollectorEngine()
+        return _engine
+
+
+class ReplicationClient:
+    """Conexão Socket.IO multiplexada: um handshake e várias salas, no event loop compartilhado"""
+
+    def __init__(self, url=BLAZE_REPLICATION_URL, verify_ssl=True, policy=None, engine=None, recorder=None):
+        self.url = url
+        self.verify_ssl = verify_ssl
+        self.policy = policy or ReconnectPolicy()
+        self.engine = engine or get_engine()
+        # FrameRecorder opcional: grava cada frame bruto recebido (para replay)
+        self.recorder = recorder
+        self.ws = None
+        self.connected = False
+        self.running = False
+
+        # Decodificador compartilhado por todos os feeds desta conexão
+        self.decoder = FrameDecoder()
+        self._ping_interval = 25.0
+
+        # Métricas do supervisor de reconexão
+        self.reconexoes = 0
+        self.tempo_fora = 0.0
+        self._fora_desde = None
+
+        # Evento -> {"mensagem": frame de inscrição, "handlers": [...], "on_subscribe": [...]}
+        self.subscriptions = {}
+        self._lock = threading.Lock()
+        self._task = None
+        self._aberto = None
+
+    # ------------------------------------------------------------------
+    # API assíncrona
+    # ------------------------------------------------------------------
+
+    async def connect_async(self, timeout=10):
+        """
+        Inicia a conexão (se necessário) e aguarda o handshake
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se a conexão foi estabelecida
+        """
+        self._iniciar()
+        try:
+            await asyncio.wait_for(self._aberto.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout connecting to WebSocket {self.url}")
+            return False
+        return True
+
+    async def subscribe_async(self, evento, handler, mensagem=None, on_subscribe=None):
+        """Versão assíncrona de subscribe: registra e entra na sala se já conectado"""
+        self._registrar(evento, handler, mensagem, on_subscribe)
+        if self.connected:
+            await self._enviar_inscricoes([evento])
+
+    async def send_async(self, message):
+        """Envia um frame pela conexão compartilhada"""
+        if self.ws is None or not self.connected:
+            logger.error("WebSocket not connected")
+            return False
+
+        try:
+            await self.ws.send(message)
+            return True
+        except Exception as e:
+            logger.error(f"Error sending message: {str(e)}")
+            return False
+
+    async def reconnect_async(self):
+        """Aborta o socket atual (sem esperar o fechamento, que não vem num socket meio aberto)"""
+        ws = self.ws
+        if ws is None:
+            return
+        logger.warning(f"Forcing reconnection to {self.url}")
+        transporte = getattr(ws, "transport", None)
+        if transporte is not None:
+            transporte.abort()
+        else:
+            await ws.close()
+
+    async def close_async(self):
+        """Fecha a conexão e cancela a tarefa de leitura"""
+        self.running = False
+        self.connected = False
+        if self.ws is not None:
+            await self.ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def estatisticas(self):
+        """
+        Retorna as métricas de reconexão e de parse por feed (evento) desta conexão
+
+        Returns:
+            dict: Evento -> conectado, reconexões, tempo fora do ar (segundos),
+                  frames decodificados e custo médio de parse (microssegundos)
+        """
+        tempo_fora = self.tempo_fora
+        if self._fora_desde is not None:
+            tempo_fora += time.monotonic() - self._fora_desde
+
+        metricas = {
+            "conectado": self.connected,
+            "reconexoes": self.reconexoes,
+            "tempo_fora": round(tempo_fora, 1)
+        }
+        parse = self.decoder.estatisticas()["eventos"]
+
+        feeds = {}
+        for evento in self.subscriptions:
+            feeds[evento] = dict(metricas)
+            feeds[evento]["frames"] = parse.get(evento, {}).get("frames", 0)
+            feeds[evento]["custo_parse_us"] = parse.get(evento, {}).get("custo_medio_us", 0)
+        return feeds
+
+    # ------------------------------------------------------------------
+    # Fachada síncrona
+    # ------------------------------------------------------------------
+
+    def subscribe(self, evento, handler, mensagem=None, on_subscribe=None):
+        """
+        Registra um handler para um evento na conexão compartilhada
+
+        Args:
+            evento: Nome do evento Socket.IO (ex: "double.tick")
+            handler: Função chamada com o payload de cada evento recebido
+            mensagem: Frame enviado para entrar na sala (padrão: 42["subscribe",[evento]])
+            on_subscribe: Callback chamado sempre que a inscrição é enviada ao servidor
+        """
+        self._registrar(evento, handler, mensagem, on_subscribe)
+
+        # Se a conexão já está aberta, entra na sala imediatamente
+        if self.connected:
+            self.engine.submit(self._enviar_inscricoes([evento]))
+
+    def start(self):
+        """Inicia a conexão no event loop compartilhado (não bloqueia)"""
+        self.engine.start()
+        self.engine.loop.call_soon_threadsafe(self._iniciar)
+
+    def connect(self, timeout=10):
+        """Inicia a conexão e aguarda o handshake (bloqueante)"""
+        return self.engine.call(self.connect_async(timeout))
+
+    def send(self, message):
+        """Envia um frame pela conexão compartilhada (não bloqueia)"""
+        if not self.connected:
+            logger.error("WebSocket not connected")
+            return False
+        self.engine.submit(self.send_async(message))
+        return True
+
+    def reconnect(self):
+        """Derruba a conexão atual para o supervisor reconectar (não bloqueia)"""
+        if self._task is not None:
+            self.engine.submit(self.reconnect_async())
+
+    def resubscribe(self, eventos=None):
+        """Reenvia as inscrições pela conexão atual (não bloqueia)"""
+        if self.connected:
+            self.engine.submit(self._enviar_inscricoes(eventos))
+
+    def close(self):
+        """Fecha a conexão"""
+        if self._task is None:
+            self.running = False
+            return
+
+        if self.engine.in_loop():
+            self.engine.loop.create_task(self.close_async())
+            return
+
+        try:
+            self.engine.call(self.close_async(), timeout=5)
+        except Exception as e:
+            logger.error(f"Error closing WebSocket {self.url}: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Internos (executados no event loop)
+    # ------------------------------------------------------------------
+
+    def _registrar(self, evento, handler, mensagem, on_subscribe):
+        """Guarda a inscrição; ela é (re)enviada a cada conexão"""
+        if mensagem is None:
+            mensagem = json.dumps(["subscribe", [evento]], separators=(',', ':'))
+            mensagem = f"42{mensagem}"
+
+        with self._lock:
+            sub = self.subscriptions.setdefault(evento, {
+                "mensagem": mensagem,
+                "handlers": [],
+                "on_subscribe": []
+            })
+            sub["handlers"].append(handler)
+            if on_subscribe:
+                sub["on_subscribe"].append(on_subscribe)
+
+    def _iniciar(self):
+        """Cria a tarefa da conexão, caso ainda não exista"""
+        if self._aberto is None:
+            self._aberto = asyncio.Event()
+        if self._task is None or self._task.done():
+            self.running = True
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _ssl_context(self):
+        if not self.url.startswith("wss://"):
+            return None
+
+        contexto = ssl.create_default_context()
+        if not self.verify_ssl:
+            contexto.check_hostname = False
+            contexto.verify_mode = ssl.CERT_NONE
+        return contexto
+
+    async def _run(self):
+        """
+        Supervisor da conexão: um único laço (sem recursão) que reconecta com backoff
+        exponencial e jitter enquanto o cliente estiver ativo
+        """
+        falhas = 0
+        while self.running:
+            heartbeat = None
+            try:
+                async with websockets.connect(self.url, ssl=self._ssl_context(), max_size=None,
+                                              ping_interval=30, ping_timeout=10) as ws:
+                    self.ws = ws
+                    falhas = 0
+                    await self._on_open()
+                    # No Engine.IO v3 quem envia o ping é o cliente
+                    if "EIO=3" in self.url:
+                        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(ws))
+                    async for message in ws:
+                        if self.recorder is not None:
+                            self.recorder.write(self.url, message)
+                        self._on_message(message)
+                logger.info(f"WebSocket connection closed: {self.url}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket error: {e}")
+            finally:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+                self.ws = None
+                self.connected = False
+                self._aberto.clear()
+                if self._fora_desde is None:
+                    self._fora_desde = time.monotonic()
+
+            if self.running:
+                atraso = self.policy.atraso(falhas)
+                falhas += 1
+                self.reconexoes += 1
+                logger.warning(f"Reconnecting to {self.url} in {atraso:.1f}s (attempt {falhas})")
+                await asyncio.sleep(atraso)
+
+    async def _on_open(self):
+        """Conecta ao namespace e entra em todas as salas registradas"""
+        logger.info(f"WebSocket connection established to {self.url}")
+        self.connected = True
+        if self._fora_desde is not None:
+            self.tempo_fora += time.monotonic() - self._fora_desde
+            self._fora_desde = None
+        await self.ws.send("40")
+        await self._enviar_inscricoes()
+        self._aberto.set()
+
+    async def _enviar_inscricoes(self, eventos=None):
+        """Envia as mensagens de inscrição (uma vez por sala) e avisa os jogos"""
+        with self._lock:
+            if eventos is None:
+                eventos = list(self.subscriptions)
+            inscricoes = [self.subscriptions[evento] for evento in eventos]
+
+        enviadas = set()
+        for sub in inscricoes:
+            if sub["mensagem"] not in enviadas:
+                await self.send_async(sub["mensagem"])
+                enviadas.add(sub["mensagem"])
+            for callback in sub["on_subscribe"]:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error in subscribe callback: {str(e)}")
+
+    async def _heartbeat(self, ws):
+        """Envia o ping do Engine.IO no intervalo anunciado pelo servidor"""
+        while True:
+            await asyncio.sleep(self._ping_interval)
+            await ws.send("2")
+
+    def dispatch(self, message):
+        """Processa um frame bruto como se tivesse chegado pelo socket (usado no replay)"""
+        self._on_message(message)
+
+    def _on_message(self, message):
+        """Roteia cada evento Socket.IO para os handlers inscritos"""
+        if not isinstance(message, str) or not message:
+            return
+
+        tipo = message[0]
+        if tipo != "4":
+            self._on_controle(tipo, message)
+            return
+
+        resultado = self.decoder.decode(message, self.subscriptions)
+        if resultado is None:
+            return
+
+        evento, payload = resultado
+        for handler in self.subscriptions[evento]["handlers"]:
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Error processing {evento} event: {str(e)}")
+
+    def _on_controle(self, tipo, message):
+        """Trata os pacotes de controle do Engine.IO (open, ping)"""
+        if tipo == "0":
+            try:
+                handshake = json.loads(message[1:])
+                self._ping_interval = handshake.get("pingInterval", 25000) / 1000
+            except ValueError:
+                pass
+        elif tipo == "2" and self.ws is not None:
+            # Engine.IO v4: o servidor envia o ping e espera o pong
+            asyncio.get_running_loop().create_task(self.send_async("3" + message[1:]))
+
+
+class FeedWatchdog:
+    """Detecta feeds parados pela cadência normal de rounds de cada jogo e força a recuperação"""
+
+    def __init__(self, multiplo=3.0, minimo=5.0, alpha=0.1, verificar_a_cada=1.0, engine=None, on_stale=None):
+        """
+        Args:
+            multiplo: Múltiplo do intervalo normal sem rounds a partir do qual o feed está parado
+            minimo: Limite mínimo em segundos (evita alarmes em jogos muito rápidos)
+            alpha: Peso de cada novo intervalo na média móvel exponencial
+            verificar_a_cada: Intervalo entre verificações em segundos
+            engine: CollectorEngine onde a verificação roda (padrão: o compartilhado)
+            on_stale: Callback (feed, acao) chamado quando um feed parado é detectado
+        """
+        self.multiplo = multiplo
+        self.minimo = minimo
+        self.alpha = alpha
+        self.verificar_a_cada = verificar_a_cada
+        self.engine = engine or get_engine()
+        self.on_stale = on_stale
+        # Feed -> estado (cliente, evento, intervalo aprendido, último round, ações)
+        self.feeds = {}
+        self._lock = threading.Lock()
+        self._task = None
+
+    def watch(self, feed, client, evento, intervalo_inicial):
+        """
+        Passa a vigiar um feed
+
+        Args:
+            feed: Nome do feed (ex: "double")
+            client: ReplicationClient que entrega o feed
+            evento: Evento inscrito (ex: "double.tick")
+            intervalo_inicial: Intervalo esperado entre rounds em segundos, até aprender o real
+        """
+        agora = time.monotonic()
+        with self._lock:
+            self.feeds[feed] = {
+                "client": client,
+                "evento": evento,
+                "intervalo": float(intervalo_inicial),
+                "amostras": 0,
+                "ultimo": None,
+                "referencia": agora,  # Último round ou última ação de recuperação
+                "parado": False,
+                "escalonamento": 0,
+                "reinscricoes": 0,
+                "reconexoes": 0
+            }
+        if self._task is None:
+            self._task = self.engine.submit(self._vigiar())
+
+    def beat(self, feed, agora=None):
+        """
+        Informa que um round do feed chegou
+
+        Args:
+            feed: Nome do feed
+            agora: Instante (time.monotonic), para testes
+        """
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            estado = self.feeds.get(feed)
+            if estado is None:
+                return
+            if estado["ultimo"] is not None:
+                intervalo = agora - estado["ultimo"]
+                # Intervalos de uma parada não entram na média (não inflam o limite).
+                # Média simples nas primeiras amostras (substitui logo o valor inicial), depois exponencial
+                if intervalo <= self._limite(estado):
+                    estado["amostras"] += 1
+                    peso = max(self.alpha, 1.0 / estado["amostras"])
+                    estado["intervalo"] += peso * (intervalo - estado["intervalo"])
+            if estado["parado"]:
+                logger.info(f"Feed {feed} recovered")
+            estado["ultimo"] = agora
+            estado["referencia"] = agora
+            estado["parado"] = False
+            estado["escalonamento"] = 0
+
+    def stale(self, feed):
+        """Indica se o feed está parado"""
+        estado = self.feeds.get(feed)
+        return bool(estado and estado["parado"])
+
+    def _limite(self, estado):
+        return max(self.minimo, self.multiplo * estado["intervalo"])
+
+    def check(self, agora=None):
+        """
+        Verifica todos os feeds e recupera os parados (reinscrição e, depois, reconexão)
+
+        Args:
+            agora: Instante (time.monotonic), para testes
+
+        Returns:
+            list: (feed, ação) das recuperações disparadas
+        """
+        agora = time.monotonic() if agora is None else agora
+        acoes = []
+        with self._lock:
+            for feed, estado in self.feeds.items():
+                if agora - estado["referencia"] <= self._limite(estado):
+                    continue
+                estado["parado"] = True
+                estado["referencia"] = agora
+                client = estado["client"]
+                if estado["escalonamento"] == 0 and client.connected:
+                    # Primeiro tenta entrar de novo na sala pela conexão atual
+                    estado["escalonamento"] = 1
+                    estado["reinscricoes"] += 1
+                    acoes.append((feed, "resubscribe"))
+                else:
+                    # Continua parado: derruba o socket (pode estar meio aberto)
+                    estado["escalonamento"] = 0
+                    estado["reconexoes"] += 1
+                    acoes.append((feed, "reconnect"))
+
+        for feed, acao in acoes:
+            estado = self.feeds[feed]
+            logger.warning(f"Feed {feed} stale: no round for {self._limite(estado):.0f}s, trying {acao}")
+            if acao == "resubscribe":
+                estado["client"].resubscribe([estado["evento"]])
+            else:
+                estado["client"].reconnect()
+            if self.on_stale is not None:
+                try:
+                    self.on_stale(feed, acao)
+                except Exception as e:
+                    logger.error(f"Error in stale callback: {str(e)}")
+        return acoes
+
+    async def _vigiar(self):
+        while True:
+            await asyncio.sleep(self.verificar_a_cada)
+            self.check()
+
+    def estatisticas(self, agora=None):
+        """
+        Retorna, por feed, o tempo desde o último round, o intervalo aprendido e as recuperações
+
+        Returns:
+            dict: Feed -> ultimo_round_s (None se nenhum), intervalo_s, limite_s, parado,
+                  reinscricoes, reconexoes
+        """
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            return {
+                feed: {
+                    "ultimo_round_s": round(agora - estado["ultimo"], 1) if estado["ultimo"] is not None else None,
+                    "intervalo_s": round(estado["intervalo"], 1),
+                    "limite_s": round(self._limite(estado), 1),
+                    "parado": estado["parado"],
+                    "reinscricoes": estado["reinscricoes"],
+                    "reconexoes": estado["reconexoes"]
+                }
+                for feed, estado in self.feeds.items()
+            }
+
+
+async def connect_all(clients, timeout=10):
+    """
+    Conecta vários clientes em paralelo no event loop compartilhado
+
+    Args:
+        clients: Lista de ReplicationClient
+        timeout: Tempo máximo de espera (total, não por cliente)
+
+    Returns:
+        list: Resultado (bool) de cada conexão, na mesma ordem
+    """
+    return await asyncio.gather(*(client.connect_async(timeout) for client in clients))
@@ -1,22 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import time
 import random
-import requests
-import threading
-import websocket
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 import sys
 from colorama import Fore, Back, Style, init
 
+from blaze_realtime import ReplicationClient, get_engine
+from round_history import RoundHistory, parse_epoch_ms
+from round_sequencer import RoundSequencer
+
 # Inicializa o colorama
 init(autoreset=True)
 
 class BlazeAPI:
-    def __init__(self):
+    def __init__(self, history_capacity=10000, retention_hours=24):
         self.base_url = "https://blaze.com/api"
         self.double_ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
         self.ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
@@ -25,9 +25,14 @@ class BlazeAPI:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
-        self.ws = None
-        self.double_data = []
-        self.mines_data = []
+        self.realtime_clients = {}  # Uma conexão de replicação por servidor, compartilhada pelos jogos
+        # Buffers circulares de capacidade fixa (mais recente primeiro) com janela de retenção
+        self.retention_hours = retention_hours
+        self.double_data = RoundHistory(history_capacity, retencao_s=retention_hours * 3600)
+        self.mines_data = RoundHistory(history_capacity, retencao_s=retention_hours * 3600)
+        # Sequenciadores: cada round entra uma única vez, em ordem de horário do servidor
+        self.double_sequencer = RoundSequencer(self.double_data, nome="double")
+        self.mines_sequencer = RoundSequencer(self.mines_data, nome="mines")
         self.double_last_update = None
         self.mines_last_update = None
         self.double_backtest_results = {"wins": 0, "losses": 0, "last_result": None}
@@ -37,8 +42,8 @@ class BlazeAPI:
         self.mines_prediction = None
         self.double_confidence = 0
         self.mines_confidence = 0
-        self.double_realtime_thread = None
-        self.mines_realtime_thread = None
+        self.double_subscribed = False
+        self.mines_subscribed = False
         self.running = True
 
     def get_double_history(self):
@@ -62,7 +67,7 @@ class BlazeAPI:
                     color = 0  # Branco
                 
                 # Cria um timestamp para o resultado
-                timestamp = datetime.now() - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
+                timestamp = datetime.now(timezone.utc) - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
                 
                 # Adiciona o resultado simulado aos dados
                 simulated_data.append({
@@ -76,7 +81,9 @@ class BlazeAPI:
             # Ordena os dados por timestamp (mais recente primeiro)
             simulated_data.sort(key=lambda x: x['created_at'], reverse=True)
             
-            self.double_data = simulated_data
+            self.double_sequencer.clear()
+            for item in reversed(simulated_data):
+                self.double_sequencer.offer(item, item['id'], parse_epoch_ms(item['created_at']))
             self.double_last_update = datetime.now()
             print(f"{Fore.GREEN}Dados simulados do Double gerados com sucesso: {len(simulated_data)} resultados")
             return simulated_data
@@ -151,7 +158,7 @@ class BlazeAPI:
                         grid.append(0)  # 0 representa uma posição segura
                 
                 # Cria um timestamp para o jogo
-                timestamp = datetime.now() - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
+                timestamp = datetime.now(timezone.utc) - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
                 
                 # Adiciona o jogo simulado aos dados
                 simulated_data.append({
@@ -164,7 +171,9 @@ class BlazeAPI:
             # Ordena os dados por timestamp (mais recente primeiro)
             simulated_data.sort(key=lambda x: x['created_at'], reverse=True)
             
-            self.mines_data = simulated_data
+            self.mines_sequencer.clear()
+            for item in reversed(simulated_data):
+                self.mines_sequencer.offer(item, item['id'], parse_epoch_ms(item['created_at']))
             self.mines_last_update = datetime.now()
             print(f"{Fore.GREEN}Dados simulados do Mines gerados com sucesso: {len(simulated_data)} resultados")
             return simulated_data
@@ -172,116 +181,75 @@ class BlazeAPI:
             print(f"{Fore.RED}Erro ao gerar dados simulados do Mines: {str(e)}")
             return []
 
+    def _realtime_client(self, url):
+        """Retorna a conexão de replicação compartilhada para a URL (uma por servidor)"""
+        if url not in self.realtime_clients:
+            self.realtime_clients[url] = ReplicationClient(url)
+        return self.realtime_clients[url]
+
     def start_double_realtime(self):
-        """Inicia a conexão websocket para receber atualizações em tempo real do Double"""
-        if self.double_realtime_thread is None or not self.double_realtime_thread.is_alive():
-            self.double_realtime_thread = threading.Thread(target=self._double_realtime_worker)
-            self.double_realtime_thread.daemon = True
-            self.double_realtime_thread.start()
-
-    def _double_realtime_worker(self):
-        """Worker thread para manter a conexão websocket do Double"""
-        def on_message(ws, message):
-            try:
-                # Mensagens do websocket geralmente começam com um número e dois pontos
-                if message.startswith("42"):
-                    # Remove o prefixo e analisa o JSON
-                    data = json.loads(message[2:])
-                    if len(data) > 1 and data[0] == "double.tick":
-                        # Atualiza os dados do Double com o novo resultado
-                        new_data = data[1]
-                        if new_data.get("status") == "complete":
-                            # Adiciona o novo resultado ao histórico
-                            self.double_data.insert(0, new_data)
-                            # Mantém apenas os dados das últimas 24 horas
-                            cutoff_time = datetime.now() - timedelta(days=1)
-                            self.double_data = [item for item in self.double_data if 
-                                               datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ") >= cutoff_time]
-                            # Atualiza a previsão com base nos novos dados
-                            self._update_double_prediction()
-                            print(f"{Fore.GREEN}Novo resultado do Double recebido: {self.double_colors.get(new_data.get('color', -1), 'DESCONHECIDO')}")
-            except Exception as e:
-                print(f"{Fore.RED}Erro ao processar mensagem do Double: {str(e)}")
-
-        def on_error(ws, error):
-            print(f"{Fore.RED}Erro na conexão websocket do Double: {str(error)}")
-
-        def on_close(ws, close_status_code, close_msg):
-            print(f"{Fore.YELLOW}Conexão websocket do Double fechada")
-            # Tenta reconectar após 5 segundos se o programa ainda estiver rodando
-            if self.running:
-                time.sleep(5)
-                self._double_realtime_worker()
-
-        def on_open(ws):
-            print(f"{Fore.GREEN}Conexão websocket do Double estabelecida")
-            # Envia mensagem de inicialização para o websocket
-            ws.send("40")
-            time.sleep(1)
-            ws.send("42[\"join-room\",\"double\"]")
-
-        # Configura e inicia o websocket
-        websocket.enableTrace(False)
-        self.ws = websocket.WebSocketApp(self.double_ws_url,  # Usa a URL específica para o Double
-                                         on_message=on_message,
-                                         on_error=on_error,
-                                         on_close=on_close,
-                                         on_open=on_open)
-        self.ws.run_forever()
+        """Inscreve o Double na conexão websocket compartilhada para receber atualizações em tempo real"""
+        if self.double_subscribed:
+            return
+
+        client = self._realtime_client(self.double_ws_url)
+        client.subscribe("double.tick", self._on_double_tick,
+                         mensagem="42[\"join-room\",\"double\"]",
+                         on_subscribe=self._on_double_subscribe)
+        self.double_subscribed = True
+        client.start()
+
+    def _on_double_subscribe(self):
+        """Chamado a cada (re)inscrição do Double: o próximo round é verificado quanto a lacunas"""
+        self.double_sequencer.marcar_reconexao()
+        print(f"{Fore.GREEN}Conexão websocket do Double estabelecida")
+
+    def _on_double_tick(self, new_data):
+        """Processa um evento double.tick recebido pela conexão compartilhada"""
+        try:
+            # Atualiza os dados do Double com o novo resultado
+            if new_data.get("status") == "complete":
+                # Adiciona o novo resultado ao histórico (ticks repetidos do mesmo round são ignorados)
+                if not self.double_sequencer.offer(new_data, new_data.get('id'), parse_epoch_ms(new_data.get('created_at'))):
+                    return
+                # Mantém apenas a janela de retenção (descarta pela ponta mais antiga)
+                self.double_data.expire()
+                # Atualiza a previsão com base nos novos dados
+                self._update_double_prediction()
+                print(f"{Fore.GREEN}Novo resultado do Double recebido: {self.double_colors.get(new_data.get('color', -1), 'DESCONHECIDO')}")
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao processar mensagem do Double: {str(e)}")
 
     def start_mines_realtime(self):
-        """Inicia a conexão websocket para receber atualizações em tempo real do Mines"""
-        if self.mines_realtime_thread is None or not self.mines_realtime_thread.is_alive():
-            self.mines_realtime_thread = threading.Thread(target=self._mines_realtime_worker)
-            self.mines_realtime_thread.daemon = True
-            self.mines_realtime_thread.start()
-
-    def _mines_realtime_worker(self):
-        """Worker thread para manter a conexão websocket do Mines"""
-        def on_message(ws, message):
-            try:
-                # Como não temos informações específicas sobre o formato das mensagens do Mines,
-                # esta é uma implementação simulada
-                if message.startswith("42"):
-                    data = json.loads(message[2:])
-                    if len(data) > 1 and data[0] == "mines.update":
-                        # Atualiza os dados do Mines com o novo resultado
-                        new_data = data[1]
-                        self.mines_data.insert(0, new_data)
-                        # Mantém apenas os dados das últimas 24 horas
-                        cutoff_time = datetime.now() - timedelta(days=1)
-                        self.mines_data = [item for item in self.mines_data if 
-                                          datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ") >= cutoff_time]
-                        # Atualiza a previsão com base nos novos dados
-                        self._update_mines_prediction()
-            except Exception as e:
-                print(f"{Fore.RED}Erro ao processar mensagem do Mines: {str(e)}")
-
-        def on_error(ws, error):
-            print(f"{Fore.RED}Erro na conexão websocket do Mines: {str(error)}")
-
-        def on_close(ws, close_status_code, close_msg):
-            print(f"{Fore.YELLOW}Conexão websocket do Mines fechada")
-            # Tenta reconectar após 5 segundos se o programa ainda estiver rodando
-            if self.running:
-                time.sleep(5)
-                self._mines_realtime_worker()
-
-        def on_open(ws):
-            print(f"{Fore.GREEN}Conexão websocket do Mines estabelecida")
-            # Envia mensagem de inicialização para o websocket
-            ws.send("40")
-            time.sleep(1)
-            ws.send("42[\"join-room\",\"mines\"]")
-
-        # Configura e inicia o websocket
-        websocket.enableTrace(False)
-        self.ws = websocket.WebSocketApp(self.ws_url,
-                                         on_message=on_message,
-                                         on_error=on_error,
-                                         on_close=on_close,
-                                         on_open=on_open)
-        self.ws.run_forever()
+        """Inscreve o Mines na conexão websocket compartilhada para receber atualizações em tempo real"""
+        if self.mines_subscribed:
+            return
+
+        client = self._realtime_client(self.ws_url)
+        client.subscribe("mines.update", self._on_mines_update,
+                         mensagem="42[\"join-room\",\"mines\"]",
+                         on_subscribe=self._on_mines_subscribe)
+        self.mines_subscribed = True
+        client.start()
+
+    def _on_mines_subscribe(self):
+        """Chamado a cada (re)inscrição do Mines"""
+        self.mines_sequencer.marcar_reconexao()
+        print(f"{Fore.GREEN}Conexão websocket do Mines estabelecida")
+
+    def _on_mines_update(self, new_data):
+        """Processa um evento mines.update recebido pela conexão compartilhada"""
+        try:
+            # Como não temos informações específicas sobre o formato das mensagens do Mines,
+            # esta é uma implementação simulada
+            if not self.mines_sequencer.offer(new_data, new_data.get('id'), parse_epoch_ms(new_data.get('created_at'))):
+                return
+            # Mantém apenas a janela de retenção (descarta pela ponta mais antiga)
+            self.mines_data.expire()
+            # Atualiza a previsão com base nos novos dados
+            self._update_mines_prediction()
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao processar mensagem do Mines: {str(e)}")
 
     def _update_double_prediction(self):
         """Atualiza a previsão do Double com base nos dados históricos"""
@@ -809,14 +777,16 @@ class BlazeAPI:
 
     def get_statistics(self):
         """Retorna estatísticas dos backtests"""
+        # Snapshot O(1) e consistente do histórico (a ingestão continua gravando em paralelo)
+        double_rounds = self.double_data.latest()
         double_stats = {
             "win_rate": round(self.double_backtest_results.get("win_rate", 0), 2),
             "total": self.double_backtest_results.get("total", 0),
             "wins": self.double_backtest_results.get("wins", 0),
             "losses": self.double_backtest_results.get("losses", 0),
-            "red_count": sum(1 for item in self.double_data if item['color'] == 1),
-            "black_count": sum(1 for item in self.double_data if item['color'] == 2),
-            "white_count": sum(1 for item in self.double_data if item['color'] == 0)
+            "red_count": sum(1 for item in double_rounds if item['color'] == 1),
+            "black_count": sum(1 for item in double_rounds if item['color'] == 2),
+            "white_count": sum(1 for item in double_rounds if item['color'] == 0)
         }
         
         mines_stats = {
@@ -826,9 +796,19 @@ class BlazeAPI:
             "losses": self.mines_backtest_results.get("losses", 0)
         }
         
+        # Reconexões e tempo fora do ar de cada feed em tempo real
+        feeds = {}
+        for client in self.realtime_clients.values():
+            feeds.update(client.estatisticas())
+        
         return {
             "double": double_stats,
-            "mines": mines_stats
+            "mines": mines_stats,
+            "feeds": feeds,
+            "sequencers": {
+                "double": self.double_sequencer.estatisticas(),
+                "mines": self.mines_sequencer.estatisticas()
+            }
         }
 
     def initialize(self):
@@ -874,8 +854,9 @@ class BlazeAPI:
         print(f"{Fore.CYAN}Encerrando sistema...")
         
         # Fecha as conexões websocket
-        if self.ws:
-            self.ws.close()
+        for client in self.realtime_clients.values():
+            client.close()
+        get_engine().stop()
         
         print(f"{Fore.GREEN}Sistema encerrado com sucesso!")
 
@@ -937,6 +918,16 @@ def display_statistics(api):
     print(f"{Fore.WHITE}Assertividade total: {stats['mines']['win_rate']}%")
     print(f"{Fore.WHITE}Backtests totais: {stats['mines']['total']}")
     print(f"{Fore.YELLOW}{'-' * 30}")
+    
+    print(f"{Fore.YELLOW}{'-' * 10} Feeds {'-' * 10}")
+    for feed, metricas in stats['feeds'].items():
+        status = "conectado" if metricas['conectado'] else "desconectado"
+        print(f"{Fore.WHITE}{feed}: {status}, {metricas['reconexoes']} reconexões, {metricas['tempo_fora']}s fora do ar")
+        print(f"{Fore.WHITE}    {metricas['frames']} eventos, parse médio de {metricas['custo_parse_us']}µs por frame")
+    for jogo, seq in stats['sequencers'].items():
+        print(f"{Fore.WHITE}{jogo}: {seq['aceitos']} rounds, {seq['duplicados']} duplicados ignorados, "
+              f"{seq['lacunas']} lacunas, {seq['recuperados']} recuperados")
+    print(f"{Fore.YELLOW}{'-' * 30}")
     print(f"{Fore.CYAN}{'#' * 40}")
     
     input(f"\n{Fore.GREEN}Pressione Enter para voltar ao menu...")
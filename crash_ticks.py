@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Crash Ticks
+Gravação compacta da curva de multiplicadores de cada round do Crash.
+
+O coletor só guarda o resultado final de cada round; o CrashTickRecorder guarda também os
+ticks intermediários (instante de recebimento + multiplicador) para análise de tempo e
+atraso. Os ticks de um round ficam em memória em arrays compactos e, quando o round termina,
+são gravados de uma vez como um bloco colunar no arquivo do dia:
+
+    cabeçalho  <4sHqIfB: "CTK1", tamanho do id, início (epoch ms), ticks, crash point, largura do delta
+    id         bytes UTF-8
+    deltas     ms desde o tick anterior (uint16, ou uint32 se algum passar de 65 s)
+    valores    multiplicadores em float32
+
+Todos os campos são little-endian.
+
+Com ~10 ticks/s isso dá cerca de 6 bytes por tick (poucos MB por dia) e um append em array
+por tick no caminho quente.
+
+Estrutura: <diretorio>/AAAA-MM-DD.ctk
+"""
+
+import os
+import sys
+import math
+import time
+import struct
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+logger = logging.getLogger("CrashTicks")
+
+MAGIC = b"CTK1"
+_CABECALHO = struct.Struct("<4sHqIfB")
+
+
+def _tipo_array(codigo, tamanho):
+    """Código de array com o tamanho pedido (os tamanhos de 'I'/'L' variam por plataforma)"""
+    for candidato in codigo:
+        if array(candidato).itemsize == tamanho:
+            return candidato
+    raise RuntimeError(f"no array type with {tamanho} bytes")
+
+
+_UINT16 = _tipo_array("H", 2)
+_UINT32 = _tipo_array("IL", 4)
+_FLOAT32 = _tipo_array("f", 4)
+_TROCAR_BYTES = sys.byteorder == "big"
+
+
+def _bytes_le(valores):
+    """Bytes little-endian de um array"""
+    if _TROCAR_BYTES:
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+
+class _Serie:
+    """Ticks de um round em andamento"""
+
+    __slots__ = ("inicio_ms", "ultimo_ms", "deltas", "valores")
+
+    def __init__(self, inicio_ms):
+        self.inicio_ms = inicio_ms
+        self.ultimo_ms = inicio_ms
+        self.deltas = array(_UINT32)
+        self.valores = array(_FLOAT32)
+
+
+class CrashTickRecorder:
+    """Grava a série de ticks de cada round do Crash em blocos colunares diários"""
+
+    def __init__(self, diretorio, max_rounds_abertos=8, max_finalizados=256):
+        """
+        Args:
+            diretorio: Diretório dos arquivos .ctk
+            max_rounds_abertos: Rounds sem fim recebido mantidos em memória (os mais antigos
+                                são gravados como incompletos)
+            max_finalizados: Ids de rounds já gravados lembrados (LRU) para ignorar ticks repetidos
+        """
+        self.diretorio = diretorio
+        self.max_rounds_abertos = max_rounds_abertos
+        self.max_finalizados = max_finalizados
+        os.makedirs(diretorio, exist_ok=True)
+        self._series = {}
+        # Rounds já gravados: um tick "complete" repetido não abre uma nova série (nem um segundo bloco)
+        self._finalizados = OrderedDict()
+        self._lock = threading.Lock()
+        self.ignorados = 0
+        self.ticks = 0
+        self.rounds = 0
+        self.bytes = 0
+
+    def record(self, payload, recebido_ms=None):
+        """
+        Registra um tick do crash.tick
+
+        Args:
+            payload: Payload do crash.tick (id, status, multiplier/crash_point)
+            recebido_ms: Instante de recebimento em epoch (ms); padrão: agora
+        """
+        rodada_id = payload.get("id")
+        if rodada_id is None:
+            return
+        recebido_ms = int(time.time() * 1000) if recebido_ms is None else recebido_ms
+        valor = payload.get("multiplier", payload.get("crash_point"))
+        final = payload.get("status") == "complete"
+
+        with self._lock:
+            if rodada_id in self._finalizados:
+                self._finalizados.move_to_end(rodada_id)
+                self.ignorados += 1
+                return
+            serie = self._series.get(rodada_id)
+            if serie is None:
+                if len(self._series) >= self.max_rounds_abertos:
+                    # Round que nunca recebeu o fim (ex: desconexão): grava o que houver
+                    antigo = next(iter(self._series))
+                    self._gravar(antigo, self._series.pop(antigo), None)
+                serie = self._series[rodada_id] = _Serie(recebido_ms)
+
+            if valor is not None:
+                serie.deltas.append(max(0, recebido_ms - serie.ultimo_ms))
+                serie.valores.append(float(valor))
+                serie.ultimo_ms = recebido_ms
+                self.ticks += 1
+
+            if final:
+                self._gravar(rodada_id, self._series.pop(rodada_id), valor)
+
+    def _gravar(self, rodada_id, serie, crash_point):
+        """Grava o bloco de um round no arquivo do dia em que ele começou"""
+        deltas = serie.deltas
+        largura = 4
+        if not deltas or max(deltas) <= 0xFFFF:
+            deltas = array(_UINT16, deltas)
+            largura = 2
+
+        identificador = str(rodada_id).encode("utf-8")[:0xFFFF]
+        bloco = b"".join((
+            _CABECALHO.pack(MAGIC, len(identificador), serie.inicio_ms, len(serie.valores),
+                            math.nan if crash_point is None else float(crash_point), largura),
+            identificador,
+            _bytes_le(deltas),
+            _bytes_le(serie.valores)
+        ))
+
+        dia = datetime.fromtimestamp(serie.inicio_ms / 1000, timezone.utc).strftime("%Y-%m-%d")
+        with open(os.path.join(self.diretorio, f"{dia}.ctk"), "ab") as f:
+            f.write(bloco)
+        self.rounds += 1
+        self.bytes += len(bloco)
+        self._finalizados[rodada_id] = None
+        if len(self._finalizados) > self.max_finalizados:
+            self._finalizados.popitem(last=False)
+
+    def estatisticas(self):
+        """Retorna ticks, rounds e bytes gravados e ticks ignorados de rounds já gravados"""
+        with self._lock:
+            return {
+                "ticks": self.ticks,
+                "ignorados": self.ignorados,
+                "rounds": self.rounds,
+                "bytes": self.bytes,
+                "bytes_por_tick": round(self.bytes / self.ticks, 2) if self.ticks else 0.0,
+                "abertos": len(self._series)
+            }
+
+    def close(self):
+        """Grava os rounds ainda abertos como incompletos (crash point NaN)"""
+        with self._lock:
+            for rodada_id, serie in list(self._series.items()):
+                self._gravar(rodada_id, serie, None)
+            self._series.clear()
+        logger.info(f"Crash tick recorder stats: {self.estatisticas()}")
+
+
+def read_ticks(caminho):
+    """
+    Lê os rounds de um arquivo .ctk
+
+    Args:
+        caminho: Arquivo gravado pelo CrashTickRecorder
+
+    Returns:
+        generator: Dicionários com id, inicio_ms, crash_point (None se incompleto),
+                   tempos_ms (epoch de cada tick) e multiplicadores (array float32)
+    """
+    with open(caminho, "rb") as f:
+        dados = f.read()
+
+    posicao = 0
+    while posicao + _CABECALHO.size <= len(dados):
+        magic, tamanho_id, inicio_ms, ticks, crash_point, largura = _CABECALHO.unpack_from(dados, posicao)
+        if magic != MAGIC:
+            logger.error(f"Corrupted tick block at byte {posicao} of {caminho}")
+            return
+        posicao += _CABECALHO.size
+        fim = posicao + tamanho_id + ticks * (largura + 4)
+        if fim > len(dados):
+            # Bloco truncado (gravação interrompida)
+            return
+
+        rodada_id = dados[posicao:posicao + tamanho_id].decode("utf-8")
+        posicao += tamanho_id
+        deltas = array(_UINT16 if largura == 2 else _UINT32)
+        deltas.frombytes(dados[posicao:posicao + ticks * largura])
+        posicao += ticks * largura
+        valores = array(_FLOAT32)
+        valores.frombytes(dados[posicao:fim])
+        posicao = fim
+        if _TROCAR_BYTES:
+            deltas.byteswap()
+            valores.byteswap()
+
+        tempos = []
+        instante = inicio_ms
+        for delta in deltas:
+            instante += delta
+            tempos.append(instante)
+
+        yield {
+            "id": rodada_id,
+            "inicio_ms": inicio_ms,
+            "crash_point": None if math.isnan(crash_point) else round(crash_point, 2),
+            "tempos_ms": tempos,
+            "multiplicadores": valores
+        }
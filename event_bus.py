@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Event Bus
+Barramento de eventos com filas limitadas entre a leitura do socket e os consumidores.
+
+O handler do socket apenas publica o evento decodificado; cada assinante (análise,
+estatísticas, exibição, ...) tem a sua própria fila limitada e a sua própria thread,
+então uma etapa lenta não atrasa a leitura dos frames nem as outras etapas.
+
+Quando a fila de um assinante enche, a política escolhida decide o que acontece:
+    drop-oldest: descarta o evento mais antigo da fila (o mais novo sempre entra)
+    block:       quem publica espera por espaço (contrapressão para etapas publicadas por outra
+                 thread de etapa); publicado da thread de um event loop asyncio (handlers do
+                 socket), nunca espera: se comporta como drop-oldest e conta o descarte
+    coalesce:    eventos com a mesma chave são substituídos pelo mais recente
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import deque, OrderedDict
+
+logger = logging.getLogger("EventBus")
+
+POLITICAS = ("drop-oldest", "block", "coalesce")
+
+
+def _em_event_loop():
+    """True se a thread atual está executando um event loop asyncio (esperar ali trava o loop)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _Stage:
+    """Fila limitada + thread de um assinante"""
+
+    def __init__(self, nome, topico, handler, capacidade, politica, chave):
+        if politica not in POLITICAS:
+            raise ValueError(f"unknown overflow policy: {politica}")
+        if capacidade <= 0:
+            raise ValueError("capacidade must be positive")
+
+        self.nome = nome
+        self.topico = topico
+        self.handler = handler
+        self.capacidade = capacidade
+        self.politica = politica
+        self.chave = chave or (lambda evento: topico)
+        # coalesce usa um dicionário ordenado (chave -> item); as outras políticas, uma deque
+        self._fila = OrderedDict() if politica == "coalesce" else deque()
+        self._cond = threading.Condition()
+        self._ativo = True
+        self.publicados = 0
+        self.processados = 0
+        self.descartados = 0
+        self.coalescidos = 0
+        self.erros = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._thread = threading.Thread(target=self._executar, name=f"bus-{nome}", daemon=True)
+        self._thread.start()
+
+    def put(self, evento):
+        item = (time.perf_counter(), evento)
+        with self._cond:
+            if not self._ativo:
+                return
+            self.publicados += 1
+
+            if self.politica == "coalesce":
+                chave = self.chave(evento)
+                if chave in self._fila:
+                    # Mantém o horário do item original: o atraso medido é o do evento mais antigo esperando
+                    self._fila[chave] = (self._fila[chave][0], evento)
+                    self.coalescidos += 1
+                    return
+                if len(self._fila) >= self.capacidade:
+                    self._fila.popitem(last=False)
+                    self.descartados += 1
+                self._fila[chave] = item
+            elif self.politica == "block" and not _em_event_loop():
+                while len(self._fila) >= self.capacidade and self._ativo:
+                    self._cond.wait()
+                self._fila.append(item)
+            else:
+                if len(self._fila) >= self.capacidade:
+                    self._fila.popleft()
+                    self.descartados += 1
+                self._fila.append(item)
+
+            self._cond.notify_all()
+
+    def _get(self):
+        with self._cond:
+            while not self._fila and self._ativo:
+                self._cond.wait()
+            if not self._fila:
+                return None
+            if self.politica == "coalesce":
+                _, item = self._fila.popitem(last=False)
+            else:
+                item = self._fila.popleft()
+            # Libera quem está bloqueado esperando espaço
+            self._cond.notify_all()
+            return item
+
+    def _executar(self):
+        while True:
+            item = self._get()
+            if item is None:
+                return
+            publicado_em, evento = item
+            lag = time.perf_counter() - publicado_em
+            try:
+                self.handler(evento)
+            except Exception as e:
+                self.erros += 1
+                logger.error(f"Error in stage {self.nome}: {str(e)}")
+            with self._cond:
+                self.processados += 1
+                self._lag_total += lag
+                if lag > self._lag_max:
+                    self._lag_max = lag
+
+    def estatisticas(self):
+        with self._cond:
+            return {
+                "topico": self.topico,
+                "politica": self.politica,
+                "profundidade": len(self._fila),
+                "capacidade": self.capacidade,
+                "publicados": self.publicados,
+                "processados": self.processados,
+                "descartados": self.descartados,
+                "coalescidos": self.coalescidos,
+                "erros": self.erros,
+                "lag_medio_ms": round(self._lag_total / self.processados * 1000, 3) if self.processados else 0.0,
+                "lag_max_ms": round(self._lag_max * 1000, 3)
+            }
+
+    def close(self, timeout=2.0):
+        with self._cond:
+            self._ativo = False
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+
+class EventBus:
+    """Publica eventos por tópico para assinantes com filas e threads próprias"""
+
+    def __init__(self):
+        self._stages = {}
+        self._por_topico = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topico, handler, nome=None, capacidade=1000, politica="drop-oldest", chave=None):
+        """
+        Registra um assinante
+
+        Args:
+            topico: Tópico assinado
+            handler: Função chamada (na thread do assinante) com cada evento
+            nome: Nome da etapa usado nas estatísticas (padrão: o tópico)
+            capacidade: Tamanho máximo da fila
+            politica: "drop-oldest", "block" ou "coalesce"
+            chave: Função evento -> chave usada por "coalesce" (padrão: uma chave por tópico)
+        """
+        nome = nome or topico
+        stage = _Stage(nome, topico, handler, capacidade, politica, chave)
+        with self._lock:
+            if nome in self._stages:
+                stage.close()
+                raise ValueError(f"stage already registered: {nome}")
+            self._stages[nome] = stage
+            self._por_topico = dict(self._por_topico)
+            self._por_topico[topico] = self._por_topico.get(topico, ()) + (stage,)
+
+    def publish(self, topico, evento):
+        """
+        Entrega um evento às filas dos assinantes do tópico
+
+        Args:
+            topico: Tópico do evento
+            evento: Dados do evento
+        """
+        # Leitura sem lock: _por_topico é substituído (nunca alterado) em subscribe
+        for stage in self._por_topico.get(topico, ()):
+            stage.put(evento)
+
+    def estatisticas(self):
+        """Retorna profundidade de fila, descartes e atraso de cada etapa"""
+        with self._lock:
+            stages = dict(self._stages)
+        return {nome: stage.estatisticas() for nome, stage in stages.items()}
+
+    def close(self):
+        """Encerra as threads dos assinantes (eventos ainda na fila são descartados)"""
+        with self._lock:
+            stages = list(self._stages.values())
+            self._stages = {}
+            self._por_topico = {}
+        for stage in stages:
+            stage.close()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frame Log
+Gravação dos frames brutos recebidos pelo WebSocket e reprodução (replay) desses frames.
+
+O FrameRecorder grava cada frame com o instante de recebimento em um arquivo gzip
+somente de acréscimo (cada abertura adiciona um novo membro gzip, então gravações de
+várias execuções podem ser concatenadas no mesmo arquivo). O FrameReplayer lê o arquivo
+e entrega os frames aos mesmos ReplicationClient/handlers usados ao vivo, em tempo real,
+acelerado (Nx) ou na velocidade máxima, sempre na mesma ordem.
+
+Formato de cada linha: <recebido_ms>\\t<url>\\t<frame>
+"""
+
+import gzip
+import time
+import logging
+import threading
+
+logger = logging.getLogger("FrameLog")
+
+
+class FrameRecorder:
+    """Grava frames brutos em um log gzip somente de acréscimo"""
+
+    def __init__(self, caminho, flush_a_cada=1.0):
+        """
+        Args:
+            caminho: Arquivo de destino (.gz)
+            flush_a_cada: Intervalo mínimo (segundos) entre flushes do arquivo
+        """
+        self.caminho = caminho
+        self.flush_a_cada = flush_a_cada
+        self.frames = 0
+        self._arquivo = gzip.open(caminho, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._ultimo_flush = time.monotonic()
+
+    def write(self, url, frame, recebido_ms=None):
+        """
+        Grava um frame
+
+        Args:
+            url: URL da conexão que recebeu o frame
+            frame: Frame bruto (texto)
+            recebido_ms: Instante de recebimento em epoch (ms); padrão: agora
+        """
+        if not isinstance(frame, str):
+            return
+        recebido_ms = int(time.time() * 1000) if recebido_ms is None else recebido_ms
+        # JSON válido não tem quebra de linha dentro de strings: fora delas equivale a espaço
+        if "\n" in frame:
+            frame = frame.replace("\n", " ")
+
+        with self._lock:
+            if self._arquivo is None:
+                return
+            self._arquivo.write(f"{recebido_ms}\t{url}\t{frame}\n")
+            self.frames += 1
+            agora = time.monotonic()
+            if agora - self._ultimo_flush >= self.flush_a_cada:
+                self._arquivo.flush()
+                self._ultimo_flush = agora
+
+    def close(self):
+        """Finaliza o membro gzip atual"""
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+        logger.info(f"Recorded {self.frames} frames to {self.caminho}")
+
+
+def read_frames(caminho):
+    """
+    Lê os frames de um log gravado pelo FrameRecorder
+
+    Args:
+        caminho: Arquivo .gz
+
+    Returns:
+        generator: Tuplas (recebido_ms, url, frame) na ordem de gravação
+    """
+    with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            partes = linha.rstrip("\n").split("\t", 2)
+            if len(partes) != 3:
+                continue
+            try:
+                yield int(partes[0]), partes[1], partes[2]
+            except ValueError:
+                continue
+
+
+class FrameReplayer:
+    """Reproduz um log de frames pelos mesmos clientes e handlers usados ao vivo"""
+
+    def __init__(self, caminho, velocidade=None):
+        """
+        Args:
+            caminho: Arquivo gravado pelo FrameRecorder
+            velocidade: Fator de velocidade (1 = tempo real, 10 = 10x); None = máxima
+        """
+        self.caminho = caminho
+        self.velocidade = velocidade
+
+    def replay(self, clients):
+        """
+        Entrega cada frame ao cliente da URL em que foi gravado
+
+        Args:
+            clients: Dicionário url -> ReplicationClient (frames de outras URLs são ignorados)
+
+        Returns:
+            dict: frames entregues, ignorados, duração do replay, duração original e frames/s
+        """
+        entregues = 0
+        ignorados = 0
+        primeiro_ms = None
+        ultimo_ms = None
+        inicio = time.perf_counter()
+
+        for recebido_ms, url, frame in read_frames(self.caminho):
+            client = clients.get(url)
+            if client is None:
+                ignorados += 1
+                continue
+
+            if primeiro_ms is None:
+                primeiro_ms = recebido_ms
+            ultimo_ms = recebido_ms
+
+            if self.velocidade:
+                # Mantém o espaçamento original entre frames, dividido pela velocidade
+                alvo = (recebido_ms - primeiro_ms) / 1000 / self.velocidade
+                espera = alvo - (time.perf_counter() - inicio)
+                if espera > 0:
+                    time.sleep(espera)
+
+            client.dispatch(frame)
+            entregues += 1
+
+        duracao = time.perf_counter() - inicio
+        return {
+            "frames": entregues,
+            "ignorados": ignorados,
+            "duracao": round(duracao, 3),
+            "duracao_original": round(((ultimo_ms or 0) - (primeiro_ms or 0)) / 1000, 3),
+            "frames_por_segundo": round(entregues / duracao, 1) if duracao > 0 else 0.0
+        }
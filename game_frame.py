@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Game Frame
+Histórico colunar em memória (arrays numpy) dos jogos de resultado numérico: Double, Crash e Limbo.
+
+Um dicionário por round ({"cor": "red", "numero": 3, "timestamp": ..., "status": ...}) custa
+centenas de bytes e obriga cada análise a reconstruir listas a partir dos dicionários. O
+GameFrame guarda cada campo em uma coluna numpy de largura fixa, com os textos codificados
+como inteiros:
+
+    cor:    0 white, 1 red, 2 black (os códigos de config['double_colors'])
+    status: 0 final, 1 simulado
+
+    double:       id uint64, ts_servidor int64, ts_recebido int64, numero uint8, cor uint8, status uint8
+    crash/limbo:  id uint64, ts_servidor int64, ts_recebido int64, valor float64, status uint8
+
+Isso dá menos de 30 bytes por round. Fatiar um GameFrame devolve outro GameFrame com visões
+das mesmas colunas (O(1), sem cópia), e frame[i] devolve o round como dicionário no formato
+do coletor para o código que ainda lê dicionários.
+
+O FrameHistory é o buffer circular colunar usado pelos coletores no lugar do RoundHistory:
+cada round é convertido uma única vez, na chegada, e latest() devolve um GameFrame que aponta
+para o buffer. Cada linha é gravada em duas posições (i e i + número de slots), então os últimos N
+rounds estão sempre contíguos e a visão não precisa de cópia; um slot extra garante que a
+próxima gravação nunca cai dentro de um frame, que só expira após a volta completa do buffer.
+"""
+
+import hashlib
+
+import numpy as np
+
+from round_history import now_ms, SnapshotExpired
+
+CORES = ("white", "red", "black")
+CODIGO_COR = {cor: codigo for codigo, cor in enumerate(CORES)}
+STATUS = ("final", "simulado")
+CODIGO_STATUS = {status: codigo for codigo, status in enumerate(STATUS)}
+
+_COMUNS = (("id", np.uint64), ("ts_servidor", np.int64), ("ts_recebido", np.int64))
+
+# Colunas de cada jogo (nome, tipo numpy)
+ESQUEMAS = {
+    "double": _COMUNS + (("numero", np.uint8), ("cor", np.uint8), ("status", np.uint8)),
+    "crash": _COMUNS + (("valor", np.float64), ("status", np.uint8)),
+    "limbo": _COMUNS + (("valor", np.float64), ("status", np.uint8))
+}
+
+
+def round_id(valor):
+    """
+    Converte o id de um round em uint64
+
+    Args:
+        valor: Id da API (número ou texto)
+
+    Returns:
+        int: O próprio número, ou um hash de 64 bits do texto
+    """
+    texto = str(valor)
+    if texto.isdigit():
+        return int(texto) & 0xFFFFFFFFFFFFFFFF
+    return int.from_bytes(hashlib.blake2b(texto.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def cor_do_numero(numero):
+    """Código da cor (0/1/2) de um número do Double"""
+    if numero == 0:
+        return 0
+    return 1 if numero <= 7 else 2
+
+
+def _linha(jogo, rodada):
+    """Valores das colunas de um round do coletor (cor como texto ou código)"""
+    cor = rodada.get("cor")
+    linha = {
+        "id": 0 if rodada.get("id") is None else round_id(rodada["id"]),
+        "ts_servidor": rodada.get("ts_servidor", rodada.get("timestamp")) or 0,
+        "ts_recebido": rodada.get("ts_recebido") or 0,
+        "status": CODIGO_STATUS.get(rodada.get("status"), 0)
+    }
+    if jogo == "double":
+        numero = rodada.get("numero", 0)
+        linha["numero"] = numero
+        linha["cor"] = CODIGO_COR[cor] if isinstance(cor, str) else cor_do_numero(numero) if cor is None else cor
+    else:
+        linha["valor"] = rodada.get("valor", 1.0)
+    return linha
+
+
+class GameFrame:
+    """Rounds de um jogo em colunas numpy, do mais recente para o mais antigo"""
+
+    __slots__ = ("jogo", "_colunas", "_origem", "_topo")
+
+    # Permite aos analisadores reconhecer o frame sem importar este módulo (e o numpy)
+    colunar = True
+
+    def __init__(self, jogo, colunas, origem=None, topo=None):
+        """
+        Args:
+            jogo: Nome do jogo
+            colunas: {nome: array} já do mais recente para o mais antigo (todas do mesmo tamanho)
+            origem: FrameHistory de onde o frame saiu (para detectar slots sobrescritos)
+            topo: Posição absoluta logo após o round mais recente do frame (com origem)
+        """
+        self.jogo = jogo
+        self._colunas = colunas
+        self._origem = origem
+        self._topo = topo
+
+    @classmethod
+    def from_rounds(cls, jogo, rodadas):
+        """
+        Cria um frame a partir de rounds em dicionário
+
+        Args:
+            jogo: 'double', 'crash' ou 'limbo'
+            rodadas: Rounds do mais recente para o mais antigo
+
+        Returns:
+            GameFrame: Frame com colunas próprias
+        """
+        linhas = [_linha(jogo, rodada) for rodada in rodadas]
+        return cls(jogo, {nome: np.array([linha[nome] for linha in linhas], dtype=tipo)
+                          for nome, tipo in ESQUEMAS[jogo]})
+
+    def column(self, nome):
+        """Retorna uma coluna (array, mais recente primeiro)"""
+        return self._colunas[nome]
+
+    @property
+    def names(self):
+        return tuple(self._colunas)
+
+    def valid(self):
+        """Indica se nenhum round do frame foi sobrescrito pela volta do buffer de origem"""
+        if self._origem is None:
+            return True
+        # Uma posição só é sobrescrita quando a gravação dá a volta completa nos slots (capacidade + 1)
+        return self._topo - len(self) >= self._origem._fim - self._origem._slots
+
+    def __len__(self):
+        for coluna in self._colunas.values():
+            return len(coluna)
+        return 0
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            # Fatias de arrays são visões: o backtest percorre o histórico sem copiar
+            inicio = indice.indices(len(self))[0]
+            topo = None if self._topo is None else self._topo - inicio
+            return GameFrame(self.jogo, {nome: coluna[indice] for nome, coluna in self._colunas.items()},
+                             self._origem, topo)
+
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("round index out of range")
+        # Round no formato do coletor (compatível com o código que lê dicionários)
+        colunas = self._colunas
+        rodada = {}
+        if "id" in colunas:
+            rodada["id"] = int(colunas["id"][indice])
+        if "ts_servidor" in colunas:
+            rodada["ts_servidor"] = rodada["timestamp"] = int(colunas["ts_servidor"][indice])
+        if "ts_recebido" in colunas:
+            rodada["ts_recebido"] = int(colunas["ts_recebido"][indice])
+        if "cor" in colunas:
+            rodada["cor"] = CORES[colunas["cor"][indice]]
+        if "numero" in colunas:
+            rodada["numero"] = int(colunas["numero"][indice])
+        if "valor" in colunas:
+            rodada["valor"] = round(float(colunas["valor"][indice]), 2)
+        rodada["status"] = STATUS[colunas["status"][indice]] if "status" in colunas else "final"
+        # Valida depois de ler: se o slot foi sobrescrito, o valor lido não é confiável
+        if self._origem is not None and self._topo - 1 - indice < self._origem._fim - self._origem._slots:
+            raise SnapshotExpired("round overwritten while reading the frame")
+        return rodada
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def __repr__(self):
+        return f"GameFrame({self.jogo}, {len(self)} rounds)"
+
+    def copy(self):
+        """Retorna um frame com cópias das colunas (independente do buffer de origem)"""
+        return GameFrame(self.jogo, {nome: coluna.copy() for nome, coluna in self._colunas.items()})
+
+
+def as_frame(jogo, historico):
+    """
+    Retorna o histórico como GameFrame (frames passam direto; listas são convertidas uma vez)
+
+    Args:
+        jogo: 'double', 'crash' ou 'limbo'
+        historico: GameFrame ou rounds em dicionário (mais recente primeiro)
+
+    Returns:
+        GameFrame: Frame do histórico
+    """
+    if getattr(historico, "colunar", False):
+        return historico
+    return GameFrame.from_rounds(jogo, historico)
+
+
+class FrameHistory:
+    """Buffer circular colunar de capacidade fixa com os rounds de um jogo"""
+
+    def __init__(self, jogo, capacidade=10000, retencao_s=None):
+        """
+        Args:
+            jogo: 'double', 'crash' ou 'limbo'
+            capacidade: Número máximo de rounds mantidos (os mais antigos são descartados)
+            retencao_s: Janela de retenção em segundos usada por expire() (None = sem janela)
+        """
+        if capacidade <= 0:
+            raise ValueError("capacidade must be positive")
+
+        self.jogo = jogo
+        self.capacidade = capacidade
+        self.retencao_s = retencao_s
+        self.esquema = ESQUEMAS[jogo]
+        # Um slot a mais que a capacidade: o próximo slot gravado nunca está em um frame de até
+        # `capacidade` rounds. Cada coluna tem o dobro dos slots (a linha i também vai em i + slots)
+        self._slots = capacidade + 1
+        self._colunas = {nome: np.zeros(2 * self._slots, dtype=tipo) for nome, tipo in self.esquema}
+        self._epochs = np.zeros(self._slots, dtype=np.int64)
+        # Posições absolutas: _fim só cresce; _inicio aponta para o round mais antigo retido
+        self._inicio = 0
+        self._fim = 0
+
+    def __len__(self):
+        return self._fim - self._inicio
+
+    def __getitem__(self, indice):
+        return self.latest()[indice]
+
+    def __iter__(self):
+        return iter(self.latest())
+
+    def __repr__(self):
+        return f"FrameHistory({self.jogo}, {len(self)}/{self.capacidade} rounds)"
+
+    def push(self, rodada, epoch_ms=None):
+        """
+        Adiciona o round mais recente em O(1)
+
+        Args:
+            rodada: Round no formato do coletor
+            epoch_ms: Momento do round em epoch (ms); padrão: momento da chegada
+        """
+        posicao = self._fim % self._slots
+        espelho = posicao + self._slots
+        for nome, valor in _linha(self.jogo, rodada).items():
+            coluna = self._colunas[nome]
+            coluna[posicao] = valor
+            coluna[espelho] = valor
+        self._epochs[posicao] = now_ms() if epoch_ms is None else epoch_ms
+        # Só avança depois de gravar: um frame criado agora nunca inclui uma linha incompleta
+        self._fim += 1
+        if self._fim - self._inicio > self.capacidade:
+            self._inicio = self._fim - self.capacidade
+
+    def extend(self, rodadas):
+        """
+        Adiciona vários rounds
+
+        Args:
+            rodadas: Iterável do mais antigo para o mais recente
+        """
+        for rodada in rodadas:
+            self.push(rodada)
+
+    def load(self, frame):
+        """
+        Adiciona em bloco os rounds de um GameFrame (cópia vetorizada das colunas)
+
+        Só os últimos `capacidade` rounds do frame são gravados; o epoch de retenção de cada
+        round é o ts_servidor.
+
+        Args:
+            frame: GameFrame do mesmo jogo (mais recente primeiro)
+
+        Returns:
+            int: Quantidade de rounds gravados
+        """
+        quantidade = min(len(frame), self.capacidade)
+        if not quantidade:
+            return 0
+        posicoes = np.arange(self._fim, self._fim + quantidade) % self._slots
+        for nome, tipo in self.esquema:
+            if nome in frame.names:
+                # Do mais antigo para o mais recente, na ordem das posições
+                valores = frame.column(nome)[quantidade - 1::-1]
+            else:
+                valores = np.zeros(quantidade, dtype=tipo)
+            coluna = self._colunas[nome]
+            coluna[posicoes] = valores
+            coluna[posicoes + self._slots] = valores
+        self._epochs[posicoes] = self._colunas["ts_servidor"][posicoes]
+        self._fim += quantidade
+        if self._fim - self._inicio > self.capacidade:
+            self._inicio = self._fim - self.capacidade
+        return quantidade
+
+    @property
+    def version(self):
+        """Contador de versão: cresce a cada round gravado"""
+        return self._fim
+
+    def latest(self, quantidade=None):
+        """
+        Retorna um GameFrame O(1) dos últimos N rounds, sem copiar e sem bloquear a escrita
+
+        Args:
+            quantidade: Número de rounds (padrão: todos)
+
+        Returns:
+            GameFrame: Rounds do mais recente para o mais antigo
+        """
+        fim = self._fim
+        tamanho = max(0, min(fim - self._inicio, self.capacidade))
+        if quantidade is not None:
+            tamanho = max(0, min(quantidade, tamanho))
+        # Janela contígua [topo - tamanho, topo) na segunda metade, invertida (mais recente primeiro)
+        topo = fim % self._slots + self._slots
+        fatia = slice(topo - 1, topo - 1 - tamanho if topo - 1 - tamanho >= 0 else None, -1)
+        return GameFrame(self.jogo, {nome: coluna[fatia] for nome, coluna in self._colunas.items()}, self, fim)
+
+    def oldest(self):
+        """Retorna o round mais antigo (ou None se vazio)"""
+        if not len(self):
+            return None
+        return self.latest()[-1]
+
+    def oldest_epoch(self):
+        """Retorna o epoch (ms) do round mais antigo (ou None se vazio)"""
+        if not len(self):
+            return None
+        return int(self._epochs[self._inicio % self._slots])
+
+    def expire(self, agora_ms=None):
+        """
+        Aplica a janela de retenção descartando rounds pela ponta mais antiga
+
+        Args:
+            agora_ms: Instante de referência em epoch (ms); padrão: agora
+
+        Returns:
+            int: Quantidade de rounds descartados
+        """
+        if self.retencao_s is None:
+            return 0
+
+        agora_ms = now_ms() if agora_ms is None else agora_ms
+        limite = agora_ms - int(self.retencao_s * 1000)
+        descartados = 0
+        while self._inicio < self._fim and self._epochs[self._inicio % self._slots] < limite:
+            self._inicio += 1
+            descartados += 1
+        return descartados
+
+    def pop_oldest(self):
+        """Remove e retorna o round mais antigo em O(1)"""
+        if not len(self):
+            raise IndexError("pop from empty FrameHistory")
+        rodada = self.latest()[-1]
+        self._inicio += 1
+        return rodada
+
+    def clear(self):
+        """Descarta todos os rounds"""
+        self._inicio = self._fim
+
+    def copy(self, quantidade=None, tentativas=3):
+        """
+        Retorna os rounds como lista de dicionários (mais recente primeiro)
+
+        Args:
+            quantidade: Número de rounds (padrão: todos)
+            tentativas: Novas leituras caso o buffer dê a volta durante a cópia
+
+        Returns:
+            list: Rounds do mais recente para o mais antigo
+        """
+        for tentativa in range(tentativas):
+            try:
+                return list(self.latest(quantidade))
+            except SnapshotExpired:
+                if tentativa == tentativas - 1:
+                    raise
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lag Stats
+Histogramas de atraso (p50/p95/p99) por feed e por etapa do caminho de ingestão.
+
+Cada round carrega horários em epoch (ms): ts_liquidacao (quando o servidor liquidou o round,
+updated_at do payload) e ts_recebido (quando chegou aqui); ts_servidor (created_at) só ordena
+os rounds. Com eles o LagTracker mede, por feed:
+    rede:     ts_liquidacao -> ts_recebido (link + servidor; o que sobra da janela de aposta)
+    previsao: ts_recebido do round mais recente -> previsão pronta (o que a previsão consome da janela)
+
+Os histogramas usam baldes logarítmicos (~5% de resolução de 0,1 ms a 1 hora): gravar é
+O(1) e a memória é fixa, independente da quantidade de amostras.
+"""
+
+import math
+import threading
+
+# Limites dos baldes em ms: 0,1 ms, crescendo 5% por balde até passar de 1 hora
+_FATOR = 1.05
+_MINIMO_MS = 0.1
+_LIMITES = []
+_limite = _MINIMO_MS
+while _limite < 3600 * 1000:
+    _LIMITES.append(_limite)
+    _limite *= _FATOR
+_LIMITES.append(float("inf"))
+_LOG_FATOR = math.log(_FATOR)
+
+
+class LagHistogram:
+    """Histograma de atrasos em ms com baldes logarítmicos"""
+
+    def __init__(self):
+        self.baldes = [0] * len(_LIMITES)
+        self.amostras = 0
+        # Atrasos negativos indicam relógios dessincronizados (contados e gravados como 0)
+        self.negativos = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, atraso_ms):
+        """
+        Registra uma amostra
+
+        Args:
+            atraso_ms: Atraso em milissegundos
+        """
+        negativo = atraso_ms < 0
+        atraso_ms = max(0.0, float(atraso_ms))
+        if atraso_ms <= _MINIMO_MS:
+            indice = 0
+        else:
+            indice = min(len(_LIMITES) - 1, math.ceil(math.log(atraso_ms / _MINIMO_MS) / _LOG_FATOR))
+
+        with self._lock:
+            self.baldes[indice] += 1
+            self.amostras += 1
+            self.negativos += negativo
+            self.total_ms += atraso_ms
+            if atraso_ms > self.maximo_ms:
+                self.maximo_ms = atraso_ms
+
+    def percentile(self, p):
+        """
+        Retorna o percentil p (0-100) em ms (limite superior do balde, no máximo o maior atraso visto)
+
+        Args:
+            p: Percentil desejado
+
+        Returns:
+            float: Atraso em ms, ou 0.0 sem amostras
+        """
+        with self._lock:
+            if not self.amostras:
+                return 0.0
+            alvo = max(1, math.ceil(self.amostras * p / 100))
+            acumulado = 0
+            for indice, quantidade in enumerate(self.baldes):
+                acumulado += quantidade
+                if acumulado >= alvo:
+                    return min(_LIMITES[indice], self.maximo_ms)
+            return self.maximo_ms
+
+    def estatisticas(self):
+        """Retorna amostras, média, p50/p95/p99 e máximo (ms)"""
+        return {
+            "amostras": self.amostras,
+            "media_ms": round(self.total_ms / self.amostras, 1) if self.amostras else 0.0,
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "max_ms": round(self.maximo_ms, 1),
+            "negativos": self.negativos
+        }
+
+
+class LagTracker:
+    """Histogramas de atraso por feed e etapa"""
+
+    def __init__(self):
+        self._histogramas = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, feed, etapa):
+        """Retorna (criando se necessário) o histograma de um feed/etapa"""
+        chave = (feed, etapa)
+        histograma = self._histogramas.get(chave)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(chave, LagHistogram())
+        return histograma
+
+    def record(self, feed, etapa, atraso_ms):
+        """
+        Registra um atraso
+
+        Args:
+            feed: Nome do feed (ex: "double", "double/http")
+            etapa: "rede" ou "previsao"
+            atraso_ms: Atraso em milissegundos
+        """
+        self.histogram(feed, etapa).record(atraso_ms)
+
+    def estatisticas(self):
+        """Retorna {feed: {etapa: estatísticas}} dos histogramas com amostras"""
+        with self._lock:
+            histogramas = dict(self._histogramas)
+        resultado = {}
+        for (feed, etapa), histograma in sorted(histogramas.items()):
+            if histograma.amostras:
+                resultado.setdefault(feed, {})[etapa] = histograma.estatisticas()
+        return resultado
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mock Blaze
+Servidor local que imita a Blaze (replicação Socket.IO + API HTTP) e harness de carga.
+
+O MockBlazeServer responde ao handshake Engine.IO/Socket.IO, às mensagens subscribe e
+join-room e transmite double.tick, crash.tick e mines.update na taxa pedida, além dos
+endpoints HTTP /api/*/recent e /api/*/history (com ETag). Assim DataCollector e BlazeAPI
+podem ser exercitados sem tocar no site real: basta apontar as URLs para o mock.
+
+O harness de carga roda o servidor em outro processo (para não misturar a CPU do servidor
+com a do coletor), aumenta a taxa por feed em degraus e mede, para cada feed, mensagens/s,
+custo de parse, custo dos handlers, atraso de entrega e frames perdidos, indicando a partir
+de qual taxa o coletor satura.
+
+Uso:
+    python mock_blaze.py serve [--ws-port 8765] [--http-port 8766] [--rate 1] [--seed 100000]
+    python mock_blaze.py load [--target raw|pg|bot] [--rates 500,1000,2000] [--duration 5]
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import threading
+import contextlib
+import multiprocessing
+import websockets
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from round_history import parse_epoch_ms
+
+logger = logging.getLogger("MockBlaze")
+
+# Sala (join-room) -> eventos transmitidos para quem entra nela
+ROOMS = {
+    "double": ("double.tick",),
+    "crash": ("crash.tick",),
+    "mines": ("mines.update",)
+}
+
+# Evento -> jogo usado nos endpoints HTTP
+JOGOS = {
+    "double.tick": "double",
+    "crash.tick": "crash",
+    "mines.update": "mines"
+}
+
+# Endpoint HTTP -> jogo
+ENDPOINTS = {
+    "roulette_games": "double",
+    "crash_games": "crash",
+    "mines_games": "mines"
+}
+
+
+def _iso(epoch_ms):
+    return datetime.fromtimestamp(epoch_ms / 1000, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class MockBlazeServer:
+    """Servidor de replicação e API HTTP falsos, com rounds gerados sob demanda"""
+
+    def __init__(self, host="127.0.0.1", ws_port=0, http_port=0, historico=1000):
+        """
+        Args:
+            host: Endereço de escuta
+            ws_port: Porta do WebSocket (0 = escolhida pelo sistema)
+            http_port: Porta da API HTTP (0 = escolhida pelo sistema)
+            historico: Rounds mantidos por jogo para os endpoints HTTP
+        """
+        self.host = host
+        self.ws_port = ws_port
+        self.http_port = http_port
+        self.clientes = {}  # websocket -> eventos inscritos
+        self.rodadas = {jogo: deque(maxlen=historico) for jogo in ENDPOINTS.values()}
+        self.epochs = {jogo: deque(maxlen=historico) for jogo in ENDPOINTS.values()}
+        self.enviados = {}
+        self._sequencia = 0
+        self._lock = threading.Lock()
+        self._ws_server = None
+        self._http_server = None
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.ws_port}/replication/?EIO=3&transport=websocket"
+
+    @property
+    def api_url(self):
+        return f"http://{self.host}:{self.http_port}/api"
+
+    # ------------------------------------------------------------------
+    # Rounds
+    # ------------------------------------------------------------------
+
+    def gerar(self, evento, epoch_ms=None):
+        """
+        Gera o payload de um novo round e o guarda para os endpoints HTTP
+
+        Args:
+            evento: double.tick, crash.tick ou mines.update
+            epoch_ms: Horário do round em epoch (ms); padrão: agora
+
+        Returns:
+            dict: Payload no formato da replicação
+        """
+        epoch_ms = int(time.time() * 1000) if epoch_ms is None else epoch_ms
+        self._sequencia += 1
+        payload = {
+            "id": f"mock{self._sequencia}",
+            "created_at": _iso(epoch_ms),
+            # Liquidação: no mock o round fecha no mesmo instante em que é criado
+            "updated_at": _iso(epoch_ms),
+            "status": "complete",
+            # Marca de envio usada pelo harness para medir o atraso de entrega
+            "_enviado_ns": time.time_ns()
+        }
+        if evento == "double.tick":
+            roll = random.randint(0, 14)
+            payload.update({"roll": roll, "color": 0 if roll == 0 else (1 if roll <= 7 else 2)})
+        elif evento == "crash.tick":
+            payload["crash_point"] = round(max(1.0, 0.99 / (1 - random.random())), 2)
+        else:
+            minas = set(random.sample(range(25), 5))
+            payload.update({"grid": [1 if i in minas else 0 for i in range(25)], "mines_count": 5})
+
+        jogo = JOGOS.get(evento)
+        if jogo:
+            with self._lock:
+                self.rodadas[jogo].append(payload)
+                self.epochs[jogo].append(epoch_ms)
+        return payload
+
+    def seed(self, evento, quantidade, intervalo=30.0):
+        """
+        Preenche o histórico HTTP com rounds passados (para testar o backfill)
+
+        Args:
+            evento: double.tick, crash.tick ou mines.update
+            quantidade: Rounds gerados, terminando agora
+            intervalo: Segundos entre rounds consecutivos
+        """
+        agora = int(time.time() * 1000)
+        for i in range(quantidade, 0, -1):
+            self.gerar(evento, agora - int(i * intervalo * 1000))
+
+    # ------------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------------
+
+    async def _handler(self, ws):
+        """Handshake Engine.IO v3, ping/pong e inscrições de um cliente"""
+        await ws.send("0" + json.dumps({
+            "sid": f"mock{id(ws)}", "upgrades": [], "pingInterval": 25000, "pingTimeout": 20000
+        }))
+        self.clientes[ws] = set()
+        try:
+            async for message in ws:
+                if message == "2":
+                    await ws.send("3")
+                elif message == "40":
+                    await ws.send("40")
+                elif message.startswith("42"):
+                    self._inscrever(ws, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clientes.pop(ws, None)
+
+    def _inscrever(self, ws, message):
+        """Registra os eventos de um subscribe/join-room"""
+        try:
+            data = json.loads(message[2:])
+        except ValueError:
+            return
+        if data[0] == "join-room" and len(data) > 1:
+            self.clientes[ws].update(ROOMS.get(data[1], ()))
+        elif data[0] == "subscribe" and len(data) > 1:
+            self.clientes[ws].update(data[1])
+
+    async def broadcast(self, evento, payload):
+        """Envia um evento a todos os clientes inscritos nele; retorna quantos receberam"""
+        frame = "42" + json.dumps([evento, payload], separators=(",", ":"))
+        entregues = 0
+        for ws, eventos in list(self.clientes.items()):
+            if evento in eventos:
+                try:
+                    await ws.send(frame)
+                    entregues += 1
+                except websockets.ConnectionClosed:
+                    pass
+        return entregues
+
+    async def stream(self, taxas, duracao, ruido=0):
+        """
+        Transmite eventos na taxa pedida por um período
+
+        Args:
+            taxas: Dicionário evento -> frames por segundo
+            duracao: Duração em segundos
+            ruido: Frames/s de um evento sem inscritos (exercita o descarte no decoder)
+
+        Returns:
+            dict: Frames enviados por evento
+        """
+        loop = asyncio.get_running_loop()
+        inicio = loop.time()
+        enviados = {evento: 0 for evento in taxas}
+        ruido_enviado = 0
+        while True:
+            decorrido = loop.time() - inicio
+            if decorrido >= duracao:
+                break
+            for evento, taxa in taxas.items():
+                # Envia o que falta para acompanhar a taxa (compensa atrasos do laço)
+                devidos = int(taxa * decorrido) - enviados[evento]
+                for _ in range(devidos):
+                    await self.broadcast(evento, self.gerar(evento))
+                    enviados[evento] += 1
+            for _ in range(int(ruido * decorrido) - ruido_enviado):
+                frame = '42["chat.message",{"text":"mock"}]'
+                for ws in list(self.clientes):
+                    with contextlib.suppress(websockets.ConnectionClosed):
+                        await ws.send(frame)
+                ruido_enviado += 1
+            await asyncio.sleep(0.005)
+        for evento, quantidade in enviados.items():
+            self.enviados[evento] = self.enviados.get(evento, 0) + quantidade
+        return enviados
+
+    async def start(self):
+        """Abre o WebSocket (no loop atual) e a API HTTP (em uma thread)"""
+        self._ws_server = await websockets.serve(self._handler, self.host, self.ws_port, max_size=None)
+        self.ws_port = self._ws_server.sockets[0].getsockname()[1]
+
+        self._http_server = ThreadingHTTPServer((self.host, self.http_port), _criar_handler_http(self))
+        self.http_port = self._http_server.server_address[1]
+        threading.Thread(target=self._http_server.serve_forever, name="mock-http", daemon=True).start()
+        logger.info(f"Mock Blaze listening: {self.ws_url} / {self.api_url}")
+
+    async def stop(self):
+        if self._http_server is not None:
+            self._http_server.shutdown()
+        if self._ws_server is not None:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+
+
+def _criar_handler_http(servidor):
+    """Cria o handler HTTP com /api/<jogo>_games/recent e /history"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, status, corpo=None, etag=None):
+            dados = json.dumps(corpo).encode() if corpo is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(dados)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            partes = url.path.strip("/").split("/")
+            if len(partes) != 3 or partes[0] != "api" or partes[1] not in ENDPOINTS:
+                self._responder(404, {"error": "not found"})
+                return
+
+            jogo = ENDPOINTS[partes[1]]
+            with servidor._lock:
+                rodadas = list(servidor.rodadas[jogo])
+                epochs = list(servidor.epochs[jogo])
+
+            if partes[2] == "recent":
+                recentes = rodadas[:-21:-1]  # Mais recente primeiro, como a API real
+                etag = f'"{recentes[0]["id"]}"' if recentes else '"vazio"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._responder(304, etag=etag)
+                else:
+                    self._responder(200, recentes, etag=etag)
+            elif partes[2] == "history":
+                parametros = parse_qs(url.query)
+                desde = parse_epoch_ms(parametros.get("startDate", [""])[0]) or 0
+                ate = parse_epoch_ms(parametros.get("endDate", [""])[0]) or float("inf")
+                pagina = int(parametros.get("page", ["1"])[0])
+                # Rounds guardados em ordem de horário: o intervalo sai por busca binária
+                registros = rodadas[bisect_left(epochs, desde):bisect_right(epochs, ate)]
+                registros.reverse()
+                por_pagina = 100
+                self._responder(200, {
+                    "total_pages": max(1, -(-len(registros) // por_pagina)),
+                    "records": registros[(pagina - 1) * por_pagina:pagina * por_pagina]
+                })
+            else:
+                self._responder(404, {"error": "not found"})
+
+    return Handler
+
+
+# ----------------------------------------------------------------------
+# Harness de carga
+# ----------------------------------------------------------------------
+
+def _processo_servidor(conexao, host):
+    """Executa o mock em um processo separado, recebendo comandos pelo pipe"""
+    async def principal():
+        servidor = MockBlazeServer(host)
+        await servidor.start()
+        conexao.send((servidor.ws_url, servidor.api_url))
+        loop = asyncio.get_running_loop()
+        while True:
+            comando = await loop.run_in_executor(None, conexao.recv)
+            if comando[0] == "stream":
+                _, taxas, duracao, ruido = comando
+                conexao.send(await servidor.stream(taxas, duracao, ruido))
+            elif comando[0] == "clientes":
+                conexao.send(sum(len(eventos) for eventos in servidor.clientes.values()))
+            else:
+                break
+        await servidor.stop()
+
+    asyncio.run(principal())
+
+
+class _MedidorFeed:
+    """Envolve os handlers de um evento medindo quantidade, CPU e atraso de entrega"""
+
+    def __init__(self):
+        self.recebidos = 0
+        self.cpu_ns = 0
+        self.atrasos_ms = []
+
+    def envolver(self, handler):
+        def medido(payload):
+            self.recebidos += 1
+            if isinstance(payload, dict) and "_enviado_ns" in payload:
+                self.atrasos_ms.append((time.time_ns() - payload["_enviado_ns"]) / 1e6)
+            inicio = time.thread_time_ns()
+            try:
+                handler(payload)
+            finally:
+                self.cpu_ns += time.thread_time_ns() - inicio
+        return medido
+
+    def zerar(self):
+        self.recebidos = 0
+        self.cpu_ns = 0
+        self.atrasos_ms = []
+
+
+def _custo_parse(clients, evento):
+    """Soma [frames, ns] de parse de um evento nos decoders de todos os clientes"""
+    total = [0, 0]
+    for client in clients:
+        frames, ns = client.decoder.por_evento.get(evento, (0, 0))
+        total[0] += frames
+        total[1] += ns
+    return total
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def _preparar_alvo(alvo, ws_url, api_url, eventos):
+    """
+    Cria o coletor a ser medido, apontado para o mock
+
+    Returns:
+        tuple: (lista de ReplicationClient, função de encerramento)
+    """
+    if alvo == "pg":
+        import pg
+        config = dict(pg.CasinoPredictor(conectar=False).config)
+        config.update({"blaze_ws_url": ws_url, "pgsoft_ws_url": ws_url, "blaze_api_url": api_url})
+        coletor = pg.DataCollector(config)
+        return list(coletor.ws_clients.values()), coletor.fechar
+
+    if alvo == "bot":
+        import bot
+        api = bot.BlazeAPI()
+        api.base_url = api_url
+        api.double_ws_url = api.ws_url = ws_url
+        api.start_double_realtime()
+        api.start_mines_realtime()
+        client = api.realtime_clients[ws_url]
+        from blaze_realtime import get_engine
+        get_engine().call(client.connect_async())
+        return [client], api.shutdown
+
+    from blaze_realtime import ReplicationClient, get_engine
+    client = ReplicationClient(ws_url)
+    for evento in eventos:
+        client.subscribe(evento, lambda payload: None)
+    client.connect()
+    return [client], lambda: (client.close(), get_engine().stop())
+
+
+def run_load(alvo="raw", taxas=(500, 1000, 2000, 5000), duracao=5.0, eventos=("double.tick", "crash.tick"),
+             ruido=0, host="127.0.0.1", silencioso=True):
+    """
+    Executa degraus de carga contra um coletor e mede a ingestão por feed
+
+    Args:
+        alvo: "raw" (ReplicationClient puro), "pg" (DataCollector) ou "bot" (BlazeAPI)
+        taxas: Frames por segundo, por feed, de cada degrau
+        duracao: Duração de cada degrau em segundos
+        eventos: Eventos transmitidos
+        ruido: Frames/s de eventos sem inscritos em cada degrau
+        host: Endereço do mock
+        silencioso: Suprime logs/prints por round do coletor durante a medição
+
+    Returns:
+        list: Um dicionário de métricas por degrau (com "saturado" indicando o ponto de saturação)
+    """
+    contexto = multiprocessing.get_context("spawn")
+    conexao, conexao_filho = contexto.Pipe()
+    processo = contexto.Process(target=_processo_servidor, args=(conexao_filho, host), daemon=True)
+    processo.start()
+    ws_url, api_url = conexao.recv()
+
+    saida = io.StringIO() if silencioso else None
+    nivel_anterior = logging.getLogger().level
+    if silencioso:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    with contextlib.redirect_stdout(saida) if saida else contextlib.nullcontext():
+        clients, encerrar = _preparar_alvo(alvo, ws_url, api_url, eventos)
+
+    # Substitui os handlers inscritos por versões medidas
+    medidores = {}
+    for client in clients:
+        for evento, sub in client.subscriptions.items():
+            medidor = medidores.setdefault(evento, _MedidorFeed())
+            sub["handlers"] = [medidor.envolver(handler) for handler in sub["handlers"]]
+
+    # Só faz sentido medir eventos em que o alvo está inscrito
+    ignorados = [evento for evento in eventos if evento not in medidores]
+    if ignorados:
+        logger.warning(f"Target {alvo} is not subscribed to {', '.join(ignorados)}; skipping")
+    eventos = tuple(evento for evento in eventos if evento in medidores)
+
+    resultados = []
+    try:
+        for taxa in taxas:
+            for medidor in medidores.values():
+                medidor.zerar()
+            parse_antes = {evento: _custo_parse(clients, evento) for evento in eventos}
+            cpu_antes = time.process_time()
+            inicio = time.perf_counter()
+
+            with contextlib.redirect_stdout(saida) if saida else contextlib.nullcontext():
+                conexao.send(("stream", {evento: taxa for evento in eventos}, duracao, ruido))
+                enviados = conexao.recv()
+                # Aguarda a fila de entrega esvaziar (até 5s)
+                limite = time.perf_counter() + 5
+                while time.perf_counter() < limite:
+                    if all(medidores[evento].recebidos >= enviados[evento] for evento in eventos):
+                        break
+                    time.sleep(0.05)
+
+            parede = time.perf_counter() - inicio
+            cpu = time.process_time() - cpu_antes
+            degrau = {"taxa": taxa, "cpu_processo_pct": round(100 * cpu / parede, 1), "feeds": {}}
+            saturado = False
+            for evento in eventos:
+                medidor = medidores[evento]
+                recebidos = medidor.recebidos
+                atual = _custo_parse(clients, evento)
+                parse = [atual[0] - parse_antes[evento][0], atual[1] - parse_antes[evento][1]]
+                p99 = _percentil(medidor.atrasos_ms, 0.99)
+                degrau["feeds"][evento] = {
+                    "enviados": enviados[evento],
+                    "alvo": int(taxa * duracao),
+                    "recebidos": recebidos,
+                    "perdidos": enviados[evento] - recebidos,
+                    "msgs_por_s": round(recebidos / duracao, 1),
+                    "parse_us": round(parse[1] / parse[0] / 1000, 2) if parse[0] else 0.0,
+                    "handler_us": round(medidor.cpu_ns / recebidos / 1000, 2) if recebidos else 0.0,
+                    "atraso_p50_ms": round(_percentil(medidor.atrasos_ms, 0.5), 2),
+                    "atraso_p99_ms": round(p99, 2)
+                }
+                # Saturação: não acompanhou a taxa, perdeu frames ou o atraso explodiu
+                if enviados[evento] < 0.95 * taxa * duracao or recebidos < enviados[evento] or p99 > 1000:
+                    saturado = True
+            degrau["saturado"] = saturado
+            resultados.append(degrau)
+            if saturado:
+                break
+    finally:
+        with contextlib.redirect_stdout(saida) if saida else contextlib.nullcontext():
+            encerrar()
+        logging.getLogger().setLevel(nivel_anterior)
+        conexao.send(("sair",))
+        processo.join(timeout=5)
+
+    return resultados
+
+
+def _imprimir_resultados(resultados):
+    for degrau in resultados:
+        status = "SATURADO" if degrau["saturado"] else "ok"
+        print(f"\n{degrau['taxa']} frames/s por feed - CPU do processo {degrau['cpu_processo_pct']}% [{status}]")
+        for evento, m in degrau["feeds"].items():
+            print(f"  {evento}: {m['recebidos']}/{m['alvo']} recebidos ({m['msgs_por_s']} msg/s), "
+                  f"{m['perdidos']} perdidos, parse {m['parse_us']}µs, handler {m['handler_us']}µs, "
+                  f"atraso p50 {m['atraso_p50_ms']}ms / p99 {m['atraso_p99_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock local da Blaze e harness de carga")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    serve = sub.add_parser("serve", help="Executa o mock transmitindo rounds continuamente")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--ws-port", type=int, default=8765)
+    serve.add_argument("--http-port", type=int, default=8766)
+    serve.add_argument("--rate", type=float, default=1.0, help="Rounds por segundo de cada jogo")
+    serve.add_argument("--seed", type=int, default=0, help="Rounds passados por jogo no histórico HTTP")
+    serve.add_argument("--seed-interval", type=float, default=30.0, help="Segundos entre os rounds passados")
+
+    load = sub.add_parser("load", help="Mede a ingestão de um coletor em degraus de carga")
+    load.add_argument("--target", choices=("raw", "pg", "bot"), default="raw")
+    load.add_argument("--rates", default="500,1000,2000,5000,10000")
+    load.add_argument("--duration", type=float, default=5.0)
+    load.add_argument("--events", default="double.tick,crash.tick")
+    load.add_argument("--noise", type=float, default=0, help="Frames/s de eventos sem inscritos")
+    load.add_argument("--verbose", action="store_true", help="Mantém logs e prints do coletor")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.comando == "serve":
+        async def servir():
+            servidor = MockBlazeServer(args.host, args.ws_port, args.http_port, historico=max(1000, args.seed * 2))
+            for evento in JOGOS:
+                servidor.seed(evento, args.seed, args.seed_interval)
+            await servidor.start()
+            print(f"WebSocket: {servidor.ws_url}")
+            print(f"API HTTP:  {servidor.api_url}")
+            while True:
+                await servidor.stream({evento: args.rate for evento in JOGOS}, 60)
+
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(servir())
+        return
+
+    resultados = run_load(
+        alvo=args.target,
+        taxas=[float(t) if "." in t else int(t) for t in args.rates.split(",")],
+        duracao=args.duration,
+        eventos=tuple(args.events.split(",")),
+        ruido=args.noise,
+        silencioso=not args.verbose
+    )
+    _imprimir_resultados(resultados)
+    saturados = [d["taxa"] for d in resultados if d["saturado"]]
+    if saturados:
+        print(f"\nPonto de saturação: ~{saturados[0]} frames/s por feed")
+    else:
+        print("\nNenhuma saturação nas taxas testadas")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,24 +12,65 @@ AVISO: Este script é apenas para fins educacionais. Jogos de cassino são basea
 algoritmos de números aleatórios e não podem ser previstos com certeza. Use por sua conta e risco.
 """
 
+import time
+
+# Início da execução (medição do tempo de inicialização dos comandos)
+_INICIO = time.perf_counter()
+
 import os
 import sys
-import time
 import json
 import hashlib
-import requests
-import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
+import importlib.util
+from datetime import datetime, timedelta, timezone
 from colorama import Fore, Back, Style, init
 import threading
-import websocket
-import ssl
-import re
-import math
 import logging
 from urllib.parse import urlparse
 
+from round_history import RoundHistory, now_ms, parse_epoch_ms
+from round_sequencer import RoundSequencer
+from lag_stats import LagTracker
+from stats_persister import StatsPersister
+
+
+def _importar_tardio(nome):
+    """
+    Importa um módulo pesado só no primeiro acesso a um atributo
+    
+    Comandos como stats e --offline nunca tocam em numpy, websockets ou requests,
+    então não pagam o custo de importá-los.
+    
+    Args:
+        nome: Nome do módulo
+        
+    Returns:
+        module: Módulo (carregado de verdade no primeiro uso)
+    """
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.find_spec(nome)
+    if spec is None:
+        raise ImportError(f"No module named {nome!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    loader.exec_module(modulo)
+    return modulo
+
+
+np = _importar_tardio("numpy")
+blaze_realtime = _importar_tardio("blaze_realtime")
+blaze_http = _importar_tardio("blaze_http")
+frame_log = _importar_tardio("frame_log")
+round_archive = _importar_tardio("round_archive")
+round_store = _importar_tardio("round_store")
+round_columns = _importar_tardio("round_columns")
+game_frame = _importar_tardio("game_frame")
+crash_ticks = _importar_tardio("crash_ticks")
+round_export = _importar_tardio("round_export")
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,126 +85,86 @@ logger = logging.getLogger("PGPredictor")
 # Inicializa colorama para saída colorida no terminal
 init(autoreset=True)
 
-class WebSocketClient:
-    """Classe para gerenciar conexões WebSocket com plataformas de jogos"""
-    
-    def __init__(self, url, on_message=None, on_error=None, on_close=None, on_open=None):
-        self.url = url
-        self.ws = None
-        self.connected = False
-        self.on_message_callback = on_message
-        self.on_error_callback = on_error
-        self.on_close_callback = on_close
-        self.on_open_callback = on_open
-        
-    def on_message(self, ws, message):
-        """Callback para mensagens recebidas"""
-        if self.on_message_callback:
-            self.on_message_callback(message)
-            
-    def on_error(self, ws, error):
-        """Callback para erros"""
-        logger.error(f"WebSocket error: {error}")
-        if self.on_error_callback:
-            self.on_error_callback(error)
-            
-    def on_close(self, ws, close_status_code, close_msg):
-        """Callback para fechamento da conexão"""
-        logger.info(f"WebSocket connection closed: {close_status_code} - {close_msg}")
-        self.connected = False
-        if self.on_close_callback:
-            self.on_close_callback()
-            
-    def on_open(self, ws):
-        """Callback para abertura da conexão"""
-        logger.info(f"WebSocket connection established to {self.url}")
-        self.connected = True
-        if self.on_open_callback:
-            self.on_open_callback()
-            
-    def connect(self):
-        """Estabelece conexão WebSocket"""
-        try:
-            websocket.enableTrace(False)
-            self.ws = websocket.WebSocketApp(
-                self.url,
-                on_message=self.on_message,
-                on_error=self.on_error,
-                on_close=self.on_close,
-                on_open=self.on_open
-            )
-            
-            wst = threading.Thread(target=self.ws.run_forever, kwargs={
-                'sslopt': {"cert_reqs": ssl.CERT_NONE},
-                'ping_interval': 30,
-                'ping_timeout': 10
-            })
-            wst.daemon = True
-            wst.start()
-            
-            # Aguarda a conexão ser estabelecida
-            timeout = 10
-            start_time = time.time()
-            while not self.connected and time.time() - start_time < timeout:
-                time.sleep(0.1)
-                
-            if not self.connected:
-                logger.error(f"Timeout connecting to WebSocket {self.url}")
-                return False
-                
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error connecting to WebSocket: {str(e)}")
-            return False
-            
-    def send(self, message):
-        """Envia mensagem pelo WebSocket"""
-        if self.ws and self.connected:
-            try:
-                self.ws.send(message)
-                return True
-            except Exception as e:
-                logger.error(f"Error sending message: {str(e)}")
-                return False
-        else:
-            logger.error("WebSocket not connected")
-            return False
-            
-    def close(self):
-        """Fecha a conexão WebSocket"""
-        if self.ws:
-            self.ws.close()
-            self.connected = False
-
-
 class DataCollector:
     """Classe para coletar dados de jogos de cassino em tempo real"""
     
-    def __init__(self, config):
+    # Evento de round de cada feed em tempo real (vigiado pelo FeedWatchdog)
+    EVENTOS_FEED = {
+        'double': 'double.tick',
+        'tigrinho': 'fortune.tiger.result',
+        'crash': 'crash.tick'
+    }
+    
+    def __init__(self, config, conectar=True, offline=False, store=None):
+        """
+        Args:
+            config: Configurações do preditor
+            conectar: Se False, registra as inscrições sem abrir conexões (usado no replay)
+            offline: Se True, não usa a rede: os dados vêm apenas dos rounds armazenados
+            store: RoundStore onde os rounds coletados são gravados e de onde são recarregados
+        """
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.offline = offline
+        self.store = store
+        # Pool HTTP compartilhado do processo (keep-alive, retentativas com Retry-After, HTTP/2 opcional)
+        self.session = None if offline else blaze_http.get_http_pool(
+            pool_size=config['http_pool_size'],
+            retries=config['http_retries'],
+            http2=config['http2']
+        )
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0'
-        })
+        }
+        # Polling HTTP condicional com cache curto e último round visto por jogo
+        self.poller = None if offline else blaze_http.ConditionalPoller(self.session, ttl=config['http_cache_ttl'])
+        self.ultimo_id_http = {}
         
-        # WebSocket clients para jogos
+        # Conexões WebSocket compartilhadas, uma por servidor de replicação
         self.ws_clients = {}
         
-        # Dados coletados em tempo real
+        # Gravação opcional dos frames brutos recebidos (reproduzidos com o comando replay)
+        self.recorder = frame_log.FrameRecorder(config['frame_log']) if conectar and not offline and config.get('frame_log') else None
+        
+        # Gravação opcional da curva de multiplicadores (todos os ticks) de cada round do Crash
+        self.tick_recorder = None
+        if conectar and not offline and config.get('crash_ticks_dir'):
+            self.tick_recorder = crash_ticks.CrashTickRecorder(config['crash_ticks_dir'])
+        
+        # Dados coletados em tempo real (buffer circular por jogo, mais recente primeiro).
+        # Jogos de resultado numérico usam o buffer colunar (GameFrame); Mines e Tigrinho guardam dicionários
+        capacidade = config['history_size']
         self.live_data = {
-            'double': [],
-            'mines': [],
-            'tigrinho': [],
-            'crash': [],
-            'limbo': []
+            'double': game_frame.FrameHistory('double', capacidade),
+            'mines': RoundHistory(capacidade),
+            'tigrinho': RoundHistory(capacidade),
+            'crash': game_frame.FrameHistory('crash', capacidade),
+            'limbo': game_frame.FrameHistory('limbo', capacidade)
+        }
+        
+        # Sequenciadores dos jogos da Blaze: deduplicação por id, ordem pelo horário do servidor
+        # e busca por HTTP dos rounds perdidos durante uma desconexão
+        self.sequencers = {
+            jogo: RoundSequencer(
+                self.live_data[jogo],
+                backfill=lambda desde, ate, jogo=jogo: self._backfill_http(jogo, desde, ate),
+                lacuna_ms=config['gap_seconds'][jogo] * 1000,
+                nome=jogo,
+                on_gravado=None if store is None else (lambda rodada, epoch_ms, jogo=jogo: store.add_round(jogo, rodada))
+            )
+            for jogo in ('double', 'crash')
         }
         
+        # Atraso servidor -> recebimento (rede) e recebimento -> previsão pronta, por feed
+        self.lag = LagTracker()
+        
+        # Jogos cujos dados atuais foram simulados (não entram no armazenamento nem nas medições de atraso)
+        self.simulados = set()
+        
         # Flags para controle de coleta
         self.collecting = {
             'double': False,
@@ -173,193 +174,258 @@ class DataCollector:
             'limbo': False
         }
         
-        # Inicializa coleta de dados
-        self._setup_data_collection()
-        
-    def _setup_data_collection(self):
-        """Configura a coleta de dados para todos os jogos"""
-        # Inicia coleta para Double
-        self._setup_double_collection()
+        # Feeds em tempo real: cada um só conecta (em segundo plano) quando o jogo é pedido pela primeira vez.
+        # Nota: Mines e Limbo não têm coleta em tempo real pois dependem de ações do usuário
+        self.conectar = conectar and not offline
+        self._setups = {
+            'double': self._setup_double_collection,
+            'tigrinho': self._setup_tigrinho_collection,
+            'crash': self._setup_crash_collection
+        }
+        # Estado de cada feed: idle -> connecting -> ready (failed enquanto tenta reconectar, stale se parar de entregar rounds)
+        self.feed_status = {jogo: 'offline' if offline else 'idle' for jogo in self._setups}
+        self._feed_lock = threading.Lock()
+        # Vigia de feeds parados (criado quando o primeiro feed é iniciado)
+        self.watchdog = None
+        
+        # Reinício a quente: os últimos rounds de cada jogo voltam do armazenamento
+        if store is not None:
+            self._aquecer(config['warm_load_rounds'])
+            
+        if not conectar and not offline:
+            # Replay: registra todas as inscrições sem abrir conexões
+            for setup in self._setups.values():
+                setup()
+                
+    def iniciar_feed(self, jogo):
+        """
+        Inicia o feed em tempo real de um jogo sem bloquear (apenas na primeira chamada)
         
-        # Inicia coleta para Tigrinho
-        self._setup_tigrinho_collection()
+        Double e Crash compartilham a conexão da Blaze: o segundo a ser pedido apenas
+        entra na sala da conexão já aberta.
         
-        # Inicia coleta para Crash
-        self._setup_crash_collection()
+        Args:
+            jogo: String com o nome do jogo
+            
+        Returns:
+            str: Estado do feed (idle, connecting, ready, stale, failed) ou None se o jogo não tem feed
+        """
+        with self._feed_lock:
+            estado = self.feed_status.get(jogo)
+            if estado != 'idle' or not self.conectar:
+                return estado
+            self.feed_status[jogo] = 'connecting'
+            
+        client = self._setups[jogo]()
+        if client is None:
+            self.feed_status[jogo] = 'failed'
+            return 'failed'
+            
+        futuro = blaze_realtime.get_engine().submit(client.connect_async(self.config['connect_timeout']))
+        futuro.add_done_callback(lambda f: self._on_feed_connect(jogo, client, f))
+        
+        # Vigia a cadência de rounds do feed a partir de agora
+        with self._feed_lock:
+            if self.watchdog is None:
+                self.watchdog = blaze_realtime.FeedWatchdog(
+                    multiplo=self.config['watchdog_multiple'],
+                    minimo=self.config['watchdog_min_seconds'],
+                    on_stale=self._on_feed_stale
+                )
+        self.watchdog.watch(jogo, client, self.EVENTOS_FEED[jogo], self.config['round_interval_seconds'][jogo])
+        return 'connecting'
+        
+    def _on_feed_stale(self, jogo, acao):
+        """Marca o feed como parado (o watchdog já está reinscrevendo ou reconectando)"""
+        self.feed_status[jogo] = 'stale'
+        
+    def _marcar_round(self, jogo):
+        """Informa ao watchdog que um round do feed chegou"""
+        if self.watchdog is not None:
+            self.watchdog.beat(jogo)
+            if self.feed_status[jogo] == 'stale':
+                self.feed_status[jogo] = 'ready'
+        
+    def _on_feed_connect(self, jogo, client, futuro):
+        """Atualiza o estado do feed quando a primeira tentativa de conexão termina"""
+        if futuro.cancelled():
+            # Encerramento antes da conexão terminar
+            return
+        try:
+            conectado = futuro.result()
+        except Exception:
+            conectado = False
+            
+        if conectado:
+            self.feed_status[jogo] = 'ready'
+            logger.info(f"WebSocket connected: {client.url} ({jogo})")
+        elif self.feed_status[jogo] != 'ready':
+            # O supervisor continua tentando; on_subscribe marca o feed como pronto quando conectar
+            self.feed_status[jogo] = 'failed'
+            logger.warning(f"Failed to connect to {client.url}, will use alternative methods")
+            
+    def _obter_cliente_ws(self, url):
+        """
+        Retorna a conexão compartilhada para um servidor de replicação
         
-        # Nota: Mines e Limbo não têm coleta em tempo real pois dependem de ações do usuário
+        Args:
+            url: URL do WebSocket
+            
+        Returns:
+            ReplicationClient: Cliente (criado na primeira chamada)
+        """
+        if url not in self.ws_clients:
+            self.ws_clients[url] = blaze_realtime.ReplicationClient(url, verify_ssl=False, recorder=self.recorder)
+        return self.ws_clients[url]
         
     def _setup_double_collection(self):
         """Configura coleta de dados para o jogo Double"""
         try:
-            # Tenta estabelecer WebSocket para Double
-            double_ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
-            
-            def on_double_message(message):
-                try:
-                    # Processa mensagens do Double
-                    if "42" in message and "double.tick" in message:
-                        # Extrai dados do resultado
-                        data_match = re.search(r'42\["double\.tick",(.+)\]', message)
-                        if data_match:
-                            data_json = json.loads(data_match.group(1))
-                            
-                            # Determina a cor com base no número
-                            numero = data_json.get('roll')
-                            if numero is not None:
-                                if numero == 0:
-                                    cor = "white"
-                                elif 1 <= numero <= 7:
-                                    cor = "red"
-                                else:
-                                    cor = "black"
-                                    
-                                # Adiciona ao histórico
-                                self.live_data['double'].append({
-                                    "cor": cor,
-                                    "numero": numero,
-                                    "timestamp": datetime.now().isoformat(),
-                                    "status": "final"
-                                })
-                                
-                                logger.info(f"Double result: {cor} {numero}")
-                                
-                except Exception as e:
-                    logger.error(f"Error processing Double message: {str(e)}")
+            def on_double_message(data_json):
+                # Determina a cor com base no número
+                numero = data_json.get('roll')
+                if numero is not None:
+                    if numero == 0:
+                        cor = "white"
+                    elif 1 <= numero <= 7:
+                        cor = "red"
+                    else:
+                        cor = "black"
+                        
+                    # Adiciona ao histórico (o mesmo round chega em vários ticks; o sequenciador deduplica)
+                    rodada = self._carimbar({
+                        "id": data_json.get('id'),
+                        "cor": cor,
+                        "numero": numero,
+                        "status": "final"
+                    }, data_json.get('created_at'), data_json.get('updated_at'))
+                    aceito = self.sequencers['double'].offer(rodada, rodada['id'], rodada['ts_servidor'])
+                    
+                    if aceito:
+                        self._registrar_lag_rede('double', rodada)
+                        self._marcar_round('double')
+                        logger.info(f"Double result: {cor} {numero}")
                     
-            def on_double_open():
-                # Envia mensagem de subscrição para o jogo Double
-                self.ws_clients['double'].send('42["subscribe",["double.tick"]]')
+            def on_double_subscribe():
                 self.collecting['double'] = True
+                # Depois de uma recuperação, o feed só volta a "ready" quando um round chegar
+                if self.feed_status['double'] != 'stale':
+                    self.feed_status['double'] = 'ready'
+                self.sequencers['double'].marcar_reconexao()
                 logger.info("Double data collection started")
                 
-            # Cria cliente WebSocket para Double
-            self.ws_clients['double'] = WebSocketClient(
-                double_ws_url,
-                on_message=on_double_message,
-                on_open=on_double_open
+            # Inscreve o Double na conexão compartilhada da Blaze
+            client = self._obter_cliente_ws(self.config['blaze_ws_url'] or blaze_realtime.BLAZE_REPLICATION_URL)
+            client.subscribe(
+                "double.tick",
+                on_double_message,
+                on_subscribe=on_double_subscribe
             )
             
-            # Conecta ao WebSocket
-            if self.ws_clients['double'].connect():
-                logger.info("Double WebSocket connected")
-            else:
-                logger.warning("Failed to connect to Double WebSocket, will use alternative methods")
-                
+            return client
+            
         except Exception as e:
             logger.error(f"Error setting up Double collection: {str(e)}")
+            return None
             
     def _setup_tigrinho_collection(self):
         """Configura coleta de dados para o jogo Tigrinho"""
         try:
-            # Tenta estabelecer WebSocket para Tigrinho
-            tigrinho_ws_url = "wss://api-v2.pgsoft.com/replication/?EIO=3&transport=websocket"
-            
-            def on_tigrinho_message(message):
-                try:
-                    # Processa mensagens do Tigrinho
-                    if "42" in message and "fortune.tiger.result" in message:
-                        # Extrai dados do resultado
-                        data_match = re.search(r'42\["fortune\.tiger\.result",(.+)\]', message)
-                        if data_match:
-                            data_json = json.loads(data_match.group(1))
-                            
-                            # Extrai resultado (combinação de símbolos)
-                            simbolos = data_json.get('symbols', [])
-                            multiplicador = data_json.get('multiplier', 1.0)
-                            
-                            # Adiciona ao histórico
-                            self.live_data['tigrinho'].append({
-                                "simbolos": simbolos,
-                                "multiplicador": multiplicador,
-                                "timestamp": datetime.now().isoformat(),
-                                "status": "final"
-                            })
-                            
-                            logger.info(f"Tigrinho result: {simbolos} - {multiplicador}x")
-                            
-                except Exception as e:
-                    logger.error(f"Error processing Tigrinho message: {str(e)}")
-                    
-            def on_tigrinho_open():
-                # Envia mensagem de subscrição para o jogo Tigrinho
-                self.ws_clients['tigrinho'].send('42["subscribe",["fortune.tiger.result"]]')
+            # Tigrinho usa o servidor de replicação da PG Soft
+            tigrinho_ws_url = self.config['pgsoft_ws_url']
+            
+            def on_tigrinho_message(data_json):
+                # Extrai resultado (combinação de símbolos)
+                simbolos = data_json.get('symbols', [])
+                multiplicador = data_json.get('multiplier', 1.0)
+                
+                # Adiciona ao histórico
+                rodada = self._carimbar({
+                    "simbolos": simbolos,
+                    "multiplicador": multiplicador,
+                    "status": "final"
+                }, data_json.get('created_at'), data_json.get('updated_at'))
+                self.live_data['tigrinho'].push(rodada, rodada['ts_servidor'])
+                if self.store is not None:
+                    self.store.add_round('tigrinho', rodada)
+                self._registrar_lag_rede('tigrinho', rodada)
+                self._marcar_round('tigrinho')
+                
+                logger.info(f"Tigrinho result: {simbolos} - {multiplicador}x")
+                
+            def on_tigrinho_subscribe():
                 self.collecting['tigrinho'] = True
+                # Depois de uma recuperação, o feed só volta a "ready" quando um round chegar
+                if self.feed_status['tigrinho'] != 'stale':
+                    self.feed_status['tigrinho'] = 'ready'
                 logger.info("Tigrinho data collection started")
                 
-            # Cria cliente WebSocket para Tigrinho
-            self.ws_clients['tigrinho'] = WebSocketClient(
-                tigrinho_ws_url,
-                on_message=on_tigrinho_message,
-                on_open=on_tigrinho_open
+            client = self._obter_cliente_ws(tigrinho_ws_url)
+            client.subscribe(
+                "fortune.tiger.result",
+                on_tigrinho_message,
+                on_subscribe=on_tigrinho_subscribe
             )
             
-            # Conecta ao WebSocket
-            if self.ws_clients['tigrinho'].connect():
-                logger.info("Tigrinho WebSocket connected")
-            else:
-                logger.warning("Failed to connect to Tigrinho WebSocket, will use alternative methods")
-                
+            return client
+            
         except Exception as e:
             logger.error(f"Error setting up Tigrinho collection: {str(e)}")
+            return None
             
     def _setup_crash_collection(self):
         """Configura coleta de dados para o jogo Crash"""
         try:
-            # Tenta estabelecer WebSocket para Crash
-            crash_ws_url = "wss://api-v2.blaze.com/replication/?EIO=3&transport=websocket"
-            
-            def on_crash_message(message):
-                try:
-                    # Processa mensagens do Crash
-                    if "42" in message and "crash.tick" in message:
-                        # Extrai dados do resultado
-                        data_match = re.search(r'42\["crash\.tick",(.+)\]', message)
-                        if data_match:
-                            data_json = json.loads(data_match.group(1))
-                            
-                            # Verifica se é um resultado final
-                            if data_json.get('status') == 'complete':
-                                valor = data_json.get('crash_point')
-                                
-                                # Adiciona ao histórico
-                                self.live_data['crash'].append({
-                                    "valor": valor,
-                                    "timestamp": datetime.now().isoformat(),
-                                    "status": "final"
-                                })
-                                
-                                logger.info(f"Crash result: {valor}x")
-                                
-                except Exception as e:
-                    logger.error(f"Error processing Crash message: {str(e)}")
+            def on_crash_message(data_json):
+                if self.tick_recorder is not None:
+                    self.tick_recorder.record(data_json)
+                    
+                # Verifica se é um resultado final
+                if data_json.get('status') == 'complete':
+                    valor = data_json.get('crash_point')
+                    
+                    # Adiciona ao histórico
+                    rodada = self._carimbar({
+                        "id": data_json.get('id'),
+                        "valor": valor,
+                        "status": "final"
+                    }, data_json.get('created_at'), data_json.get('updated_at'))
+                    aceito = self.sequencers['crash'].offer(rodada, rodada['id'], rodada['ts_servidor'])
+                    
+                    if aceito:
+                        self._registrar_lag_rede('crash', rodada)
+                        self._marcar_round('crash')
+                        logger.info(f"Crash result: {valor}x")
                     
-            def on_crash_open():
-                # Envia mensagem de subscrição para o jogo Crash
-                self.ws_clients['crash'].send('42["subscribe",["crash.tick"]]')
+            def on_crash_subscribe():
                 self.collecting['crash'] = True
+                # Depois de uma recuperação, o feed só volta a "ready" quando um round chegar
+                if self.feed_status['crash'] != 'stale':
+                    self.feed_status['crash'] = 'ready'
+                self.sequencers['crash'].marcar_reconexao()
                 logger.info("Crash data collection started")
                 
-            # Cria cliente WebSocket para Crash
-            self.ws_clients['crash'] = WebSocketClient(
-                crash_ws_url,
-                on_message=on_crash_message,
-                on_open=on_crash_open
+            # Crash reaproveita a mesma conexão do Double
+            client = self._obter_cliente_ws(self.config['blaze_ws_url'] or blaze_realtime.BLAZE_REPLICATION_URL)
+            client.subscribe(
+                "crash.tick",
+                on_crash_message,
+                on_subscribe=on_crash_subscribe
             )
             
-            # Conecta ao WebSocket
-            if self.ws_clients['crash'].connect():
-                logger.info("Crash WebSocket connected")
-            else:
-                logger.warning("Failed to connect to Crash WebSocket, will use alternative methods")
-                
+            return client
+            
         except Exception as e:
             logger.error(f"Error setting up Crash collection: {str(e)}")
+            return None
             
     def coletar_dados_http(self, jogo):
         """
         Coleta dados via HTTP quando WebSocket não está disponível
         
+        As requisições são condicionais e passam por um cache curto, e apenas os rounds
+        mais novos que o último já coletado são convertidos e adicionados ao histórico.
+        
         Args:
             jogo: String com o nome do jogo
             
@@ -368,74 +434,152 @@ class DataCollector:
         """
         try:
             if jogo == 'double':
-                # Tenta coletar dados do Double via HTTP
-                url = "https://blaze.com/api/roulette_games/recent"
-                response = self.session.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Processa os resultados
-                    novos_resultados = []
-                    for item in data:
-                        numero = item.get('roll')
-                        if numero is not None:
-                            if numero == 0:
-                                cor = "white"
-                            elif 1 <= numero <= 7:
-                                cor = "red"
-                            else:
-                                cor = "black"
-                                
-                            # Adiciona ao histórico
-                            novos_resultados.append({
-                                "cor": cor,
-                                "numero": numero,
-                                "timestamp": item.get('created_at'),
-                                "status": "final"
-                            })
-                            
-                    # Atualiza dados em tempo real
-                    if novos_resultados:
-                        self.live_data['double'] = novos_resultados + self.live_data['double']
-                        self.live_data['double'] = self.live_data['double'][:100]  # Limita tamanho
-                        logger.info(f"Collected {len(novos_resultados)} Double results via HTTP")
-                        return True
-                        
+                url = f"{self.config['blaze_api_url']}/roulette_games/recent"
+                converter = self._converter_double_http
             elif jogo == 'crash':
-                # Tenta coletar dados do Crash via HTTP
-                url = "https://blaze.com/api/crash_games/recent"
-                response = self.session.get(url, timeout=10)
+                url = f"{self.config['blaze_api_url']}/crash_games/recent"
+                converter = self._converter_crash_http
+            else:
+                # Outros jogos não têm API HTTP pública conhecida
+                return False
                 
-                if response.status_code == 200:
-                    data = response.json()
+            data, mudou = self.poller.poll(url, headers=self.headers)
+            if data is None:
+                return False
+            if not mudou:
+                # Nada mudou desde a última consulta (304, mesmo ETag ou cache)
+                return bool(self.live_data[jogo])
+                
+            # A API retorna do mais recente para o mais antigo: converte até o último round já visto
+            ultimo_id = self.ultimo_id_http.get(jogo)
+            novos_resultados = []
+            for item in data:
+                if ultimo_id is not None and (item.get('id') or item.get('created_at')) == ultimo_id:
+                    break
+                resultado = converter(item)
+                if resultado:
+                    novos_resultados.append(resultado)
                     
-                    # Processa os resultados
-                    novos_resultados = []
-                    for item in data:
-                        valor = item.get('crash_point')
-                        if valor is not None:
-                            # Adiciona ao histórico
-                            novos_resultados.append({
-                                "valor": valor,
-                                "timestamp": item.get('created_at'),
-                                "status": "final"
-                            })
-                            
-                    # Atualiza dados em tempo real
-                    if novos_resultados:
-                        self.live_data['crash'] = novos_resultados + self.live_data['crash']
-                        self.live_data['crash'] = self.live_data['crash'][:100]  # Limita tamanho
-                        logger.info(f"Collected {len(novos_resultados)} Crash results via HTTP")
-                        return True
-                        
-            # Outros jogos não têm API HTTP pública conhecida
-            return False
+            if data:
+                self.ultimo_id_http[jogo] = data[0].get('id') or data[0].get('created_at')
+                
+            # Atualiza dados em tempo real pelo sequenciador (do mais antigo para o mais recente)
+            aceitos = 0
+            for resultado in reversed(novos_resultados):
+                if self.sequencers[jogo].offer(resultado, resultado['id'], resultado['ts_servidor']):
+                    self._registrar_lag_rede(f"{jogo}/http", resultado)
+                    aceitos += 1
+            if aceitos:
+                logger.info(f"Collected {aceitos} {jogo.capitalize()} results via HTTP")
+                
+            return bool(self.live_data[jogo])
             
         except Exception as e:
             logger.error(f"Error collecting {jogo} data via HTTP: {str(e)}")
             return False
             
+    def _carimbar(self, rodada, criado_em, liquidado_em=None):
+        """
+        Adiciona à rodada o horário do servidor e o horário de recebimento
+        
+        Args:
+            rodada: Dados da rodada
+            criado_em: created_at do servidor (ISO 8601) ou None, usado na ordenação
+            liquidado_em: updated_at do servidor (ISO 8601) ou None, usado no atraso de rede
+            
+        Returns:
+            dict: A rodada com ts_servidor e ts_recebido (epoch ms), timestamp (ISO do servidor)
+            e, se o payload trouxer a liquidação, ts_liquidacao (epoch ms)
+        """
+        recebido = now_ms()
+        servidor = parse_epoch_ms(criado_em)
+        liquidacao = parse_epoch_ms(liquidado_em)
+        if liquidacao is not None:
+            rodada["ts_liquidacao"] = liquidacao
+        # Sem horário do servidor, o recebimento é a melhor estimativa (e não entra no atraso de rede)
+        rodada["ts_servidor"] = servidor if servidor is not None else recebido
+        rodada["ts_recebido"] = recebido
+        rodada["timestamp"] = criado_em if servidor is not None else datetime.fromtimestamp(recebido / 1000, timezone.utc).isoformat()
+        rodada["ts_servidor_estimado"] = servidor is None
+        return rodada
+        
+    def _registrar_lag_rede(self, feed, rodada):
+        """Registra o atraso liquidação -> recebimento de uma rodada aceita"""
+        # created_at é o início do round (Crash: o voo inteiro; Double: apostas e giro), não a liquidação
+        if "ts_liquidacao" in rodada:
+            self.lag.record(feed, "rede", rodada["ts_recebido"] - rodada["ts_liquidacao"])
+            
+    def registrar_lag_previsao(self, jogo, historico):
+        """
+        Registra o atraso entre o recebimento do round mais recente e a previsão pronta
+        
+        Args:
+            jogo: String com o nome do jogo
+            historico: Rounds usados na previsão (mais recente primeiro)
+        """
+        if historico and not self.offline and jogo not in self.simulados and "ts_recebido" in historico[0]:
+            self.lag.record(jogo, "previsao", now_ms() - historico[0]["ts_recebido"])
+            
+    def _converter_double_http(self, item):
+        """Converte um round do Double retornado pela API HTTP"""
+        numero = item.get('roll')
+        if numero is None:
+            return None
+            
+        if numero == 0:
+            cor = "white"
+        elif 1 <= numero <= 7:
+            cor = "red"
+        else:
+            cor = "black"
+            
+        return self._carimbar({
+            "id": item.get('id'),
+            "cor": cor,
+            "numero": numero,
+            "status": "final"
+        }, item.get('created_at'), item.get('updated_at'))
+        
+    def _converter_crash_http(self, item):
+        """Converte um round do Crash retornado pela API HTTP"""
+        valor = item.get('crash_point')
+        if valor is None:
+            return None
+            
+        return self._carimbar({
+            "id": item.get('id'),
+            "valor": valor,
+            "status": "final"
+        }, item.get('created_at'), item.get('updated_at'))
+            
+    def _backfill_http(self, jogo, desde_ms, ate_ms):
+        """
+        Busca por HTTP os rounds perdidos em uma lacuna (usado pelos sequenciadores)
+        
+        Args:
+            jogo: 'double' ou 'crash'
+            desde_ms: Horário do último round recebido em epoch (ms)
+            ate_ms: Horário do primeiro round depois da lacuna em epoch (ms)
+            
+        Returns:
+            list: Lista de (rodada, rodada_id, epoch_ms)
+        """
+        if jogo == 'double':
+            url = f"{self.config['blaze_api_url']}/roulette_games/history"
+            converter = self._converter_double_http
+        else:
+            url = f"{self.config['blaze_api_url']}/crash_games/history"
+            converter = self._converter_crash_http
+            
+        recuperados = []
+        for item in blaze_http.fetch_history_range(url, desde_ms, ate_ms, headers=self.headers, pool=self.session):
+            resultado = converter(item)
+            if resultado:
+                recuperados.append((resultado, resultado['id'], resultado['ts_servidor']))
+                
+        logger.info(f"Recovered {len(recuperados)} {jogo.capitalize()} rounds via HTTP history")
+        return recuperados
+        
     def simular_dados(self, jogo, quantidade=20):
         """
         Simula dados quando não é possível coletar em tempo real
@@ -468,7 +612,6 @@ class DataCollector:
                 resultados.append({
                     "cor": cor,
                     "numero": numero,
-                    "timestamp": datetime.now().isoformat(),
                     "status": "simulado"
                 })
                 
@@ -490,7 +633,6 @@ class DataCollector:
                     "grid": grid,
                     "mines_count": self.config['mines_count'],
                     "grid_size": self.config['grid_size'],
-                    "timestamp": datetime.now().isoformat(),
                     "status": "simulado"
                 })
                 
@@ -524,7 +666,6 @@ class DataCollector:
                 resultados.append({
                     "simbolos": simbolos,
                     "multiplicador": multiplicador,
-                    "timestamp": datetime.now().isoformat(),
                     "status": "simulado"
                 })
                 
@@ -545,7 +686,6 @@ class DataCollector:
                     
                 resultados.append({
                     "valor": valor,
-                    "timestamp": datetime.now().isoformat(),
                     "status": "simulado"
                 })
                 
@@ -566,11 +706,11 @@ class DataCollector:
                     
                 resultados.append({
                     "valor": valor,
-                    "timestamp": datetime.now().isoformat(),
                     "status": "simulado"
                 })
                 
-        return resultados
+        # Simulados não têm horário do servidor: ts_servidor = ts_recebido (estimado)
+        return [self._carimbar(resultado, None) for resultado in resultados]
         
     def obter_dados(self, jogo, quantidade=30):
         """
@@ -583,29 +723,75 @@ class DataCollector:
         Returns:
             list: Lista com dados do jogo
         """
+        # Inicia o feed em tempo real do jogo na primeira vez que ele é pedido (sem bloquear)
+        self.iniciar_feed(jogo)
+        
+        # Feed parado (socket meio aberto): enquanto o watchdog recupera, completa por HTTP
+        if self.watchdog is not None and self.watchdog.stale(jogo) and jogo in ['double', 'crash']:
+            self.coletar_dados_http(jogo)
+            
         # Verifica se temos dados em tempo real
         if jogo in self.live_data and self.live_data[jogo]:
-            # Retorna os dados mais recentes
-            return self.live_data[jogo][:quantidade]
+            # Retorna os dados mais recentes (visão sem cópia do buffer)
+            return self.live_data[jogo].latest(quantidade)
             
         # Se não estamos coletando dados em tempo real, tenta coletar via HTTP
-        if jogo in ['double', 'crash'] and not self.collecting[jogo]:
+        if jogo in ['double', 'crash'] and not self.collecting[jogo] and not self.offline:
             if self.coletar_dados_http(jogo):
-                return self.live_data[jogo][:quantidade]
+                return self.live_data[jogo].latest(quantidade)
                 
         # Se ainda não temos dados, simula
         if jogo in self.live_data and not self.live_data[jogo]:
-            self.live_data[jogo] = self.simular_dados(jogo, quantidade)
+            self.live_data[jogo].extend(self.simular_dados(jogo, quantidade))
+            self.simulados.add(jogo)
             
         # Retorna os dados disponíveis
-        return self.live_data[jogo][:quantidade] if jogo in self.live_data else []
+        return self.live_data[jogo].latest(quantidade) if jogo in self.live_data else []
+        
+    def _aquecer(self, quantidade):
+        """
+        Recarrega do armazenamento os últimos rounds de cada jogo
+        
+        Args:
+            quantidade: Rounds por jogo
+        """
+        inicio = time.perf_counter()
+        for jogo, historico in self.live_data.items():
+            rodadas = self.store.load_rounds(jogo, quantidade)
+            if jogo in self.sequencers:
+                # O sequenciador também passa a conhecer os ids e o último horário (lacuna desde a parada)
+                self.sequencers[jogo].restore([(r, r.get('id'), r['ts_servidor']) for r in rodadas])
+            else:
+                for rodada in rodadas:
+                    historico.push(rodada, rodada['ts_servidor'])
+                    
+        carregados = {jogo: len(historico) for jogo, historico in self.live_data.items() if historico}
+        logger.info(f"Warm-loaded rounds {carregados} in {(time.perf_counter() - inicio) * 1000:.1f} ms")
         
     def fechar(self):
         """Fecha todas as conexões WebSocket"""
-        for jogo, client in self.ws_clients.items():
+        for url, client in self.ws_clients.items():
             if client:
                 client.close()
-                logger.info(f"Closed WebSocket connection for {jogo}")
+                logger.info(f"Closed WebSocket connection for {url}")
+                logger.info(f"Frame decoder stats for {url}: {client.decoder.estatisticas()}")
+        if self.ws_clients:
+            blaze_realtime.get_engine().stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.tick_recorder is not None:
+            self.tick_recorder.close()
+        if self.session is not None:
+            logger.info(f"HTTP pool stats: {self.session.estatisticas()}")
+            logger.info(f"HTTP polling stats: {self.poller.estatisticas()}")
+        for jogo, sequencer in self.sequencers.items():
+            logger.info(f"{jogo.capitalize()} sequencer stats: {sequencer.estatisticas()}")
+        for feed, etapas in self.lag.estatisticas().items():
+            logger.info(f"Lag stats for {feed}: {etapas}")
+        if self.watchdog is not None:
+            logger.info(f"Feed watchdog stats: {self.watchdog.estatisticas()}")
+        if self.session is not None:
+            self.session.close()
 
 
 class PatternAnalyzer:
@@ -619,7 +805,7 @@ class PatternAnalyzer:
         Analisa o padrão do jogo Double
         
         Args:
-            historico: Lista com histórico de resultados
+            historico: GameFrame ou lista de rounds (mais recente primeiro)
             
         Returns:
             dict: Análise com padrões detectados
@@ -630,106 +816,46 @@ class PatternAnalyzer:
                 "mensagem": "Histórico insuficiente para análise"
             }
             
-        # Extrai cores e números
-        cores = [item["cor"] for item in historico]
-        numeros = [item["numero"] for item in historico]
-        
-        # Análise de frequência
-        freq_cores = {
-            "white": cores.count("white"),
-            "red": cores.count("red"),
-            "black": cores.count("black")
-        }
-        
+        # Colunas numpy (cor 0/1/2, numero): uma lista de rounds é convertida uma única vez
+        historico = game_frame.as_frame('double', historico)
+        nomes = self.config['double_colors']
+        cores = historico.column("cor")
+        numeros = historico.column("numero")
         total = len(cores)
-        freq_percentual = {
-            "white": (freq_cores["white"] / total) * 100,
-            "red": (freq_cores["red"] / total) * 100,
-            "black": (freq_cores["black"] / total) * 100
-        }
         
-        # Análise de sequências
-        sequencias = {
-            "white_after_red": 0,
-            "white_after_black": 0,
-            "red_after_red": 0,
-            "red_after_black": 0,
-            "red_after_white": 0,
-            "black_after_red": 0,
-            "black_after_black": 0,
-            "black_after_white": 0
-        }
+        # Análise de frequência
+        contagem = np.bincount(cores, minlength=3)
+        freq_cores = {nomes[codigo]: int(contagem[codigo]) for codigo in (0, 1, 2)}
+        freq_percentual = {cor: (count / total) * 100 for cor, count in freq_cores.items()}
         
-        for i in range(1, len(cores)):
-            prev_cor = cores[i-1]
-            curr_cor = cores[i]
-            key = f"{curr_cor}_after_{prev_cor}"
-            if key in sequencias:
-                sequencias[key] += 1
-                
+        # Análise de sequências: pares (anterior, atual) codificados como anterior * 3 + atual
+        pares = np.bincount(cores[:-1].astype(np.intp) * 3 + cores[1:], minlength=9)
+        sequencias = {}
+        for antes, depois in ((1, 0), (2, 0), (1, 1), (2, 1), (0, 1), (1, 2), (2, 2), (0, 2)):
+            sequencias[f"{nomes[depois]}_after_{nomes[antes]}"] = int(pares[antes * 3 + depois])
+            
         # Calcula probabilidades condicionais
         prob_condicionais = {}
         for key, count in sequencias.items():
-            partes = key.split("_after_")
-            if len(partes) == 2:
-                cor_depois, cor_antes = partes
-                total_cor_antes = cores.count(cor_antes)
-                if total_cor_antes > 0:
-                    prob = (count / total_cor_antes) * 100
-                    prob_condicionais[key] = prob
-                    
-        # Análise de padrões mais complexos
-        # Verifica se há padrões de alternância (RBRBRB ou BRBRBR)
-        alternancia_rb = 0
-        alternancia_br = 0
-        
-        for i in range(2, len(cores)):
-            if (cores[i-2] == "red" and 
-                cores[i-1] == "black" and 
-                cores[i] == "red"):
-                alternancia_rb += 1
-                
-            if (cores[i-2] == "black" and 
-                cores[i-1] == "red" and 
-                cores[i] == "black"):
-                alternancia_br += 1
+            cor_antes = key.split("_after_")[1]
+            if freq_cores[cor_antes] > 0:
+                prob_condicionais[key] = (count / freq_cores[cor_antes]) * 100
                 
-        # Verifica padrões de repetição (RRR ou BBB)
-        repeticao_r = 0
-        repeticao_b = 0
-        
-        for i in range(2, len(cores)):
-            if (cores[i-2] == "red" and 
-                cores[i-1] == "red" and 
-                cores[i] == "red"):
-                repeticao_r += 1
-                
-            if (cores[i-2] == "black" and 
-                cores[i-1] == "black" and 
-                cores[i] == "black"):
-                repeticao_b += 1
-                
-        # Análise de tendências recentes (últimos 10 resultados)
-        cores_recentes = cores[:10]
-        freq_recentes = {
-            "white": cores_recentes.count("white"),
-            "red": cores_recentes.count("red"),
-            "black": cores_recentes.count("black")
-        }
+        # Alternâncias (RBR, BRB) e repetições (RRR, BBB) em trincas consecutivas
+        a, b, c = cores[:-2], cores[1:-1], cores[2:]
         
-        # Detecta desvios da média
-        desvios = {
-            "white": freq_recentes["white"] - (freq_percentual["white"] / 100 * 10),
-            "red": freq_recentes["red"] - (freq_percentual["red"] / 100 * 10),
-            "black": freq_recentes["black"] - (freq_percentual["black"] / 100 * 10)
-        }
+        def trincas(x, y, z):
+            return int(np.count_nonzero((a == x) & (b == y) & (c == z)))
+            
+        # Análise de tendências recentes (últimos 10 resultados)
+        recentes = np.bincount(cores[:10], minlength=3)
+        freq_recentes = {nomes[codigo]: int(recentes[codigo]) for codigo in (0, 1, 2)}
+        desvios = {cor: freq_recentes[cor] - (freq_percentual[cor] / 100 * 10) for cor in freq_recentes}
         
         # Análise de números específicos
-        freq_numeros = {}
-        for num in range(15):  # 0-14
-            freq_numeros[num] = numeros.count(num)
-            
-        # Retorna análise completa
+        contagem_numeros = np.bincount(numeros, minlength=15)
+        freq_numeros = {num: int(contagem_numeros[num]) for num in range(15)}
+        
         return {
             "padroes_detectados": True,
             "frequencia_cores": freq_cores,
@@ -737,21 +863,21 @@ class PatternAnalyzer:
             "sequencias": sequencias,
             "probabilidades_condicionais": prob_condicionais,
             "alternancia": {
-                "red_black_red": alternancia_rb,
-                "black_red_black": alternancia_br
+                "red_black_red": trincas(1, 2, 1),
+                "black_red_black": trincas(2, 1, 2)
             },
             "repeticao": {
-                "red_red_red": repeticao_r,
-                "black_black_black": repeticao_b
+                "red_red_red": trincas(1, 1, 1),
+                "black_black_black": trincas(2, 2, 2)
             },
             "tendencias_recentes": {
                 "frequencia": freq_recentes,
                 "desvios": desvios
             },
             "frequencia_numeros": freq_numeros,
-            "ultima_cor": cores[0] if cores else None,
-            "penultima_cor": cores[1] if len(cores) > 1 else None,
-            "antepenultima_cor": cores[2] if len(cores) > 2 else None
+            "ultima_cor": nomes[int(cores[0])],
+            "penultima_cor": nomes[int(cores[1])],
+            "antepenultima_cor": nomes[int(cores[2])]
         }
         
     def analisar_mines(self, historico):
@@ -949,7 +1075,7 @@ class PatternAnalyzer:
         Analisa o padrão do jogo Crash
         
         Args:
-            historico: Lista com histórico de resultados
+            historico: GameFrame ou lista de rounds (mais recente primeiro)
             
         Returns:
             dict: Análise com padrões detectados
@@ -960,74 +1086,48 @@ class PatternAnalyzer:
                 "mensagem": "Histórico insuficiente para análise"
             }
             
-        # Extrai valores
-        valores = [item.get("valor", 1.0) for item in historico]
+        # Coluna numpy de valores: uma lista de rounds é convertida uma única vez
+        historico = game_frame.as_frame('crash', historico)
+        # float64 com 2 casas: valores em float32 (arquivo colunar) voltam aos valores que a API enviou
+        valores = np.round(historico.column("valor").astype(np.float64), 2)
+        total = len(valores)
         
         # Análise estatística básica
-        media = sum(valores) / len(valores)
-        mediana = sorted(valores)[len(valores) // 2]
-        variancia = sum((x - media) ** 2 for x in valores) / len(valores)
-        desvio_padrao = math.sqrt(variancia)
+        media = float(valores.mean())
+        mediana = float(np.partition(valores, total // 2)[total // 2])
+        desvio_padrao = float(valores.std())
         
         # Análise de frequência por faixas
-        faixas = {
-            "muito_baixo": [x for x in valores if x < 1.5],
-            "baixo": [x for x in valores if 1.5 <= x < 2.0],
-            "medio": [x for x in valores if 2.0 <= x < 5.0],
-            "alto": [x for x in valores if 5.0 <= x < 10.0],
-            "muito_alto": [x for x in valores if x >= 10.0]
+        freq_faixas = {
+            "muito_baixo": int(np.count_nonzero(valores < 1.5)),
+            "baixo": int(np.count_nonzero((valores >= 1.5) & (valores < 2.0))),
+            "medio": int(np.count_nonzero((valores >= 2.0) & (valores < 5.0))),
+            "alto": int(np.count_nonzero((valores >= 5.0) & (valores < 10.0))),
+            "muito_alto": int(np.count_nonzero(valores >= 10.0))
         }
-        
-        freq_faixas = {faixa: len(valores_faixa) for faixa, valores_faixa in faixas.items()}
-        freq_percentual = {faixa: (count / len(valores)) * 100 
-                          for faixa, count in freq_faixas.items()}
+        freq_percentual = {faixa: (count / total) * 100 for faixa, count in freq_faixas.items()}
         
         # Análise de sequências
+        anteriores, atuais = valores[:-1], valores[1:]
+        crescente = atuais > anteriores * 1.2
+        decrescente = ~crescente & (atuais < anteriores * 0.8)
         sequencias = {
-            "crescente": 0,
-            "decrescente": 0,
-            "estavel": 0
+            "crescente": int(np.count_nonzero(crescente)),
+            "decrescente": int(np.count_nonzero(decrescente)),
+            "estavel": int(total - 1 - np.count_nonzero(crescente) - np.count_nonzero(decrescente))
         }
         
-        for i in range(1, len(valores)):
-            if valores[i] > valores[i-1] * 1.2:  # Aumento significativo (>20%)
-                sequencias["crescente"] += 1
-            elif valores[i] < valores[i-1] * 0.8:  # Diminuição significativa (>20%)
-                sequencias["decrescente"] += 1
-            else:
-                sequencias["estavel"] += 1
-                
-        # Análise de padrões específicos
-        # Conta crashes baixos consecutivos
-        max_crashes_baixos_consecutivos = 0
-        crashes_baixos_atual = 0
-        
-        for valor in valores:
-            if valor < 2.0:
-                crashes_baixos_atual += 1
-                max_crashes_baixos_consecutivos = max(max_crashes_baixos_consecutivos, crashes_baixos_atual)
-            else:
-                crashes_baixos_atual = 0
-                
-        # Conta crashes altos consecutivos
-        max_crashes_altos_consecutivos = 0
-        crashes_altos_atual = 0
-        
-        for valor in valores:
-            if valor > 5.0:
-                crashes_altos_atual += 1
-                max_crashes_altos_consecutivos = max(max_crashes_altos_consecutivos, crashes_altos_atual)
-            else:
-                crashes_altos_atual = 0
-                
-        # Análise de tendências recentes (últimos 10 resultados)
-        valores_recentes = valores[:10]
-        media_recente = sum(valores_recentes) / len(valores_recentes) if valores_recentes else 0
+        def maior_sequencia(mascara):
+            # Tamanho da maior sequência de True (bordas das sequências pela diferença)
+            bordas = np.flatnonzero(np.diff(np.concatenate(([0], mascara.view(np.int8), [0]))))
+            return int((bordas[1::2] - bordas[::2]).max()) if len(bordas) else 0
+            
+        baixos = valores < 2.0
+        altos = valores > 5.0
         
-        # Detecta desvios da média
-        desvio_media = media_recente - media
+        # Análise de tendências recentes (últimos 10 resultados)
+        media_recente = float(valores[:10].mean())
         
-        # Retorna análise completa
         return {
             "padroes_detectados": True,
             "estatisticas_basicas": {
@@ -1039,18 +1139,18 @@ class PatternAnalyzer:
             "frequencia_percentual": freq_percentual,
             "sequencias": sequencias,
             "padroes_especificos": {
-                "max_crashes_baixos_consecutivos": max_crashes_baixos_consecutivos,
-                "max_crashes_altos_consecutivos": max_crashes_altos_consecutivos,
-                "crashes_baixos_atual": sum(1 for x in valores[:5] if x < 2.0),
-                "crashes_altos_atual": sum(1 for x in valores[:5] if x > 5.0)
+                "max_crashes_baixos_consecutivos": maior_sequencia(baixos),
+                "max_crashes_altos_consecutivos": maior_sequencia(altos),
+                "crashes_baixos_atual": int(np.count_nonzero(baixos[:5])),
+                "crashes_altos_atual": int(np.count_nonzero(altos[:5]))
             },
             "tendencias_recentes": {
                 "media": media_recente,
-                "desvio_media": desvio_media
+                "desvio_media": media_recente - media
             },
-            "ultimo_valor": valores[0] if valores else None,
-            "penultimo_valor": valores[1] if len(valores) > 1 else None,
-            "antepenultimo_valor": valores[2] if len(valores) > 2 else None
+            "ultimo_valor": float(valores[0]),
+            "penultimo_valor": float(valores[1]),
+            "antepenultimo_valor": float(valores[2])
         }
 
 
@@ -1070,6 +1170,9 @@ class Predictor:
             'limbo': {'acertos': 0, 'erros': 0, 'acuracia': 0, 'total_backtests': 0}
         }
         
+        # Armazenamento onde as previsões também são gravadas (definido pelo CasinoPredictor)
+        self.store = None
+        
         # Histórico de previsões
         self.previsoes = {
             'double': [],
@@ -1548,7 +1651,7 @@ class Predictor:
         Executa backtest para o algoritmo de previsão do Double
         
         Args:
-            historico: Lista com histórico de resultados
+            historico: GameFrame ou lista de rounds (mais recente primeiro)
             num_testes: Número de testes a executar
             
         Returns:
@@ -1560,6 +1663,9 @@ class Predictor:
                 "mensagem": "Histórico insuficiente para backtest"
             }
             
+        # Converte uma única vez: cada teste analisa uma fatia (visão sem cópia) do frame
+        historico = game_frame.as_frame('double', historico)
+        
         acertos = 0
         total = 0
         
@@ -1717,7 +1823,7 @@ class Predictor:
         Executa backtest para o algoritmo de previsão do Crash
         
         Args:
-            historico: Lista com histórico de resultados
+            historico: GameFrame ou lista de rounds (mais recente primeiro)
             num_testes: Número de testes a executar
             
         Returns:
@@ -1729,6 +1835,9 @@ class Predictor:
                 "mensagem": "Histórico insuficiente para backtest"
             }
             
+        # Converte uma única vez: cada teste analisa uma fatia (visão sem cópia) do frame
+        historico = game_frame.as_frame('crash', historico)
+        
         acertos = 0
         total = 0
         
@@ -1797,6 +1906,8 @@ class Predictor:
             previsao: Dicionário com a previsão
         """
         self.previsoes[jogo].append(previsao)
+        if self.store is not None:
+            self.store.add_prediction(jogo, previsao, now_ms())
         
         # Limita o tamanho do histórico
         max_previsoes = 100
@@ -1816,7 +1927,12 @@ class Predictor:
 class CasinoPredictor:
     """Classe principal para previsão de jogos de cassino"""
     
-    def __init__(self):
+    def __init__(self, conectar=True, offline=False):
+        """
+        Args:
+            conectar: Se False, o coletor não abre conexões (usado no replay)
+            offline: Se True, não usa a rede e usa só os rounds armazenados
+        """
         # Configurações
         self.config = {
             'double_url': 'https://blaze.com/pt/games/double',
@@ -1824,8 +1940,39 @@ class CasinoPredictor:
             'tigrinho_url': 'https://pgsoft.com/games/fortune-tiger',
             'crash_url': 'https://blaze.com/pt/games/crash',
             'limbo_url': 'https://blaze.com/pt/games/limbo',
+            # Endpoints de coleta (podem apontar para o mock local: python mock_blaze.py serve)
+            'blaze_ws_url': None,  # None = servidor de replicação da Blaze (BLAZE_REPLICATION_URL)
+            'pgsoft_ws_url': 'wss://api-v2.pgsoft.com/replication/?EIO=3&transport=websocket',
+            'blaze_api_url': 'https://blaze.com/api',
             'data_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'),
-            'history_size': 100,
+            'history_size': 10000,  # Capacidade do buffer circular de rounds por jogo
+            'frame_log': os.environ.get('PG_FRAME_LOG'),  # Arquivo .gz para gravar os frames recebidos (opcional)
+            'crash_ticks_dir': os.environ.get('PG_CRASH_TICKS'),  # Diretório para gravar os ticks do Crash (opcional)
+            'http_pool_size': 10,   # Conexões keep-alive por host no pool HTTP compartilhado
+            'http_retries': 3,      # Retentativas HTTP (respeitam Retry-After)
+            'http2': True,          # Usa HTTP/2 quando httpx[http2] está instalado
+            'http_cache_ttl': 2.0,  # Segundos em que uma resposta HTTP é reutilizada sem nova consulta
+            'connect_timeout': 10,  # Segundos para a primeira conexão de um feed ser considerada falha
+            'round_interval_seconds': {  # Intervalo esperado entre rounds até o watchdog aprender o real
+                'double': 30,
+                'crash': 30,
+                'tigrinho': 10
+            },
+            'watchdog_multiple': 3.0,     # Feed parado após este múltiplo do intervalo normal sem rounds
+            'watchdog_min_seconds': 5.0,  # Limite mínimo do watchdog em segundos
+            'gap_seconds': {        # Intervalo entre rounds que indica rounds perdidos (dispara o backfill)
+                'double': 60,
+                'crash': 120
+            },
+            'archive_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'archive'),
+            'columns_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'columns'),
+            'backfill_concurrency': 4,      # Janelas de histórico buscadas em paralelo no backfill
+            'backfill_window_minutes': 60,  # Tamanho de cada janela do backfill
+            'store_path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'rounds.sqlite3'),
+            'warm_load_rounds': 1000,  # Rounds por jogo recarregados do armazenamento ao iniciar
+            'warm_load_predictions': 100,  # Previsões por jogo recarregadas ao iniciar
+            'stats_flush_seconds': 2.0,  # Intervalo mínimo entre gravações do stats.json (em segundo plano)
+            'startup_budget_ms': 100,  # Tempo alvo de um comando stats (um aviso é registrado se ultrapassado)
             'confidence_threshold': 90,
             'mines_count': 5,  # Número padrão de minas no jogo Mines
             'grid_size': 25,   # Tamanho padrão do grid no Mines (5x5)
@@ -1840,14 +1987,41 @@ class CasinoPredictor:
         if not os.path.exists(self.config['data_dir']):
             os.makedirs(self.config['data_dir'])
             
-        # Inicializa componentes
-        self.data_collector = DataCollector(self.config)
+        # Inicializa componentes (o coletor só é criado quando um jogo é pedido)
+        self.conectar = conectar
+        self.offline = offline
+        self._data_collector = None
+        self._store = None
         self.analyzer = PatternAnalyzer(self.config)
         self.predictor = Predictor(self.config, self.analyzer)
         
         # Carrega histórico se existir
         self._carregar_historico()
         
+        # stats.json é gravado em segundo plano (alterações juntadas, troca atômica do arquivo)
+        self.persister = StatsPersister(
+            os.path.join(self.config['data_dir'], 'stats.json'),
+            lambda: self.predictor.stats,
+            self.config['stats_flush_seconds']
+        )
+        
+    @property
+    def store(self):
+        """Armazenamento SQLite de rounds e previsões, aberto no primeiro uso (None no replay)"""
+        if self._store is None and (self.conectar or self.offline):
+            self._store = round_store.RoundStore(self.config['store_path'])
+            self.predictor.store = self._store
+            for jogo in self.predictor.previsoes:
+                self.predictor.previsoes[jogo] = self._store.load_predictions(jogo, self.config['warm_load_predictions'])
+        return self._store
+        
+    @property
+    def data_collector(self):
+        """Coletor de dados, criado no primeiro uso (stats nunca inicia coletores)"""
+        if self._data_collector is None:
+            self._data_collector = DataCollector(self.config, conectar=self.conectar, offline=self.offline, store=self.store)
+        return self._data_collector
+        
     def _carregar_historico(self):
         """Carrega histórico de resultados e estatísticas de arquivos"""
         try:
@@ -1862,17 +2036,8 @@ class CasinoPredictor:
             logger.error(f"Erro ao carregar histórico: {str(e)}")
             
     def _salvar_historico(self):
-        """Salva histórico de resultados e estatísticas em arquivos"""
-        try:
-            # Salva estatísticas
-            stats_file = os.path.join(self.config['data_dir'], 'stats.json')
-            with open(stats_file, 'w') as f:
-                json.dump(self.predictor.stats, f)
-                
-            logger.info(f"Estatísticas salvas com sucesso!")
-            
-        except Exception as e:
-            logger.error(f"Erro ao salvar histórico: {str(e)}")
+        """Agenda a gravação das estatísticas (não espera pelo disco)"""
+        self.persister.save()
             
     def _exibir_grid_mines_emoji(self, grid, tamanho=5):
         """
@@ -1912,6 +2077,7 @@ class CasinoPredictor:
         
         # Faz previsão
         previsao = self.predictor.prever_double(analise)
+        self.data_collector.registrar_lag_previsao('double', historico)
         
         # Registra previsão
         self.predictor.registrar_previsao('double', previsao)
@@ -1950,6 +2116,7 @@ class CasinoPredictor:
         
         # Faz previsão
         previsao = self.predictor.prever_mines(analise)
+        self.data_collector.registrar_lag_previsao('mines', historico)
         
         # Registra previsão
         self.predictor.registrar_previsao('mines', previsao)
@@ -1989,6 +2156,7 @@ class CasinoPredictor:
         
         # Faz previsão
         previsao = self.predictor.prever_tigrinho(analise)
+        self.data_collector.registrar_lag_previsao('tigrinho', historico)
         
         # Registra previsão
         self.predictor.registrar_previsao('tigrinho', previsao)
@@ -2026,6 +2194,7 @@ class CasinoPredictor:
         
         # Faz previsão
         previsao = self.predictor.prever_crash(analise)
+        self.data_collector.registrar_lag_previsao('crash', historico)
         
         # Registra previsão
         self.predictor.registrar_previsao('crash', previsao)
@@ -2062,6 +2231,26 @@ class CasinoPredictor:
             
             print(f"{jogo.capitalize()}: {acertos}/{total} acertos ({acuracia:.2f}%) - {backtests} backtests realizados")
             
+        # Só mostra os feeds se o coletor já foi criado (stats não inicia coletores)
+        if self._data_collector is not None:
+            print(f"\n{Fore.CYAN}=== FEEDS EM TEMPO REAL ==={Style.RESET_ALL}")
+            vigia = self._data_collector.watchdog.estatisticas() if self._data_collector.watchdog else {}
+            for jogo, estado in self._data_collector.feed_status.items():
+                if jogo in vigia and vigia[jogo]['ultimo_round_s'] is not None:
+                    w = vigia[jogo]
+                    print(f"{jogo.capitalize()}: {estado} - último round há {w['ultimo_round_s']}s "
+                          f"(intervalo {w['intervalo_s']}s, limite {w['limite_s']}s, "
+                          f"{w['reinscricoes']} reinscrições, {w['reconexoes']} reconexões)")
+                else:
+                    print(f"{jogo.capitalize()}: {estado}")
+                
+            lag = self._data_collector.lag.estatisticas()
+            if lag:
+                print(f"\n{Fore.CYAN}=== ATRASOS (ms) ==={Style.RESET_ALL}")
+                for feed, etapas in lag.items():
+                    for etapa, s in etapas.items():
+                        print(f"{feed} {etapa}: p50 {s['p50_ms']} / p95 {s['p95_ms']} / p99 {s['p99_ms']} / máx {s['max_ms']} ({s['amostras']} amostras)")
+            
     def iniciar(self):
         """Inicia o preditor de cassino"""
         print(f"{Fore.CYAN}{'=' * 50}")
@@ -2107,27 +2296,242 @@ class CasinoPredictor:
             print(f"\n{Fore.YELLOW}Programa interrompido pelo usuário.{Style.RESET_ALL}")
             
         finally:
-            # Salva histórico e fecha conexões
-            self._salvar_historico()
-            self.data_collector.fechar()
+            # Salva histórico e fecha conexões e armazenamento
+            self.finalizar()
+            
+    def replay(self, arquivo, velocidade=None):
+        """
+        Reproduz um log de frames gravado pelos mesmos handlers da coleta ao vivo
+        
+        Args:
+            arquivo: Log gravado com PG_FRAME_LOG
+            velocidade: Fator de velocidade (1 = tempo real); None = velocidade máxima
+        """
+        print(f"{Fore.CYAN}Reproduzindo {arquivo} ({f'{velocidade}x' if velocidade else 'velocidade máxima'})...")
+        
+        stats = frame_log.FrameReplayer(arquivo, velocidade).replay(self.data_collector.ws_clients)
+        
+        print(f"{Fore.GREEN}Frames reproduzidos: {stats['frames']} ({stats['ignorados']} ignorados)")
+        print(f"{Fore.GREEN}Duração: {stats['duracao']}s (original: {stats['duracao_original']}s)")
+        print(f"{Fore.GREEN}Throughput: {stats['frames_por_segundo']} frames/s")
+        for jogo, historico in self.data_collector.live_data.items():
+            if historico:
+                print(f"{Fore.WHITE}{jogo}: {len(historico)} rounds")
+        
+    def backfill(self, jogo, dias):
+        """
+        Baixa o histórico dos últimos dias para o arquivo local (retoma de onde parou)
+        
+        Args:
+            jogo: 'double' ou 'crash'
+            dias: Quantidade de dias de histórico
+        """
+        endpoints = {'double': 'roulette_games', 'crash': 'crash_games'}
+        if jogo not in endpoints:
+            print(f"{Fore.RED}Backfill disponível apenas para: {', '.join(endpoints)}")
+            return
+            
+        arquivo = round_archive.RoundArchive(self.config['archive_dir'], jogo)
+        print(f"{Fore.CYAN}Baixando {dias} dia(s) de histórico do {jogo.capitalize()} para {arquivo.diretorio}...")
+        
+        stats = round_archive.backfill_days(
+            arquivo,
+            f"{self.config['blaze_api_url']}/{endpoints[jogo]}/history",
+            dias,
+            janela_ms=self.config['backfill_window_minutes'] * 60 * 1000,
+            concorrencia=self.config['backfill_concurrency'],
+            headers=self.data_collector.headers,
+            pool=self.data_collector.session
+        )
+        
+        print(f"{Fore.GREEN}Rounds recebidos: {stats['recebidos']} ({stats['novos']} novos) em {stats['janelas']} janelas")
+        print(f"{Fore.GREEN}Duração: {stats['duracao']}s ({stats['rounds_por_segundo']} rounds/s)")
+        print(f"{Fore.WHITE}Total arquivado: {arquivo.count()} rounds em {len(arquivo.dias())} dia(s)")
+        if stats['pendente']:
+            print(f"{Fore.YELLOW}Backfill interrompido; execute novamente para continuar de onde parou.")
+            
+        # Mantém o arquivo colunar (usado pelos backtests longos) em dia com o JSONL
+        colunas = round_columns.ColumnarArchive(self.config['columns_dir'], jogo)
+        colunas.sync(arquivo)
+        print(f"{Fore.WHITE}Arquivo colunar: {colunas.count()} rounds em {len(colunas.dias())} dia(s)")
+        
+    def backtest(self, jogo, dias=None, num_testes=100):
+        """
+        Executa o backtest sobre o arquivo colunar (histórico longo mapeado em memória)
+        
+        Args:
+            jogo: 'double' ou 'crash'
+            dias: Últimos dias usados (None = todo o arquivo)
+            num_testes: Número de testes a executar
+        """
+        if jogo not in round_columns.ESQUEMAS:
+            print(f"{Fore.RED}Backtest longo disponível apenas para: {', '.join(round_columns.ESQUEMAS)}")
+            return
+            
+        colunas = round_columns.ColumnarArchive(self.config['columns_dir'], jogo)
+        colunas.sync(round_archive.RoundArchive(self.config['archive_dir'], jogo))
+        
+        try:
+            inicio = time.perf_counter()
+            desde_ms = now_ms() - int(dias * round_archive.DIA_MS) if dias else None
+            historico = colunas.view(desde_ms, colunas=("numero", "cor") if jogo == 'double' else ("valor",))
+            abertura_ms = (time.perf_counter() - inicio) * 1000
+            print(f"{Fore.CYAN}Backtest do {jogo.capitalize()} sobre {len(historico)} rounds (abertos em {abertura_ms:.1f} ms)...")
+            
+            inicio = time.perf_counter()
+            if jogo == 'double':
+                resultado = self.predictor.executar_backtest_double(historico, num_testes)
+            else:
+                resultado = self.predictor.executar_backtest_crash(historico, num_testes)
+            duracao = time.perf_counter() - inicio
+            
+            if not resultado.get("sucesso", False):
+                print(f"{Fore.YELLOW}{resultado['mensagem']}")
+                return
+            print(f"{Fore.GREEN}Acertos: {resultado['acertos']}/{resultado['total']} ({resultado['taxa_acerto']:.2f}%)")
+            print(f"{Fore.GREEN}Duração: {duracao:.2f}s")
+        finally:
+            # Fecha os memory maps também quando o backtest não tem dados suficientes
+            colunas.close()
+            
+    def exportar(self, diretorio, ipc=False):
+        """
+        Exporta os rounds e as previsões armazenados para Parquet (particionado por jogo e dia)
+        
+        Args:
+            diretorio: Diretório de destino (rounds/ e predictions/ são criados dentro dele)
+            ipc: Se True, grava também um arquivo Arrow IPC por jogo (<jogo>.arrow)
+        """
+        print(f"{Fore.CYAN}Exportando histórico para {diretorio}...")
+        for jogo in round_store.JOGOS:
+            inicio = time.perf_counter()
+            rodadas = self.store.load_rounds(jogo, -1)
+            previsoes = self.store.load_predictions(jogo, -1, com_horario=True)
+            if not rodadas and not previsoes:
+                continue
+            total = 0
+            if rodadas:
+                tabela = round_export.rounds_table(jogo, rodadas)
+                total = round_export.write_parquet(tabela, os.path.join(diretorio, 'rounds'), jogo)
+                if ipc:
+                    round_export.write_ipc(tabela, os.path.join(diretorio, f'{jogo}.arrow'))
+            if previsoes:
+                round_export.write_parquet(
+                    round_export.predictions_table(previsoes), os.path.join(diretorio, 'predictions'), jogo, 'ts'
+                )
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            print(f"{Fore.GREEN}{jogo}: {total} rounds e {len(previsoes)} previsões em {duracao_ms:.0f} ms")
+            
+    def importar(self, jogo, caminho):
+        """
+        Carrega um histórico externo (Parquet, Arrow IPC ou CSV) no histórico em memória do jogo
+        
+        Os rounds importados substituem o histórico atual e não são gravados no armazenamento.
+        
+        Args:
+            jogo: 'double', 'crash' ou 'limbo'
+            caminho: Arquivo ou diretório do dataset
+        """
+        inicio = time.perf_counter()
+        frame = round_export.load_frame(jogo, caminho)
+        historico = self.data_collector.live_data[jogo]
+        historico.clear()
+        carregados = historico.load(frame)
+        self.data_collector.simulados.discard(jogo)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        print(f"{Fore.GREEN}{carregados} rounds do {jogo.capitalize()} importados de {caminho} em {duracao_ms:.0f} ms")
+        logger.info(f"Imported {carregados} {jogo} rounds from {caminho} in {duracao_ms:.1f} ms")
             
     def finalizar(self):
         """Finaliza o preditor de cassino"""
+        # Para o coletor antes: as threads dele não alteram mais as estatísticas durante a última gravação
+        if self._data_collector is not None:
+            self._data_collector.fechar()
         self._salvar_historico()
-        self.data_collector.fechar()
+        self.persister.close()
+        logger.info(f"Stats persister: {self.persister.estatisticas()}")
+        if self._store is not None:
+            self._store.close()
         print(f"\n{Fore.YELLOW}Sistema finalizado.{Style.RESET_ALL}")
 
 
+def _registrar_tempo(comando, preditor):
+    """Registra o tempo total do comando (desde o início da importação do módulo)"""
+    duracao_ms = (time.perf_counter() - _INICIO) * 1000
+    logger.info(f"Command {comando} finished in {duracao_ms:.1f} ms")
+    if comando == "stats" and preditor is not None and duracao_ms > preditor.config['startup_budget_ms']:
+        logger.warning(f"Command stats took {duracao_ms:.1f} ms (budget: {preditor.config['startup_budget_ms']} ms)")
+
+
 def main():
     """Função principal"""
+    comando = None
+    preditor = None
     try:
+        # --offline: sem rede, usa só os rounds armazenados
+        argumentos = [arg for arg in sys.argv[1:] if arg != "--offline"]
+        offline = len(argumentos) != len(sys.argv) - 1
+        # --seed <arquivo>: carrega um histórico externo (Parquet/Arrow/CSV) antes de prever
+        semente = None
+        if "--seed" in argumentos:
+            posicao = argumentos.index("--seed")
+            semente = argumentos[posicao + 1] if posicao + 1 < len(argumentos) else None
+            del argumentos[posicao:posicao + 2]
+        comando = argumentos[0].lower() if argumentos else None
+        
+        if comando == "replay":
+            # Replay não abre conexões: os frames gravados passam pelos mesmos handlers
+            if len(argumentos) < 2:
+                print(f"{Fore.YELLOW}Uso: pg.py replay <arquivo.gz> [velocidade|max]")
+                return
+            velocidade = None
+            if len(argumentos) > 2 and argumentos[2].lower() != "max":
+                velocidade = float(argumentos[2])
+            preditor = CasinoPredictor(conectar=False)
+            preditor.replay(argumentos[1], velocidade)
+            preditor.data_collector.fechar()
+            return
+            
+        if comando == "backtest":
+            # Backtest longo: só lê os arquivos locais (sem rede e sem coletor)
+            if len(argumentos) < 2:
+                print(f"{Fore.YELLOW}Uso: pg.py backtest <double|crash> [dias] [testes]")
+                return
+            preditor = CasinoPredictor(conectar=False)
+            preditor.backtest(
+                argumentos[1].lower(),
+                float(argumentos[2]) if len(argumentos) > 2 else None,
+                int(argumentos[3]) if len(argumentos) > 3 else 100
+            )
+            preditor.finalizar()
+            return
+            
+        if comando == "export":
+            # Exportação: só lê o armazenamento local (sem rede e sem coletor)
+            if len(argumentos) < 2:
+                print(f"{Fore.YELLOW}Uso: pg.py export <diretorio> [--ipc]")
+                return
+            preditor = CasinoPredictor(offline=True)
+            preditor.exportar(argumentos[1], ipc="--ipc" in argumentos[2:])
+            preditor.finalizar()
+            return
+            
+        if comando == "backfill":
+            if len(argumentos) < 2:
+                print(f"{Fore.YELLOW}Uso: pg.py backfill <double|crash> [dias]")
+                return
+            preditor = CasinoPredictor()
+            preditor.backfill(argumentos[1].lower(), float(argumentos[2]) if len(argumentos) > 2 else 30)
+            preditor.finalizar()
+            return
+            
         # Cria e inicia o preditor
-        preditor = CasinoPredictor()
+        preditor = CasinoPredictor(offline=offline)
+        if semente:
+            preditor.importar(comando, semente)
         
         # Verifica argumentos de linha de comando
-        if len(sys.argv) > 1:
-            comando = sys.argv[1].lower()
-            
+        if comando:
             if comando == "double":
                 preditor.prever_double()
             elif comando == "mines":
@@ -2140,7 +2544,7 @@ def main():
                 preditor.exibir_estatisticas()
             else:
                 print(f"{Fore.RED}Comando inválido: {comando}")
-                print(f"{Fore.YELLOW}Comandos válidos: double, mines, tigrinho, crash, stats")
+                print(f"{Fore.YELLOW}Comandos válidos: double, mines, tigrinho, crash, stats, replay, backfill, backtest, export (opções: --offline, --seed <arquivo>)")
                 
             # Finaliza
             preditor.finalizar()
@@ -2155,6 +2559,8 @@ def main():
         
     finally:
         print(f"{Fore.YELLOW}Programa encerrado.")
+        if comando:
+            _registrar_tempo(comando, preditor)
 
 
 if __name__ == "__main__":
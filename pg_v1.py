@@ -28,6 +28,8 @@ import re
 import math
 from urllib.parse import urlparse
 
+from stats_persister import StatsPersister
+
 # Inicializa colorama para saída colorida no terminal
 init(autoreset=True)
 
@@ -614,6 +616,9 @@ class Predictor:
             'mines': []
         }
         
+        # stats.json é gravado em segundo plano (alterações juntadas, troca atômica do arquivo)
+        self.persister = StatsPersister("data/stats.json", lambda: self.stats, indent=4)
+        
     def prever_double(self, analise):
         """
         Prevê o próximo resultado do jogo Double
@@ -933,19 +938,9 @@ class Predictor:
         return acerto
         
     def salvar_estatisticas(self):
-        """Salva estatísticas em arquivo"""
-        try:
-            # Cria diretório se não existir
-            os.makedirs("data", exist_ok=True)
-            
-            # Salva estatísticas
-            with open("data/stats.json", "w") as f:
-                json.dump(self.stats, f, indent=4)
-                
-            return True
-            
-        except Exception as e:
-            return False
+        """Agenda a gravação das estatísticas em arquivo (não espera pelo disco)"""
+        self.persister.save()
+        return True
             
     def carregar_estatisticas(self):
         """Carrega estatísticas de arquivo"""
@@ -1070,8 +1065,10 @@ class PGPredictor:
         
     def fechar(self):
         """Fecha conexões e salva dados"""
-        self.predictor.salvar_estatisticas()
+        # Fecha as conexões antes: nada altera as estatísticas durante a última gravação
         self.data_collector.fechar()
+        self.predictor.salvar_estatisticas()
+        self.predictor.persister.close()
         
     def executar(self):
         """Executa o programa principal"""
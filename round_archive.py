@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round Archive
+Arquivo local de rounds históricos e backfill em massa pelos endpoints de histórico.
+
+O arquivo guarda os rounds de cada jogo em um JSONL por dia (UTC), na forma em que a API
+os retorna, sem duplicatas de id. O backfill percorre o histórico de trás para frente em
+janelas de tempo, buscando algumas janelas em paralelo (concorrência limitada) pelo pool
+HTTP compartilhado, e grava um cursor em disco depois de cada lote: se o processo parar,
+a próxima execução continua de onde parou em vez de recomeçar.
+
+Estrutura:
+    <diretorio>/<jogo>/AAAA-MM-DD.jsonl   rounds do dia
+    <diretorio>/<jogo>/cursor.json        intervalo já arquivado e segmentos pendentes
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from round_history import now_ms, parse_epoch_ms
+
+logger = logging.getLogger("RoundArchive")
+
+DIA_MS = 24 * 3600 * 1000
+# Menor janela do backfill ao dividir janelas com páginas demais (abaixo disso a falha é reportada)
+_JANELA_MINIMA_MS = 60 * 1000
+
+
+def _dia(epoch_ms):
+    """Retorna o dia UTC (AAAA-MM-DD) de um epoch em ms"""
+    return datetime.fromtimestamp(epoch_ms / 1000, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _gravar_json(caminho, dados):
+    """Grava um JSON de forma atômica (arquivo temporário + rename)"""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w") as f:
+        json.dump(dados, f)
+    os.replace(temporario, caminho)
+
+
+class RoundArchive:
+    """Rounds históricos de um jogo em arquivos JSONL diários"""
+
+    def __init__(self, diretorio, jogo):
+        """
+        Args:
+            diretorio: Diretório raiz do arquivo
+            jogo: Nome do jogo (subdiretório)
+        """
+        self.jogo = jogo
+        self.diretorio = os.path.join(diretorio, jogo)
+        os.makedirs(self.diretorio, exist_ok=True)
+        # Ids já arquivados, carregados por dia na primeira gravação naquele dia
+        self._ids = {}
+
+    def _arquivo(self, dia):
+        return os.path.join(self.diretorio, f"{dia}.jsonl")
+
+    def _ids_do_dia(self, dia):
+        if dia not in self._ids:
+            self._ids[dia] = {rodada.get("id") for rodada in self._ler_dia(dia)}
+        return self._ids[dia]
+
+    def _ler_dia(self, dia):
+        caminho = self._arquivo(dia)
+        if not os.path.exists(caminho):
+            return []
+        rodadas = []
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    rodadas.append(json.loads(linha))
+                except ValueError:
+                    # Linha incompleta de uma gravação interrompida
+                    continue
+        return rodadas
+
+    def write(self, rodadas):
+        """
+        Grava rounds no arquivo do dia de cada um, ignorando ids já arquivados
+
+        Args:
+            rodadas: Rounds como retornados pela API (com "id" e "created_at")
+
+        Returns:
+            int: Quantidade de rounds novos gravados
+        """
+        por_dia = {}
+        for rodada in rodadas:
+            epoch_ms = parse_epoch_ms(rodada.get("created_at"))
+            if epoch_ms is None:
+                continue
+            dia = _dia(epoch_ms)
+            ids = self._ids_do_dia(dia)
+            if rodada.get("id") in ids:
+                continue
+            ids.add(rodada.get("id"))
+            por_dia.setdefault(dia, []).append(json.dumps(rodada, separators=(",", ":")))
+
+        for dia, linhas in por_dia.items():
+            with open(self._arquivo(dia), "a", encoding="utf-8") as f:
+                f.write("\n".join(linhas) + "\n")
+        return sum(len(linhas) for linhas in por_dia.values())
+
+    def dias(self):
+        """Retorna os dias arquivados (AAAA-MM-DD), do mais antigo para o mais recente"""
+        return sorted(nome[:-6] for nome in os.listdir(self.diretorio) if nome.endswith(".jsonl"))
+
+    def read(self, desde_ms=None, ate_ms=None):
+        """
+        Lê os rounds arquivados de um intervalo
+
+        Args:
+            desde_ms: Início do intervalo em epoch (ms); None = desde o primeiro dia
+            ate_ms: Fim do intervalo em epoch (ms); None = até o último dia
+
+        Returns:
+            generator: Rounds do mais antigo para o mais recente
+        """
+        primeiro = _dia(desde_ms) if desde_ms is not None else None
+        ultimo = _dia(ate_ms) if ate_ms is not None else None
+        for dia in self.dias():
+            if (primeiro and dia < primeiro) or (ultimo and dia > ultimo):
+                continue
+            # O backfill grava de trás para frente: ordena dentro do dia
+            rodadas = [(parse_epoch_ms(rodada.get("created_at")), rodada) for rodada in self._ler_dia(dia)]
+            rodadas.sort(key=lambda item: item[0])
+            for epoch_ms, rodada in rodadas:
+                if desde_ms is not None and epoch_ms < desde_ms:
+                    continue
+                if ate_ms is not None and epoch_ms > ate_ms:
+                    continue
+                yield rodada
+
+    def size(self, dia):
+        """Retorna o tamanho em bytes do arquivo de um dia (0 se não existir)"""
+        caminho = self._arquivo(dia)
+        return os.path.getsize(caminho) if os.path.exists(caminho) else 0
+
+    def count(self):
+        """Retorna o total de rounds arquivados"""
+        total = 0
+        for dia in self.dias():
+            with open(self._arquivo(dia), "rb") as f:
+                total += sum(1 for _ in f)
+        return total
+
+    # ------------------------------------------------------------------
+    # Cursor do backfill
+    # ------------------------------------------------------------------
+
+    @property
+    def caminho_cursor(self):
+        return os.path.join(self.diretorio, "cursor.json")
+
+    def load_cursor(self):
+        """
+        Lê o cursor do backfill
+
+        Returns:
+            dict: "arquivado" ([desde_ms, ate_ms] contínuo ou None) e "pendentes"
+                  (segmentos {desde_ms, ate_ms, proximo_ms} ainda sendo preenchidos)
+        """
+        if os.path.exists(self.caminho_cursor):
+            try:
+                with open(self.caminho_cursor, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Invalid backfill cursor for {self.jogo}, starting over: {str(e)}")
+        return {"arquivado": None, "pendentes": []}
+
+    def save_cursor(self, cursor):
+        """Grava o cursor do backfill de forma atômica"""
+        _gravar_json(self.caminho_cursor, cursor)
+
+
+def _faltantes(desde_ms, ate_ms, arquivado):
+    """
+    Segmentos a buscar para cobrir [desde_ms, ate_ms], do mais recente para o mais antigo
+
+    Cada segmento encosta no intervalo já arquivado (um pedido que não o toca também busca o
+    espaço entre os dois), então o intervalo arquivado continua sempre contínuo.
+    """
+    if arquivado is None:
+        return [(desde_ms, ate_ms)]
+    inicio, fim = arquivado
+    segmentos = []
+    if ate_ms > fim:
+        segmentos.append((fim, ate_ms))
+    if desde_ms < inicio:
+        segmentos.append((desde_ms, inicio))
+    return segmentos
+
+
+def backfill(arquivo, url, desde_ms, ate_ms=None, janela_ms=3600 * 1000, concorrencia=4,
+             headers=None, pool=None, max_paginas=100, timeout=10):
+    """
+    Preenche o arquivo com o histórico de um intervalo, de trás para frente e retomável
+
+    Cada lote busca até `concorrencia` janelas consecutivas em paralelo, grava os rounds e
+    só então avança o cursor, então uma interrupção perde no máximo o lote em andamento.
+
+    Args:
+        arquivo: RoundArchive de destino
+        url: Endpoint de histórico paginado (ex: https://blaze.com/api/roulette_games/history)
+        desde_ms: Início do intervalo em epoch (ms)
+        ate_ms: Fim do intervalo em epoch (ms); padrão: agora
+        janela_ms: Tamanho de cada janela de busca (janelas com mais de max_paginas páginas são divididas)
+        concorrencia: Janelas buscadas em paralelo
+        headers: Cabeçalhos das requisições
+        pool: HttpPool usado (padrão: o pool compartilhado)
+        max_paginas: Limite de páginas por janela
+        timeout: Timeout de cada requisição em segundos
+
+    Returns:
+        dict: Rounds recebidos, novos gravados, janelas, falhas, duração e rounds/s
+    """
+    # Importado aqui: o arquivo pode ser lido sem carregar a pilha HTTP
+    from blaze_http import fetch_history_range, TooManyPages
+
+    ate_ms = now_ms() if ate_ms is None else ate_ms
+    cursor = arquivo.load_cursor()
+
+    # Segmentos interrompidos na execução anterior vêm primeiro; depois, o que falta do pedido.
+    # Os segmentos são sempre vizinhos do intervalo arquivado, então arquivado + pendentes é contínuo
+    limites = [(s["desde_ms"], s["ate_ms"]) for s in cursor["pendentes"]]
+    if cursor["arquivado"]:
+        limites.append(tuple(cursor["arquivado"]))
+    coberto = (min(l[0] for l in limites), max(l[1] for l in limites)) if limites else None
+    for desde, ate in _faltantes(desde_ms, ate_ms, coberto):
+        cursor["pendentes"].append({"desde_ms": desde, "ate_ms": ate, "proximo_ms": ate})
+    arquivo.save_cursor(cursor)
+
+    def buscar(janela):
+        try:
+            return fetch_history_range(url, janela[0], janela[1], headers=headers, pool=pool,
+                                       max_paginas=max_paginas, timeout=timeout)
+        except TooManyPages:
+            # Janela com rounds demais para max_paginas: busca as duas metades
+            if janela[1] - janela[0] <= _JANELA_MINIMA_MS:
+                raise
+            meio = (janela[0] + janela[1]) // 2
+            return buscar((janela[0], meio)) + buscar((meio, janela[1]))
+
+    recebidos = 0
+    novos = 0
+    janelas = 0
+    falhas = 0
+    inicio = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix=f"backfill-{arquivo.jogo}") as executor:
+        while cursor["pendentes"]:
+            segmento = cursor["pendentes"][0]
+            proximo = segmento["proximo_ms"]
+            lote = []
+            while len(lote) < concorrencia and proximo > segmento["desde_ms"]:
+                lote.append((max(segmento["desde_ms"], proximo - janela_ms), proximo))
+                proximo = lote[-1][0]
+
+            rodadas = []
+            erro = None
+            for janela, futuro in [(janela, executor.submit(buscar, janela)) for janela in lote]:
+                try:
+                    rodadas.extend(futuro.result())
+                except Exception as e:
+                    erro = e
+            janelas += len(lote)
+            recebidos += len(rodadas)
+            novos += arquivo.write(rodadas)
+
+            if erro is not None:
+                # Não avança o cursor: o lote é buscado de novo na próxima execução (ids repetidos são ignorados)
+                falhas += 1
+                logger.error(f"Backfill of {arquivo.jogo} stopped at {_dia(segmento['proximo_ms'])}: {str(erro)}")
+                break
+
+            segmento["proximo_ms"] = proximo
+            if proximo <= segmento["desde_ms"]:
+                cursor["pendentes"].pop(0)
+                arquivado = cursor["arquivado"]
+                cursor["arquivado"] = [
+                    min(segmento["desde_ms"], arquivado[0]) if arquivado else segmento["desde_ms"],
+                    max(segmento["ate_ms"], arquivado[1]) if arquivado else segmento["ate_ms"]
+                ]
+            arquivo.save_cursor(cursor)
+
+    duracao = time.perf_counter() - inicio
+    estatisticas = {
+        "recebidos": recebidos,
+        "novos": novos,
+        "janelas": janelas,
+        "falhas": falhas,
+        "pendente": bool(cursor["pendentes"]),
+        "duracao": round(duracao, 3),
+        "rounds_por_segundo": round(recebidos / duracao, 1) if duracao > 0 else 0.0
+    }
+    logger.info(f"Backfill of {arquivo.jogo}: {estatisticas}")
+    return estatisticas
+
+
+def backfill_days(arquivo, url, dias, **opcoes):
+    """
+    Preenche o arquivo com os últimos dias de histórico (ver backfill)
+
+    Args:
+        arquivo: RoundArchive de destino
+        url: Endpoint de histórico paginado
+        dias: Quantidade de dias até agora
+
+    Returns:
+        dict: Estatísticas do backfill
+    """
+    ate_ms = now_ms()
+    return backfill(arquivo, url, ate_ms - int(dias * DIA_MS), ate_ms, **opcoes)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round Columns
+Arquivo colunar mapeado em memória (numpy.memmap) para históricos longos de Double e Crash.
+
+Listas de dicionários custam centenas de bytes por round e levam segundos para carregar;
+aqui cada round ocupa poucos bytes em colunas de largura fixa:
+
+    double: id uint64, epoch int64, numero uint8 (0-14), cor uint8 (0 white, 1 red, 2 black)
+    crash:  id uint64, epoch int64, valor float32 (crash point)
+
+Os segmentos são diários (UTC): cada coluna de um dia é um arquivo binário little-endian
+gravado só com append, em ordem de horário. Um índice pequeno (index.json, gravado de forma
+atômica) guarda, por dia, a versão dos arquivos, a quantidade de rounds válidos e o
+intervalo de horários. Bytes além da quantidade do índice (append interrompido) são
+ignorados e descartados na próxima gravação. Rounds que chegam fora de ordem em um dia já
+gravado (backfill de trás para frente) geram uma nova versão do segmento, trocada no
+índice de uma só vez.
+
+A leitura abre os segmentos com numpy.memmap: abrir é instantâneo e as colunas de um dia
+são visões sem cópia do arquivo (só a junção de vários dias copia as colunas pedidas),
+entregues como GameFrame.
+Ids da API que não são numéricos são guardados como um hash de 64 bits (suficiente para
+deduplicar).
+
+Estrutura: <diretorio>/<jogo>/AAAA-MM-DD.<versao>.<coluna> e <diretorio>/<jogo>/index.json
+"""
+
+import os
+import json
+import logging
+from datetime import datetime, timezone
+
+import numpy as np
+
+from round_history import parse_epoch_ms
+from game_frame import GameFrame, CODIGO_COR, round_id, cor_do_numero
+
+logger = logging.getLogger("RoundColumns")
+
+DIA_MS = 24 * 3600 * 1000
+
+# Colunas de cada jogo (nome, tipo numpy little-endian)
+ESQUEMAS = {
+    "double": (("id", "<u8"), ("epoch", "<i8"), ("numero", "u1"), ("cor", "u1")),
+    "crash": (("id", "<u8"), ("epoch", "<i8"), ("valor", "<f4"))
+}
+
+def _dia(epoch_ms):
+    """Retorna o dia UTC (AAAA-MM-DD) de um epoch em ms"""
+    return datetime.fromtimestamp(epoch_ms / 1000, timezone.utc).strftime("%Y-%m-%d")
+
+
+def from_api(jogo, item):
+    """
+    Converte um round da API (roll/crash_point, created_at) em uma linha do arquivo
+
+    Returns:
+        dict: Valores das colunas, ou None se o round estiver incompleto
+    """
+    epoch_ms = parse_epoch_ms(item.get("created_at"))
+    if epoch_ms is None or item.get("id") is None:
+        return None
+    if jogo == "double":
+        numero = item.get("roll")
+        if numero is None:
+            return None
+        return {"id": round_id(item["id"]), "epoch": epoch_ms, "numero": numero, "cor": cor_do_numero(numero)}
+    valor = item.get("crash_point")
+    if valor is None:
+        return None
+    return {"id": round_id(item["id"]), "epoch": epoch_ms, "valor": float(valor)}
+
+
+def from_round(jogo, rodada):
+    """
+    Converte um round do coletor (cor/numero ou valor, ts_servidor) em uma linha do arquivo
+
+    Returns:
+        dict: Valores das colunas, ou None se o round não tiver id ou horário do servidor
+    """
+    if rodada.get("id") is None or rodada.get("ts_servidor") is None:
+        return None
+    linha = {"id": round_id(rodada["id"]), "epoch": rodada["ts_servidor"]}
+    if jogo == "double":
+        linha["numero"] = rodada["numero"]
+        linha["cor"] = CODIGO_COR[rodada["cor"]]
+    else:
+        linha["valor"] = float(rodada["valor"])
+    return linha
+
+
+class ColumnarArchive:
+    """Rounds de um jogo em colunas de largura fixa, com segmentos diários mapeados em memória"""
+
+    def __init__(self, diretorio, jogo):
+        """
+        Args:
+            diretorio: Diretório raiz do arquivo colunar
+            jogo: 'double' ou 'crash'
+        """
+        if jogo not in ESQUEMAS:
+            raise ValueError(f"no columnar schema for {jogo}")
+        self.jogo = jogo
+        self.esquema = ESQUEMAS[jogo]
+        self.diretorio = os.path.join(diretorio, jogo)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.indice = self._carregar_indice()
+        # Ids por dia, carregados na primeira gravação naquele dia
+        self._ids = {}
+        # Memmaps abertos por (dia, versão)
+        self._abertos = {}
+
+    # ------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------
+
+    @property
+    def caminho_indice(self):
+        return os.path.join(self.diretorio, "index.json")
+
+    def _carregar_indice(self):
+        if os.path.exists(self.caminho_indice):
+            try:
+                with open(self.caminho_indice, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Invalid columnar index for {self.jogo}, starting empty: {str(e)}")
+        return {"dias": {}}
+
+    def _salvar_indice(self):
+        temporario = f"{self.caminho_indice}.tmp"
+        with open(temporario, "w") as f:
+            json.dump(self.indice, f)
+        os.replace(temporario, self.caminho_indice)
+
+    def _arquivo(self, dia, versao, coluna):
+        return os.path.join(self.diretorio, f"{dia}.{versao}.{coluna}")
+
+    def dias(self):
+        """Retorna os dias gravados (AAAA-MM-DD), do mais antigo para o mais recente"""
+        return sorted(self.indice["dias"])
+
+    def count(self):
+        """Retorna o total de rounds gravados"""
+        return sum(segmento["rounds"] for segmento in self.indice["dias"].values())
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def _ler_segmento(self, dia):
+        """Lê as colunas de um dia para a memória (usado só na gravação)"""
+        segmento = self.indice["dias"].get(dia)
+        colunas = {}
+        for nome, tipo in self.esquema:
+            if segmento is None:
+                colunas[nome] = np.empty(0, dtype=tipo)
+            else:
+                colunas[nome] = np.fromfile(self._arquivo(dia, segmento["versao"], nome), dtype=tipo,
+                                            count=segmento["rounds"])
+        return colunas
+
+    def write(self, linhas, origem_bytes=None):
+        """
+        Grava rounds nos segmentos dos seus dias, ignorando ids já gravados
+
+        Args:
+            linhas: Linhas (ver from_api/from_round) em qualquer ordem
+            origem_bytes: {dia: tamanho do arquivo de origem} registrado no índice (ver sync)
+
+        Returns:
+            int: Quantidade de rounds novos gravados
+        """
+        por_dia = {}
+        for linha in linhas:
+            if linha is not None:
+                por_dia.setdefault(_dia(linha["epoch"]), []).append(linha)
+
+        novos = 0
+        for dia, linhas_dia in por_dia.items():
+            ids = self._ids.get(dia)
+            if ids is None:
+                ids = self._ids[dia] = set(self._ler_segmento(dia)["id"].tolist())
+            unicas = []
+            for linha in linhas_dia:
+                if linha["id"] not in ids:
+                    ids.add(linha["id"])
+                    unicas.append(linha)
+            if unicas:
+                unicas.sort(key=lambda linha: linha["epoch"])
+                self._gravar_dia(dia, unicas)
+                novos += len(unicas)
+
+        for dia, tamanho in (origem_bytes or {}).items():
+            if dia in self.indice["dias"]:
+                self.indice["dias"][dia]["origem_bytes"] = tamanho
+        self._salvar_indice()
+        return novos
+
+    def _gravar_dia(self, dia, linhas):
+        segmento = self.indice["dias"].get(dia)
+        novas = {nome: np.array([linha[nome] for linha in linhas], dtype=tipo) for nome, tipo in self.esquema}
+
+        if segmento is not None and linhas[0]["epoch"] >= segmento["ate_ms"]:
+            # Caso normal: rounds mais novos que o fim do dia vão para o fim dos arquivos
+            for nome, tipo in self.esquema:
+                with open(self._arquivo(dia, segmento["versao"], nome), "ab") as f:
+                    # Descarta o resto de um append interrompido antes de gravar
+                    f.truncate(segmento["rounds"] * np.dtype(tipo).itemsize)
+                    f.write(novas[nome].tobytes())
+            # Memmaps abertos têm o tamanho antigo
+            self._abertos.pop((dia, segmento["versao"]), None)
+            segmento["rounds"] += len(linhas)
+            segmento["ate_ms"] = int(novas["epoch"][-1])
+            return
+
+        # Dia novo ou rounds fora de ordem: grava uma nova versão do segmento, ordenada
+        atuais = self._ler_segmento(dia)
+        colunas = {nome: np.concatenate((atuais[nome], novas[nome])) for nome, _ in self.esquema}
+        ordem = np.argsort(colunas["epoch"], kind="stable")
+        versao = segmento["versao"] + 1 if segmento is not None else 1
+        for nome, _ in self.esquema:
+            colunas[nome][ordem].tofile(self._arquivo(dia, versao, nome))
+
+        self.indice["dias"][dia] = {
+            "versao": versao,
+            "rounds": len(ordem),
+            "desde_ms": int(colunas["epoch"][ordem[0]]),
+            "ate_ms": int(colunas["epoch"][ordem[-1]]),
+            "origem_bytes": segmento.get("origem_bytes") if segmento else None
+        }
+        if segmento is not None:
+            # A versão antiga só é apagada depois que o índice aponta para a nova
+            self._salvar_indice()
+            self._abertos.pop((dia, segmento["versao"]), None)
+            for nome, _ in self.esquema:
+                try:
+                    os.remove(self._arquivo(dia, segmento["versao"], nome))
+                except OSError:
+                    pass
+
+    def sync(self, arquivo):
+        """
+        Importa os dias novos ou alterados de um RoundArchive (JSONL da API)
+
+        Args:
+            arquivo: RoundArchive do mesmo jogo
+
+        Returns:
+            int: Quantidade de rounds novos gravados
+        """
+        novos = 0
+        for dia in arquivo.dias():
+            tamanho = arquivo.size(dia)
+            segmento = self.indice["dias"].get(dia)
+            if segmento is not None and segmento.get("origem_bytes") == tamanho:
+                continue
+            inicio = int(datetime.strptime(dia, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+            linhas = [from_api(self.jogo, item) for item in arquivo.read(inicio, inicio + DIA_MS - 1)]
+            novos += self.write(linhas, {dia: tamanho})
+        if novos:
+            logger.info(f"Imported {novos} rounds of {self.jogo} into the columnar archive")
+        return novos
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _abrir(self, dia, nome):
+        """Coluna de um dia como memmap somente leitura (None se o dia estiver vazio)"""
+        segmento = self.indice["dias"][dia]
+        if not segmento["rounds"]:
+            return None
+        colunas = self._abertos.setdefault((dia, segmento["versao"]), {})
+        if nome not in colunas:
+            colunas[nome] = np.memmap(self._arquivo(dia, segmento["versao"], nome), dtype=dict(self.esquema)[nome],
+                                      mode="r", shape=(segmento["rounds"],))
+        return colunas[nome]
+
+    def view(self, desde_ms=None, ate_ms=None, colunas=None):
+        """
+        Abre os rounds de um intervalo como arrays numpy
+
+        Args:
+            desde_ms: Início do intervalo em epoch (ms); None = desde o primeiro dia
+            ate_ms: Fim do intervalo em epoch (ms); None = até o último dia
+            colunas: Nomes das colunas (padrão: todas); pedir só as usadas evita cópias
+
+        Returns:
+            GameFrame: Rounds do mais recente para o mais antigo (a coluna epoch vira ts_servidor)
+        """
+        nomes = [nome for nome, _ in self.esquema if colunas is None or nome in colunas]
+        primeiro = _dia(desde_ms) if desde_ms is not None else None
+        ultimo = _dia(ate_ms) if ate_ms is not None else None
+
+        partes = {nome: [] for nome in nomes}
+        for dia in self.dias():
+            if (primeiro and dia < primeiro) or (ultimo and dia > ultimo):
+                continue
+            epochs = self._abrir(dia, "epoch")
+            if epochs is None:
+                continue
+            # Os segmentos estão em ordem de horário: os limites saem de uma busca binária
+            inicio = int(np.searchsorted(epochs, desde_ms, "left")) if desde_ms is not None and dia == primeiro else 0
+            fim = int(np.searchsorted(epochs, ate_ms, "right")) if ate_ms is not None and dia == ultimo else len(epochs)
+            if fim <= inicio:
+                continue
+            for nome in nomes:
+                partes[nome].append(self._abrir(dia, nome)[inicio:fim])
+
+        resultado = {}
+        for nome, tipo in self.esquema:
+            if nome not in partes:
+                continue
+            blocos = partes[nome]
+            if not blocos:
+                coluna = np.empty(0, dtype=tipo)
+            elif len(blocos) == 1:
+                coluna = blocos[0]
+            else:
+                coluna = np.concatenate(blocos)
+            # Invertida (mais recente primeiro) continua sendo uma visão
+            resultado["ts_servidor" if nome == "epoch" else nome] = coluna[::-1]
+        return GameFrame(self.jogo, resultado)
+
+    def close(self):
+        """Libera os memmaps abertos"""
+        self._abertos.clear()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round Export
+Exportação de históricos e previsões para Parquet/Arrow e importação em bloco de Parquet/CSV.
+
+Exportação (requer pyarrow):
+    write_parquet: dataset Parquet particionado por jogo e dia (hive: jogo=double/dia=AAAA-MM-DD),
+                   para análise em outras ferramentas (pandas, DuckDB, Spark, ...)
+    write_ipc:     arquivo Arrow IPC sem compressão, que outro processo abre com memory map
+                   (sem cópia nem desserialização)
+
+As colunas de Double, Crash e Limbo saem direto dos arrays numpy de um GameFrame (cor e status
+como códigos uint8, descritos nos metadados do schema; horários como timestamp UTC em ms),
+exceto o id, que sai como o texto original da API para casar com a API e o armazenamento.
+Mines e Tigrinho saem dos dicionários dos rounds.
+
+Importação: load_frame lê Parquet (arquivo ou diretório particionado), Arrow IPC ou CSV e
+monta um GameFrame com as colunas já convertidas, pronto para FrameHistory.load() e para
+o PatternAnalyzer. Aceita os nomes do coletor (numero, cor, valor, ts_servidor) e os da API
+(roll, color, crash_point, created_at). CSV funciona também sem pyarrow (mais lento).
+"""
+
+import os
+import csv
+import json
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional; sem ele só a importação de CSV funciona
+    pa = None
+
+from round_history import parse_epoch_ms
+from game_frame import GameFrame, ESQUEMAS, CORES, CODIGO_COR, STATUS, CODIGO_STATUS, round_id
+
+_HORARIOS = ("ts_servidor", "ts_recebido")
+
+# Nomes alternativos aceitos na importação (coletor, API, bot.py)
+_ALIASES = {
+    "ts_servidor": ("ts_servidor", "created_at", "timestamp", "epoch"),
+    "numero": ("numero", "roll"),
+    "cor": ("cor", "color"),
+    "valor": ("valor", "crash_point")
+}
+
+
+def _exigir_pyarrow(operacao):
+    if pa is None:
+        raise RuntimeError(f"pyarrow is required for {operacao} (pip install pyarrow)")
+
+
+# ----------------------------------------------------------------------
+# Exportação
+# ----------------------------------------------------------------------
+
+def _tabela_de_dicionarios(linhas):
+    """
+    Tabela Arrow com a união dos campos de todos os dicionários
+
+    Campos ausentes viram nulos; um campo com tipos incompatíveis entre as linhas
+    (ex: número em uma e texto em outra) é gravado como JSON.
+    """
+    nomes = {}
+    for linha in linhas:
+        nomes.update(dict.fromkeys(linha))
+    colunas = {}
+    for nome in nomes:
+        valores = [linha.get(nome) for linha in linhas]
+        try:
+            colunas[nome] = pa.array(valores)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            colunas[nome] = pa.array([None if valor is None else json.dumps(valor, default=str) for valor in valores],
+                                     type=pa.string())
+    return pa.table(colunas)
+
+
+def _como_timestamp(tabela, nome):
+    """Substitui uma coluna de epoch ms pela mesma coluna como timestamp UTC"""
+    return tabela.set_column(tabela.schema.get_field_index(nome), nome,
+                             tabela[nome].cast(pa.timestamp("ms", tz="UTC")))
+
+
+def frame_table(frame, ids=None):
+    """
+    Converte um GameFrame em tabela Arrow, do round mais antigo para o mais recente
+
+    A coluna id do frame é um hash uint64 (chave interna de deduplicação) e não é exportada:
+    o id original da API só sai quando é informado em `ids`.
+
+    Args:
+        frame: GameFrame
+        ids: Ids originais da API na ordem da tabela (mais antigo primeiro); None = sem coluna id
+
+    Returns:
+        pyarrow.Table: Uma coluna por coluna do frame
+    """
+    _exigir_pyarrow("Arrow export")
+    colunas = {}
+    if ids is not None:
+        colunas["id"] = pa.array([None if valor is None else str(valor) for valor in ids], type=pa.string())
+    for nome in frame.names:
+        if nome == "id":
+            continue
+        valores = np.ascontiguousarray(frame.column(nome)[::-1])
+        if nome in _HORARIOS:
+            colunas[nome] = pa.array(valores, type=pa.timestamp("ms", tz="UTC"))
+        else:
+            colunas[nome] = pa.array(valores)
+    metadados = {"jogo": frame.jogo, "cores": ",".join(CORES), "status": ",".join(STATUS)}
+    return pa.table(colunas, metadata=metadados)
+
+
+def rounds_table(jogo, rodadas):
+    """
+    Converte rounds em dicionário (formato do coletor) em tabela Arrow
+
+    Args:
+        jogo: Nome do jogo
+        rodadas: Rounds do mais antigo para o mais recente
+
+    Returns:
+        pyarrow.Table: Tabela dos rounds
+    """
+    _exigir_pyarrow("Arrow export")
+    rodadas = list(rodadas)
+    if jogo in ESQUEMAS:
+        # id exportado como o texto original (o hash do frame não volta a casar com a API)
+        return frame_table(GameFrame.from_rounds(jogo, reversed(rodadas)), [rodada.get("id") for rodada in rodadas])
+    tabela = _tabela_de_dicionarios(rodadas)
+    for nome in _HORARIOS:
+        if nome in tabela.column_names:
+            tabela = _como_timestamp(tabela, nome)
+    return tabela
+
+
+def predictions_table(registros):
+    """
+    Converte previsões em tabela Arrow
+
+    Args:
+        registros: Tuplas (ts_ms, previsão) da mais antiga para a mais recente
+
+    Returns:
+        pyarrow.Table: Coluna ts (timestamp UTC) + campos da previsão
+    """
+    _exigir_pyarrow("Arrow export")
+    return _como_timestamp(_tabela_de_dicionarios([dict(previsao, ts=ts) for ts, previsao in registros]), "ts")
+
+
+def write_parquet(tabela, diretorio, jogo, coluna_horario="ts_servidor"):
+    """
+    Grava uma tabela no dataset Parquet particionado por jogo e dia (UTC)
+
+    As partições (dias) presentes na tabela são substituídas; as outras são mantidas, então
+    exportar de novo o mesmo período não duplica linhas.
+
+    Args:
+        tabela: Tabela Arrow com a coluna de horário
+        diretorio: Raiz do dataset
+        jogo: Nome do jogo (partição jogo=...)
+        coluna_horario: Coluna timestamp usada para o dia
+
+    Returns:
+        int: Linhas gravadas
+    """
+    _exigir_pyarrow("Parquet export")
+    if not tabela.num_rows:
+        return 0
+    tabela = tabela.append_column("jogo", pa.array([jogo] * tabela.num_rows, type=pa.string()))
+    tabela = tabela.append_column("dia", tabela[coluna_horario].cast(pa.date32()))
+    ds.write_dataset(
+        tabela, diretorio, format="parquet",
+        partitioning=ds.partitioning(pa.schema([("jogo", pa.string()), ("dia", pa.date32())]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet"
+    )
+    return tabela.num_rows
+
+
+def write_ipc(tabela, caminho):
+    """
+    Grava uma tabela em um arquivo Arrow IPC (sem compressão, legível com memory map)
+
+    Args:
+        tabela: Tabela Arrow
+        caminho: Arquivo de destino (ex: double.arrow)
+    """
+    _exigir_pyarrow("Arrow IPC export")
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with pa.OSFile(temporario, "wb") as destino:
+        with pa.ipc.new_file(destino, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    os.replace(temporario, caminho)
+
+
+# ----------------------------------------------------------------------
+# Importação
+# ----------------------------------------------------------------------
+
+def read_table(caminho):
+    """
+    Lê um arquivo/diretório Parquet, um Arrow IPC ou um CSV
+
+    Args:
+        caminho: .parquet ou diretório de dataset, .arrow/.ipc/.feather ou .csv
+
+    Returns:
+        pyarrow.Table (ou dict {coluna: lista} para CSV sem pyarrow)
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".csv":
+        if pa is not None:
+            return pa_csv.read_csv(caminho)
+        with open(caminho, "r", encoding="utf-8", newline="") as f:
+            linhas = list(csv.DictReader(f))
+        return {nome: [linha[nome] for linha in linhas] for nome in (linhas[0] if linhas else {})}
+
+    _exigir_pyarrow("Parquet/Arrow import")
+    if extensao in (".arrow", ".ipc", ".feather"):
+        # memory map: as colunas apontam para o arquivo, sem cópia
+        return pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+    if os.path.isdir(caminho):
+        return ds.dataset(caminho, format="parquet", partitioning="hive").to_table()
+    return pq.read_table(caminho)
+
+
+def _coluna(tabela, nome):
+    """Coluna (ou um dos seus nomes alternativos) da tabela, ou None"""
+    nomes = tabela.column_names if pa is not None and isinstance(tabela, pa.Table) else tabela
+    for candidato in _ALIASES.get(nome, (nome,)):
+        if candidato in nomes:
+            return tabela[candidato]
+    return None
+
+
+def _numeros(coluna, tipo):
+    """Coluna Arrow ou lista de textos (CSV sem pyarrow) como array numpy"""
+    if isinstance(coluna, list):
+        return np.array([float(valor) if valor else 0 for valor in coluna]).astype(tipo)
+    return coluna.to_numpy(zero_copy_only=False).astype(tipo, copy=False)
+
+
+def _epochs(coluna):
+    """Horários (timestamp, epoch ms ou texto ISO 8601) como epoch ms int64"""
+    if isinstance(coluna, list) or pa.types.is_string(coluna.type) or pa.types.is_large_string(coluna.type):
+        valores = coluna if isinstance(coluna, list) else coluna.to_pylist()
+        convertidos = []
+        for valor in valores:
+            epoch = int(valor) if valor and str(valor).isdigit() else parse_epoch_ms(valor)
+            convertidos.append(epoch or 0)
+        return np.array(convertidos, dtype=np.int64)
+    if pa.types.is_timestamp(coluna.type):
+        coluna = coluna.cast(pa.timestamp("ms", tz=coluna.type.tz)).cast(pa.int64())
+    return _numeros(coluna, np.int64)
+
+
+def _codigos(coluna, codigos):
+    """Enum como texto (ex: "red") ou código inteiro -> array uint8"""
+    if not isinstance(coluna, list) and not (pa.types.is_string(coluna.type) or pa.types.is_dictionary(coluna.type)):
+        return _numeros(coluna, np.uint8)
+    valores = coluna if isinstance(coluna, list) else coluna.cast(pa.string()).to_pylist()
+    return np.array([codigos[valor] if valor in codigos else int(valor or 0) for valor in valores], dtype=np.uint8)
+
+
+def table_frame(jogo, tabela):
+    """
+    Monta um GameFrame a partir de uma tabela importada
+
+    Args:
+        jogo: 'double', 'crash' ou 'limbo'
+        tabela: pyarrow.Table ou dict {coluna: lista} (ver read_table)
+
+    Returns:
+        GameFrame: Rounds do mais recente para o mais antigo
+    """
+    if jogo not in ESQUEMAS:
+        raise ValueError(f"bulk import supports only {', '.join(ESQUEMAS)}")
+    if pa is not None and isinstance(tabela, pa.Table) and "jogo" in tabela.column_names:
+        # Dataset particionado com vários jogos
+        tabela = tabela.filter(pc.equal(tabela["jogo"].cast(pa.string()), jogo))
+
+    horarios = _coluna(tabela, "ts_servidor")
+    if horarios is None:
+        raise ValueError("imported table has no time column (ts_servidor/created_at/timestamp)")
+    colunas = {"ts_servidor": _epochs(horarios)}
+    tamanho = len(colunas["ts_servidor"])
+
+    ids = _coluna(tabela, "id")
+    if ids is None:
+        colunas["id"] = np.zeros(tamanho, dtype=np.uint64)
+    elif not isinstance(ids, list) and pa.types.is_integer(ids.type):
+        colunas["id"] = _numeros(ids, np.uint64)
+    else:
+        valores = ids if isinstance(ids, list) else ids.cast(pa.string()).to_pylist()
+        colunas["id"] = np.array([round_id(valor) for valor in valores], dtype=np.uint64)
+
+    recebidos = _coluna(tabela, "ts_recebido")
+    colunas["ts_recebido"] = _epochs(recebidos) if recebidos is not None else np.zeros(tamanho, dtype=np.int64)
+    status = _coluna(tabela, "status")
+    colunas["status"] = _codigos(status, CODIGO_STATUS) if status is not None else np.zeros(tamanho, dtype=np.uint8)
+
+    if jogo == "double":
+        numeros = _coluna(tabela, "numero")
+        if numeros is None:
+            raise ValueError("imported Double table has no numero/roll column")
+        colunas["numero"] = _numeros(numeros, np.uint8)
+        cores = _coluna(tabela, "cor")
+        if cores is not None:
+            colunas["cor"] = _codigos(cores, CODIGO_COR)
+        else:
+            numero = colunas["numero"]
+            colunas["cor"] = np.where(numero == 0, 0, np.where(numero <= 7, 1, 2)).astype(np.uint8)
+    else:
+        valores = _coluna(tabela, "valor")
+        if valores is None:
+            raise ValueError(f"imported {jogo} table has no valor/crash_point column")
+        colunas["valor"] = _numeros(valores, np.float64)
+
+    # Mais recente primeiro, como o resto do coletor
+    ordem = np.argsort(colunas["ts_servidor"], kind="stable")[::-1]
+    return GameFrame(jogo, {nome: colunas[nome][ordem] for nome, _ in ESQUEMAS[jogo]})
+
+
+def load_frame(jogo, caminho):
+    """
+    Lê um histórico (Parquet, Arrow IPC ou CSV) como GameFrame
+
+    Args:
+        jogo: 'double', 'crash' ou 'limbo'
+        caminho: Arquivo ou diretório do dataset
+
+    Returns:
+        GameFrame: Rounds do mais recente para o mais antigo
+    """
+    return table_frame(jogo, read_table(caminho))
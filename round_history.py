@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round History
+Histórico de rounds de capacidade fixa (buffer circular) usado pelos coletores.
+
+Os rounds são gravados em ordem de chegada com custo O(1) e, quando a capacidade é
+atingida, o mais antigo é sobrescrito. A leitura é sempre do mais recente para o mais
+antigo, por meio de visões que apontam para o buffer sem copiar os dados.
+
+Cada round guarda também um timestamp epoch (ms) já convertido, o que permite aplicar
+uma janela de retenção (ex: últimas 24 horas) descartando pela ponta mais antiga,
+sem reprocessar datas a cada round.
+
+Leitura concorrente sem locks: a escrita grava o slot antes de avançar a posição final
+(que funciona como contador de versão), então uma visão criada a qualquer momento só
+enxerga rounds completos. Uma visão é um snapshot O(1) e imutável enquanto seus slots não
+forem sobrescritos pela volta do buffer; se isso acontecer durante a leitura, a visão
+lança SnapshotExpired em vez de devolver dados misturados.
+"""
+
+import time
+import calendar
+from datetime import datetime, timezone
+
+
+def now_ms():
+    """Retorna o instante atual em epoch (milissegundos)"""
+    return int(time.time() * 1000)
+
+
+def parse_epoch_ms(texto):
+    """
+    Converte um timestamp ISO 8601 da API (ex: "2024-05-01T12:34:56.789Z") em epoch UTC
+
+    Args:
+        texto: Data em formato ISO 8601
+
+    Returns:
+        int: Epoch em milissegundos, ou None se o texto for vazio/inválido
+    """
+    if not texto:
+        return None
+
+    # Caminho rápido para o formato fixo da API: AAAA-MM-DDTHH:MM:SS(.fff)Z
+    try:
+        if texto[-1] == "Z" and texto[10] == "T":
+            segundos = calendar.timegm((
+                int(texto[0:4]), int(texto[5:7]), int(texto[8:10]),
+                int(texto[11:13]), int(texto[14:16]), int(texto[17:19]), 0, 0, 0
+            ))
+            fracao = texto[20:-1] if texto[19] == "." else ""
+            milis = int((fracao + "000")[:3]) if fracao else 0
+            return segundos * 1000 + milis
+    except (ValueError, IndexError):
+        pass
+
+    try:
+        data = datetime.fromisoformat(texto.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return int(data.timestamp() * 1000)
+
+
+class SnapshotExpired(Exception):
+    """A visão foi sobrescrita pela volta do buffer circular enquanto era lida"""
+
+
+class RoundView:
+    """Visão somente leitura (sem cópia) de rounds, do mais recente para o mais antigo"""
+
+    __slots__ = ("_dados", "_capacidade", "_topo", "_tamanho", "_origem")
+
+    def __init__(self, dados, capacidade, topo, tamanho, origem=None):
+        # topo: posição absoluta logo após o round mais recente da visão
+        # origem: RoundHistory de onde a visão saiu (para detectar slots sobrescritos)
+        self._dados = dados
+        self._capacidade = capacidade
+        self._topo = topo
+        self._tamanho = tamanho
+        self._origem = origem
+
+    def _primeira_posicao_valida(self):
+        """Posição absoluta mais antiga que com certeza ainda não foi sobrescrita"""
+        if self._origem is None:
+            return float("-inf")
+        # O slot da posição fim - capacidade pode estar sendo gravado neste momento
+        return self._origem._fim - self._capacidade + 1
+
+    def valid(self):
+        """Indica se nenhum round da visão foi sobrescrito"""
+        return self._topo - self._tamanho >= self._primeira_posicao_valida()
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(self._tamanho)
+            if passo != 1:
+                return [self[i] for i in range(inicio, fim, passo)]
+            return RoundView(self._dados, self._capacidade, self._topo - inicio, max(0, fim - inicio), self._origem)
+
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("round index out of range")
+        posicao = self._topo - 1 - indice
+        rodada = self._dados[posicao % self._capacidade]
+        # Valida depois de ler: se o slot foi sobrescrito, o valor lido não é confiável
+        if posicao < self._primeira_posicao_valida():
+            raise SnapshotExpired("round overwritten while reading the snapshot")
+        return rodada
+
+    def __iter__(self):
+        dados = self._dados
+        capacidade = self._capacidade
+        origem = self._origem
+        for posicao in range(self._topo - 1, self._topo - 1 - self._tamanho, -1):
+            rodada = dados[posicao % capacidade]
+            if origem is not None and posicao <= origem._fim - capacidade:
+                raise SnapshotExpired("round overwritten while reading the snapshot")
+            yield rodada
+
+    def __repr__(self):
+        return f"RoundView({len(self)} rounds)"
+
+    def copy(self):
+        """Retorna os rounds da visão como lista (mais recente primeiro)"""
+        return list(self)
+
+
+class RoundHistory:
+    """Buffer circular de capacidade fixa com os rounds de um jogo"""
+
+    def __init__(self, capacidade=10000, retencao_s=None):
+        """
+        Args:
+            capacidade: Número máximo de rounds mantidos (os mais antigos são descartados)
+            retencao_s: Janela de retenção em segundos usada por expire() (None = sem janela)
+        """
+        if capacidade <= 0:
+            raise ValueError("capacidade must be positive")
+
+        self.capacidade = capacidade
+        self.retencao_s = retencao_s
+        self._dados = [None] * capacidade
+        self._epochs = [0] * capacidade
+        # Posições absolutas: _fim só cresce; _inicio aponta para o round mais antigo retido
+        self._inicio = 0
+        self._fim = 0
+
+    def __len__(self):
+        return self._fim - self._inicio
+
+    def __getitem__(self, indice):
+        return self.latest()[indice]
+
+    def __iter__(self):
+        return iter(self.latest())
+
+    def __repr__(self):
+        return f"RoundHistory({len(self)}/{self.capacidade} rounds)"
+
+    def push(self, rodada, epoch_ms=None):
+        """
+        Adiciona o round mais recente em O(1)
+
+        Args:
+            rodada: Dados do round
+            epoch_ms: Momento do round em epoch (ms); padrão: momento da chegada
+        """
+        posicao = self._fim % self.capacidade
+        self._dados[posicao] = rodada
+        self._epochs[posicao] = now_ms() if epoch_ms is None else epoch_ms
+        self._fim += 1
+        if self._fim - self._inicio > self.capacidade:
+            self._inicio = self._fim - self.capacidade
+
+    def extend(self, rodadas):
+        """
+        Adiciona vários rounds
+
+        Args:
+            rodadas: Iterável do mais antigo para o mais recente
+        """
+        for rodada in rodadas:
+            self.push(rodada)
+
+    @property
+    def version(self):
+        """Contador de versão: cresce a cada round gravado"""
+        return self._fim
+
+    def latest(self, quantidade=None):
+        """
+        Retorna um snapshot O(1) dos últimos N rounds, sem copiar e sem bloquear a escrita
+
+        Args:
+            quantidade: Número de rounds (padrão: todos)
+
+        Returns:
+            RoundView: Rounds do mais recente para o mais antigo
+        """
+        # Lê o fim (versão) antes do início: o snapshot nunca inclui um slot ainda não gravado
+        fim = self._fim
+        tamanho = max(0, min(fim - self._inicio, self.capacidade))
+        if quantidade is not None:
+            tamanho = max(0, min(quantidade, tamanho))
+        return RoundView(self._dados, self.capacidade, fim, tamanho, self)
+
+    def oldest(self):
+        """Retorna o round mais antigo (ou None se vazio)"""
+        if not len(self):
+            return None
+        return self._dados[self._inicio % self.capacidade]
+
+    def oldest_epoch(self):
+        """Retorna o epoch (ms) do round mais antigo (ou None se vazio)"""
+        if not len(self):
+            return None
+        return self._epochs[self._inicio % self.capacidade]
+
+    def expire(self, agora_ms=None):
+        """
+        Aplica a janela de retenção descartando rounds pela ponta mais antiga
+
+        O custo é O(1) por round descartado: os epochs já estão convertidos e os rounds
+        estão em ordem de chegada, então a varredura para no primeiro round dentro da janela.
+
+        Args:
+            agora_ms: Instante de referência em epoch (ms); padrão: agora
+
+        Returns:
+            int: Quantidade de rounds descartados
+        """
+        if self.retencao_s is None:
+            return 0
+
+        agora_ms = now_ms() if agora_ms is None else agora_ms
+        limite = agora_ms - int(self.retencao_s * 1000)
+        capacidade = self.capacidade
+        epochs = self._epochs
+        descartados = 0
+        while self._inicio < self._fim and epochs[self._inicio % capacidade] < limite:
+            self._inicio += 1
+            descartados += 1
+        return descartados
+
+    def pop_oldest(self):
+        """Remove e retorna o round mais antigo em O(1)"""
+        if not len(self):
+            raise IndexError("pop from empty RoundHistory")
+        rodada = self._dados[self._inicio % self.capacidade]
+        self._inicio += 1
+        return rodada
+
+    def clear(self):
+        """Descarta todos os rounds"""
+        self._inicio = self._fim
+
+    def copy(self, quantidade=None, tentativas=3):
+        """
+        Retorna os rounds como lista (mais recente primeiro)
+
+        Args:
+            quantidade: Número de rounds (padrão: todos)
+            tentativas: Novas leituras caso o buffer dê a volta durante a cópia
+
+        Returns:
+            list: Rounds do mais recente para o mais antigo
+        """
+        for tentativa in range(tentativas):
+            try:
+                return list(self.latest(quantidade))
+            except SnapshotExpired:
+                if tentativa == tentativas - 1:
+                    raise
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round Sequencer
+Porta de entrada única dos rounds de um jogo no RoundHistory (exactly-once, em ordem).
+
+Rounds chegam do WebSocket, do fallback HTTP e do histórico de inicialização, e o mesmo
+round pode chegar mais de uma vez (vários ticks do mesmo round, reconexões, polling).
+O sequenciador descarta ids já vistos (LRU limitada), mantém a série em ordem de horário
+do servidor e, depois de uma reconexão, detecta lacunas e busca apenas os rounds faltantes
+por HTTP. Enquanto a lacuna é preenchida, os rounds ao vivo ficam retidos e são gravados
+depois dos recuperados, então o histórico continua só recebendo rounds no fim.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from round_history import now_ms
+
+logger = logging.getLogger("RoundSequencer")
+
+
+class RoundSequencer:
+    """Deduplica, ordena e preenche lacunas dos rounds de um jogo"""
+
+    def __init__(self, historico, backfill=None, lacuna_ms=None, capacidade_ids=4096, nome="rounds", on_gravado=None):
+        """
+        Args:
+            historico: RoundHistory (ou FrameHistory) que recebe os rounds
+            backfill: Função (desde_ms, ate_ms) -> lista de (rodada, rodada_id, epoch_ms)
+                      com os rounds do intervalo; None desativa o preenchimento
+            lacuna_ms: Intervalo entre rounds acima do qual há rounds faltando
+            capacidade_ids: Quantidade de ids recentes lembrados para deduplicação
+            nome: Nome do jogo usado nos logs
+            on_gravado: Callback (rodada, epoch_ms) chamado para cada round gravado no histórico
+                        (ex: persistência); chamado com o lock do sequenciador, deve ser rápido
+        """
+        self.historico = historico
+        self.backfill = backfill
+        self.on_gravado = on_gravado
+        self.lacuna_ms = lacuna_ms
+        self.capacidade_ids = capacidade_ids
+        self.nome = nome
+        self._vistos = OrderedDict()
+        self._lock = threading.Lock()
+        self._ultimo_epoch = None
+        # Começa "reconectado": a lacuna entre o histórico inicial e o primeiro round ao vivo também conta
+        self._reconectado = True
+        self._preenchendo = False
+        self._retidos = []
+        self.aceitos = 0
+        self.duplicados = 0
+        self.atrasados = 0
+        self.recuperados = 0
+        self.lacunas = 0
+
+    def _lembrar(self, rodada_id):
+        """Registra o id como visto; retorna False se já tinha sido visto"""
+        if rodada_id is None:
+            return True
+        if rodada_id in self._vistos:
+            self._vistos.move_to_end(rodada_id)
+            return False
+        self._vistos[rodada_id] = None
+        if len(self._vistos) > self.capacidade_ids:
+            self._vistos.popitem(last=False)
+        return True
+
+    def _gravar(self, rodada, epoch_ms):
+        """Grava no fim do histórico, descartando rounds mais antigos que o último gravado"""
+        if self._ultimo_epoch is not None and epoch_ms < self._ultimo_epoch:
+            self.atrasados += 1
+            return False
+        self.historico.push(rodada, epoch_ms)
+        self._ultimo_epoch = epoch_ms
+        self.aceitos += 1
+        if self.on_gravado is not None:
+            try:
+                self.on_gravado(rodada, epoch_ms)
+            except Exception as e:
+                logger.error(f"Error in on_gravado callback for {self.nome}: {str(e)}")
+        return True
+
+    def offer(self, rodada, rodada_id=None, epoch_ms=None):
+        """
+        Entrega um round ao sequenciador
+
+        Args:
+            rodada: Dados do round
+            rodada_id: Id do round no servidor (None = sem deduplicação)
+            epoch_ms: Horário do round no servidor em epoch (ms); padrão: agora
+
+        Returns:
+            bool: True se o round foi aceito (gravado ou retido durante um preenchimento)
+        """
+        epoch_ms = now_ms() if epoch_ms is None else epoch_ms
+
+        with self._lock:
+            if not self._lembrar(rodada_id):
+                self.duplicados += 1
+                return False
+
+            if self._preenchendo:
+                self._retidos.append((epoch_ms, rodada))
+                return True
+
+            if (self._reconectado and self.backfill is not None and self.lacuna_ms
+                    and self._ultimo_epoch is not None
+                    and epoch_ms - self._ultimo_epoch > self.lacuna_ms):
+                # Lacuna depois de reconectar: retém este round e busca os faltantes
+                self.lacunas += 1
+                self._preenchendo = True
+                self._retidos.append((epoch_ms, rodada))
+                desde = self._ultimo_epoch
+                threading.Thread(
+                    target=self._preencher, args=(desde, epoch_ms),
+                    name=f"backfill-{self.nome}", daemon=True
+                ).start()
+                self._reconectado = False
+                return True
+
+            self._reconectado = False
+            return self._gravar(rodada, epoch_ms)
+
+    def _preencher(self, desde_ms, ate_ms):
+        """Busca os rounds da lacuna e grava recuperados + retidos em ordem"""
+        logger.info(f"Backfilling {self.nome} gap of {(ate_ms - desde_ms) / 1000:.0f}s")
+        try:
+            recuperados = self.backfill(desde_ms, ate_ms) or []
+        except Exception as e:
+            logger.error(f"Backfill failed for {self.nome}: {str(e)}")
+            recuperados = []
+
+        with self._lock:
+            rodadas = list(self._retidos)
+            for rodada, rodada_id, epoch_ms in recuperados:
+                if epoch_ms is None or not desde_ms < epoch_ms < ate_ms:
+                    continue
+                if self._lembrar(rodada_id):
+                    rodadas.append((epoch_ms, rodada))
+                    self.recuperados += 1
+
+            rodadas.sort(key=lambda item: item[0])
+            for epoch_ms, rodada in rodadas:
+                self._gravar(rodada, epoch_ms)
+
+            self._retidos = []
+            self._preenchendo = False
+
+    def restore(self, rodadas):
+        """
+        Recarrega rounds já persistidos (sem chamar on_gravado)
+
+        O último horário recarregado vira a referência de lacunas: o primeiro round ao vivo
+        depois de reiniciar dispara o backfill do período em que o processo ficou parado.
+
+        Args:
+            rodadas: Lista de (rodada, rodada_id, epoch_ms), do mais antigo para o mais recente
+        """
+        with self._lock:
+            for rodada, rodada_id, epoch_ms in rodadas:
+                if not self._lembrar(rodada_id):
+                    continue
+                if self._ultimo_epoch is not None and epoch_ms < self._ultimo_epoch:
+                    continue
+                self.historico.push(rodada, epoch_ms)
+                self._ultimo_epoch = epoch_ms
+            self._reconectado = True
+
+    def marcar_reconexao(self):
+        """Avisa que o feed reconectou: o próximo round será verificado quanto a lacunas"""
+        with self._lock:
+            self._reconectado = True
+
+    def clear(self):
+        """Esvazia o histórico e esquece os ids vistos (ex: antes de recarregar o histórico)"""
+        with self._lock:
+            self.historico.clear()
+            self._vistos.clear()
+            self._ultimo_epoch = None
+            self._reconectado = True
+
+    def estatisticas(self):
+        """Retorna os contadores do sequenciador"""
+        with self._lock:
+            return {
+                "aceitos": self.aceitos,
+                "duplicados": self.duplicados,
+                "atrasados": self.atrasados,
+                "recuperados": self.recuperados,
+                "lacunas": self.lacunas,
+                "preenchendo": self._preenchendo
+            }
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round Store
+Armazenamento persistente (SQLite em modo WAL) dos rounds coletados e das previsões.
+
+Cada jogo tem a sua tabela de rounds (rounds_<jogo>), indexada pelo id do round no servidor
+(único) e pelo horário do servidor, e todas as previsões ficam na tabela predictions.
+
+O caminho de ingestão nunca espera pelo disco: add_round/add_prediction só colocam o item
+em uma fila, e uma thread escritora grava em lotes (uma transação por lote, executemany),
+o que sustenta dezenas de milhares de inserções por segundo. Na inicialização, load_rounds
+lê os últimos N rounds de um jogo pelo índice de horário (aquecimento em milissegundos).
+"""
+
+import os
+import json
+import queue
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger("RoundStore")
+
+JOGOS = ("double", "mines", "tigrinho", "crash", "limbo")
+
+_FIM = object()
+
+
+class RoundStore:
+    """Rounds e previsões em SQLite (WAL), com gravação em lotes por uma thread de fundo"""
+
+    def __init__(self, caminho, lote=1000, intervalo_flush=0.5, jogos=JOGOS):
+        """
+        Args:
+            caminho: Arquivo do banco SQLite
+            lote: Máximo de itens gravados por transação
+            intervalo_flush: Tempo máximo (segundos) que um item espera na fila
+            jogos: Jogos com tabela de rounds
+        """
+        self.caminho = caminho
+        self.lote = lote
+        self.intervalo_flush = intervalo_flush
+        self.jogos = tuple(jogos)
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+
+        self._leitura = self._conectar()
+        self._criar_tabelas(self._leitura)
+        self._leitura_lock = threading.Lock()
+
+        self._fila = queue.Queue()
+        self.rounds = 0
+        self.previsoes = 0
+        self.lotes = 0
+        self.erros = 0
+        self._escritor = threading.Thread(target=self._executar, name="round-store", daemon=True)
+        self._escritor.start()
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        # Com WAL, NORMAL só pode perder as últimas transações em uma queda de energia (nunca corrompe)
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def _criar_tabelas(self, conexao):
+        with conexao:
+            for jogo in self.jogos:
+                conexao.execute(
+                    f"CREATE TABLE IF NOT EXISTS rounds_{jogo} ("
+                    "id TEXT, ts_servidor INTEGER NOT NULL, ts_recebido INTEGER, dados TEXT NOT NULL)"
+                )
+                # NULLs não conflitam no índice único: rounds sem id (simulados, tigrinho) não são deduplicados
+                conexao.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS rounds_{jogo}_id ON rounds_{jogo} (id)")
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS rounds_{jogo}_ts ON rounds_{jogo} (ts_servidor)")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "seq INTEGER PRIMARY KEY, jogo TEXT NOT NULL, ts INTEGER NOT NULL, dados TEXT NOT NULL)"
+            )
+            conexao.execute("CREATE INDEX IF NOT EXISTS predictions_jogo_ts ON predictions (jogo, ts)")
+
+    # ------------------------------------------------------------------
+    # Escrita (não bloqueia)
+    # ------------------------------------------------------------------
+
+    def add_round(self, jogo, rodada):
+        """
+        Enfileira um round para gravação
+
+        Args:
+            jogo: Nome do jogo
+            rodada: Round com ts_servidor/ts_recebido (epoch ms) e, se houver, id
+        """
+        self._fila.put(("r", jogo, rodada))
+
+    def add_prediction(self, jogo, previsao, ts_ms):
+        """
+        Enfileira uma previsão para gravação
+
+        Args:
+            jogo: Nome do jogo
+            previsao: Dicionário da previsão
+            ts_ms: Horário da previsão em epoch (ms)
+        """
+        self._fila.put(("p", jogo, previsao, ts_ms))
+
+    def _executar(self):
+        conexao = self._conectar()
+        while True:
+            item = self._fila.get()
+            itens = [item]
+            # Junta o que já estiver na fila (até o tamanho do lote) em uma única transação
+            while len(itens) < self.lote and item is not _FIM:
+                try:
+                    item = self._fila.get(timeout=self.intervalo_flush if len(itens) == 1 else 0)
+                except queue.Empty:
+                    break
+                itens.append(item)
+
+            fim = itens[-1] is _FIM
+            self._gravar(conexao, [i for i in itens if i is not _FIM])
+            for _ in itens:
+                self._fila.task_done()
+            if fim:
+                conexao.close()
+                return
+
+    def _gravar(self, conexao, itens):
+        if not itens:
+            return
+        rounds = {}
+        previsoes = []
+        for item in itens:
+            if item[0] == "r":
+                _, jogo, rodada = item
+                rounds.setdefault(jogo, []).append((
+                    None if rodada.get("id") is None else str(rodada["id"]),
+                    rodada["ts_servidor"],
+                    rodada.get("ts_recebido"),
+                    json.dumps(rodada, separators=(",", ":"), default=str)
+                ))
+            else:
+                _, jogo, previsao, ts_ms = item
+                previsoes.append((jogo, ts_ms, json.dumps(previsao, separators=(",", ":"), default=str)))
+
+        try:
+            with conexao:
+                for jogo, linhas in rounds.items():
+                    conexao.executemany(
+                        f"INSERT OR IGNORE INTO rounds_{jogo} (id, ts_servidor, ts_recebido, dados) VALUES (?, ?, ?, ?)",
+                        linhas
+                    )
+                if previsoes:
+                    conexao.executemany("INSERT INTO predictions (jogo, ts, dados) VALUES (?, ?, ?)", previsoes)
+            self.rounds += sum(len(linhas) for linhas in rounds.values())
+            self.previsoes += len(previsoes)
+            self.lotes += 1
+        except sqlite3.Error as e:
+            self.erros += 1
+            logger.error(f"Error writing batch of {len(itens)} items: {str(e)}")
+
+    def flush(self):
+        """Aguarda a gravação de tudo que já foi enfileirado"""
+        self._fila.join()
+
+    def close(self):
+        """Grava o que falta na fila e fecha o banco"""
+        if self._escritor.is_alive():
+            self._fila.put(_FIM)
+            self._escritor.join()
+        with self._leitura_lock:
+            self._leitura.close()
+        logger.info(f"Round store stats: {self.estatisticas()}")
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def load_rounds(self, jogo, quantidade, ate_ms=None):
+        """
+        Lê os últimos rounds de um jogo
+
+        Args:
+            jogo: Nome do jogo
+            quantidade: Quantidade máxima de rounds (-1 = todos)
+            ate_ms: Só rounds até este horário do servidor em epoch (ms); None = todos
+
+        Returns:
+            list: Rounds do mais antigo para o mais recente
+        """
+        consulta = f"SELECT dados FROM rounds_{jogo}"
+        parametros = []
+        if ate_ms is not None:
+            consulta += " WHERE ts_servidor <= ?"
+            parametros.append(ate_ms)
+        consulta += " ORDER BY ts_servidor DESC LIMIT ?"
+        parametros.append(quantidade)
+
+        with self._leitura_lock:
+            linhas = self._leitura.execute(consulta, parametros).fetchall()
+        return [json.loads(dados) for (dados,) in reversed(linhas)]
+
+    def load_predictions(self, jogo, quantidade, com_horario=False):
+        """
+        Lê as últimas previsões de um jogo
+
+        Args:
+            jogo: Nome do jogo
+            quantidade: Quantidade máxima de previsões (-1 = todas)
+            com_horario: Se True, retorna tuplas (ts_ms, previsão)
+
+        Returns:
+            list: Previsões da mais antiga para a mais recente
+        """
+        with self._leitura_lock:
+            linhas = self._leitura.execute(
+                "SELECT ts, dados FROM predictions WHERE jogo = ? ORDER BY ts DESC, seq DESC LIMIT ?",
+                (jogo, quantidade)
+            ).fetchall()
+        if com_horario:
+            return [(ts, json.loads(dados)) for ts, dados in reversed(linhas)]
+        return [json.loads(dados) for _, dados in reversed(linhas)]
+
+    def count(self, jogo):
+        """Retorna a quantidade de rounds gravados de um jogo"""
+        with self._leitura_lock:
+            return self._leitura.execute(f"SELECT COUNT(*) FROM rounds_{jogo}").fetchone()[0]
+
+    def estatisticas(self):
+        """Retorna rounds e previsões gravados, lotes, erros e itens na fila"""
+        return {
+            "rounds": self.rounds,
+            "previsoes": self.previsoes,
+            "lotes": self.lotes,
+            "erros": self.erros,
+            "fila": self._fila.qsize()
+        }
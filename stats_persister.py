@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stats Persister
+Gravação em segundo plano (write-behind) e atômica de um JSON de estatísticas.
+
+Quem altera as estatísticas só chama save(), que marca o arquivo como sujo e retorna na hora:
+a previsão nunca espera pelo disco. Uma thread grava o estado mais recente no máximo uma vez
+por intervalo, então várias alterações seguidas viram uma única gravação, e um estado igual
+ao último gravado não é regravado. close() (também chamado na saída do processo) grava o que
+estiver pendente.
+
+Cada gravação vai para um arquivo temporário no mesmo diretório, com flush + fsync, e só
+então substitui o arquivo final com os.replace: uma queda no meio da gravação deixa o
+arquivo anterior intacto, nunca um JSON pela metade.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+
+logger = logging.getLogger("StatsPersister")
+
+
+def write_atomic(caminho, conteudo):
+    """
+    Grava bytes em um arquivo de forma atômica e durável (temporário + fsync + rename)
+
+    Args:
+        caminho: Arquivo de destino
+        conteudo: Bytes a gravar
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+    # O rename só é durável depois do fsync do diretório (não suportado em alguns sistemas)
+    try:
+        descritor = os.open(diretorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
+
+
+class StatsPersister:
+    """Grava um JSON em segundo plano, juntando alterações e substituindo o arquivo de forma atômica"""
+
+    def __init__(self, caminho, obter, intervalo=2.0, indent=None):
+        """
+        Args:
+            caminho: Arquivo JSON de destino
+            obter: Função que retorna o objeto a gravar (lida no momento da gravação)
+            intervalo: Tempo mínimo em segundos entre duas gravações
+            indent: Indentação do JSON (None = compacto)
+        """
+        self.caminho = caminho
+        self.obter = obter
+        self.intervalo = intervalo
+        self.indent = indent
+        self._sujo = False
+        self._ativo = True
+        # Conteúdo atual do arquivo: um estado igual ao que já está em disco não é regravado
+        self._ultimo = None
+        try:
+            with open(caminho, "rb") as f:
+                self._ultimo = f.read()
+        except OSError:
+            pass
+        self._ultima_gravacao = 0.0
+        self._cond = threading.Condition()
+        # Serializa as gravações (thread de fundo x flush/close)
+        self._gravacao = threading.Lock()
+        self.pedidos = 0
+        self.gravacoes = 0
+        self.inalterados = 0
+        self.erros = 0
+        self._thread = threading.Thread(target=self._executar, name="stats-persister", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save(self):
+        """Marca as estatísticas como alteradas (retorna imediatamente)"""
+        with self._cond:
+            self.pedidos += 1
+            if not self._sujo:
+                self._sujo = True
+                self._cond.notify()
+
+    def _executar(self):
+        while True:
+            with self._cond:
+                while self._ativo and not self._sujo:
+                    self._cond.wait()
+                if not self._ativo:
+                    return
+                # Espera o intervalo desde a última gravação: as alterações desse tempo viram uma só
+                espera = self._ultima_gravacao + self.intervalo - time.monotonic()
+                if espera > 0:
+                    self._cond.wait(espera)
+                    continue
+            self.flush()
+
+    def flush(self):
+        """
+        Grava agora o estado atual, se houver alteração pendente
+
+        Returns:
+            bool: True se o arquivo foi gravado
+        """
+        with self._gravacao:
+            with self._cond:
+                if not self._sujo:
+                    return False
+                self._sujo = False
+            self._ultima_gravacao = time.monotonic()
+            try:
+                conteudo = json.dumps(self.obter(), indent=self.indent).encode("utf-8")
+            except RuntimeError:
+                # O dicionário mudou durante a serialização: tenta de novo no próximo intervalo
+                with self._cond:
+                    self._sujo = True
+                return False
+            except (TypeError, ValueError) as e:
+                self.erros += 1
+                logger.error(f"Error serializing {self.caminho}: {str(e)}")
+                return False
+
+            if conteudo == self._ultimo:
+                self.inalterados += 1
+                return False
+            try:
+                write_atomic(self.caminho, conteudo)
+            except OSError as e:
+                self.erros += 1
+                logger.error(f"Error writing {self.caminho}: {str(e)}")
+                return False
+            self._ultimo = conteudo
+            self.gravacoes += 1
+            return True
+
+    def close(self, tentativas=5):
+        """
+        Grava o que estiver pendente e encerra a thread
+
+        Args:
+            tentativas: Gravações tentadas se as estatísticas mudarem durante a serialização
+        """
+        with self._cond:
+            if not self._ativo:
+                return
+            self._ativo = False
+            self._cond.notify_all()
+        self._thread.join()
+        # Depois do close nenhuma gravação acontece: um flush interrompido por RuntimeError é repetido aqui
+        for _ in range(tentativas):
+            self.flush()
+            with self._cond:
+                if not self._sujo:
+                    break
+        else:
+            self.erros += 1
+            logger.error(f"Pending stats for {self.caminho} were not written: they kept changing during close")
+        atexit.unregister(self.close)
+
+    def estatisticas(self):
+        """Retorna pedidos de gravação, gravações feitas, gravações evitadas e erros"""
+        return {
+            "pedidos": self.pedidos,
+            "gravacoes": self.gravacoes,
+            "inalterados": self.inalterados,
+            "erros": self.erros
+        }